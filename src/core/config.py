@@ -36,6 +36,23 @@ class Settings(BaseSettings):
     AWS_REGION: str = Field("ap-northeast-2", env="AWS_REGION")
 
     MODEL_SERVER_HOST: str = Field("localhost", env="MODEL_SERVER_HOST")
+    # 챕터의 여러 레슨 모델을 하나의 모델 서버 프로세스에서 호스팅 (?model= 로 선택)
+    MODEL_SERVER_MULTI_MODEL: bool = Field(False, env="MODEL_SERVER_MULTI_MODEL")
+    # 모델 서버 추론 백엔드 (keras, tflite, onnx)
+    MODEL_SERVER_BACKEND: str = Field("keras", env="MODEL_SERVER_BACKEND")
+    # 게시된 양자화 변형 사용 (none, float16, int8)
+    MODEL_SERVER_QUANTIZATION: str = Field("none", env="MODEL_SERVER_QUANTIZATION")
+    # 모델 서버 하나를 SO_REUSEPORT로 같은 포트를 공유하는 프로세스 N개로 실행
+    MODEL_SERVER_WORKERS: int = Field(1, env="MODEL_SERVER_WORKERS")
+    # uvloop 이벤트 루프 사용 (설치된 경우)
+    MODEL_SERVER_UVLOOP: bool = Field(False, env="MODEL_SERVER_UVLOOP")
+    # TensorFlow import까지 끝내고 모델 배정을 기다리는 대기 워커 수 (기본 0: 매번 새로 시작)
+    # API 프로세스(워커)마다 시작 시 이 수만큼 TensorFlow 프로세스를 띄우므로 모델 서버 전용 배포에서만 켬
+    MODEL_SERVER_STANDBY_POOL_SIZE: int = Field(0, env="MODEL_SERVER_STANDBY_POOL_SIZE")
+    # 대기 워커가 배정 없이 기다리는 최대 시간 (초과 시 종료, 다음 배포 때 다시 채움)
+    MODEL_SERVER_STANDBY_MAX_IDLE: int = Field(600, env="MODEL_SERVER_STANDBY_MAX_IDLE")
+    # 모델 서버가 리슨을 시작할 때까지 기다리는 최대 시간 (초)
+    MODEL_SERVER_READY_TIMEOUT: float = Field(60.0, env="MODEL_SERVER_READY_TIMEOUT")
     
     test_mongo_uri: str = Field(default="", env="TEST_MONGO_URI")
     test_db_name: str = Field(default="", env="TEST_DB_NAME")
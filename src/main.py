@@ -19,6 +19,7 @@ from .api.recommendations import router as recommendations_router
 from .api.video_upload import router as video_upload_router
 from .core.config import settings
 from .services.embedding import _get_model
+from .services.model_server_manager import model_server_manager
 
 app = FastAPI(
     title="Water and Fish API",
@@ -87,3 +88,9 @@ async def preload_embedding_model():
     # 임베딩 모델을 미리 메모리에 로딩
     _get_model()
 
+
+@app.on_event("startup")
+async def prefork_model_server_workers():
+    # TensorFlow를 미리 import한 대기 모델 서버 워커 준비 (MODEL_SERVER_STANDBY_POOL_SIZE가 0이면 건너뜀)
+    model_server_manager.fill_standby_pool()
+
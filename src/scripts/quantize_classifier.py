@@ -0,0 +1,112 @@
+"""
+수어 분류 모델의 양자화 변형(float16, 동적 범위 int8)을 만들고 검증 후 게시하는 스크립트
+
+검증 세트(.npz, "windows": (N, T, 675) float32 모델 입력)로 float32 Keras 모델과
+각 변형의 top-1 예측 일치율을 비교하고, 기준을 넘는 변형만 원본 모델 옆 경로
+(models/<name>.<variant>.tflite)에 게시합니다. 모델 서버는 --quantization 플래그로 사용합니다.
+
+poetry run python src/scripts/quantize_classifier.py <model_info> --validation-set windows.npz --publish
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+# src/ 를 import 경로에 추가 (services 패키지 사용)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.inference_backends import QUANTIZATION_VARIANTS, TFLiteBackend, quantized_model_key
+from services.model_registry import ClassifierModel, resolve_model_info_url
+from services.s3_utils import s3_utils
+
+DEFAULT_AGREEMENT_THRESHOLD = 0.99
+EVAL_BATCH_SIZE = 32
+
+
+def load_validation_windows(path):
+    """검증 세트 로드 (로컬 경로 또는 S3 URL)"""
+    if path.startswith("s3://"):
+        path = s3_utils.download_cached(path)
+    with np.load(path) as data:
+        return data["windows"].astype(np.float32)
+
+
+def predict_in_batches(predict_fn, windows):
+    """배치 단위 예측 - (N, num_labels) 확률과 윈도우당 평균 지연 시간(ms) 반환"""
+    outputs = []
+    start_time = time.perf_counter()
+    for start in range(0, len(windows), EVAL_BATCH_SIZE):
+        outputs.append(np.asarray(predict_fn(windows[start:start + EVAL_BATCH_SIZE])))
+    latency_ms = (time.perf_counter() - start_time) * 1000 / len(windows)
+    return np.concatenate(outputs), latency_ms
+
+
+def evaluate_variant(model_content, windows, reference_probs):
+    """변형 모델의 top-1 일치율, 최대 확률 오차, 지연 시간 평가"""
+    backend = TFLiteBackend(model_content)
+    probs, latency_ms = predict_in_batches(backend, windows)
+    return {
+        "top1_agreement": float(np.mean(probs.argmax(axis=1) == reference_probs.argmax(axis=1))),
+        "max_abs_error": float(np.max(np.abs(probs - reference_probs))),
+        "latency_ms_per_window": latency_ms,
+        "size_bytes": len(model_content),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize a sign classifier model and publish variants that pass the accuracy gate")
+    parser.add_argument("model_info", type=str, help="model_info file name, local path or S3 URL")
+    parser.add_argument("--validation-set", type=str, default=None,
+                        help="npz with a 'windows' array of model inputs (default: model_info['validation_set'])")
+    parser.add_argument("--variants", nargs="+", default=list(QUANTIZATION_VARIANTS), choices=QUANTIZATION_VARIANTS)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_AGREEMENT_THRESHOLD,
+                        help=f"Minimum top-1 agreement with the float32 model (default: {DEFAULT_AGREEMENT_THRESHOLD})")
+    parser.add_argument("--output-dir", type=str, default="quantized")
+    parser.add_argument("--publish", action="store_true", help="Upload passing variants next to the original model on S3")
+    args = parser.parse_args()
+
+    model = ClassifierModel(resolve_model_info_url(args.model_info))
+    validation_set = args.validation_set or model.model_info.get("validation_set")
+    if not validation_set:
+        parser.error("--validation-set is required when model_info has no 'validation_set'")
+    windows = load_validation_windows(validation_set)
+    if windows.ndim != 3 or windows.shape[1] != model.MAX_SEQ_LENGTH:
+        parser.error(f"validation windows shape {windows.shape} does not match sequence length {model.MAX_SEQ_LENGTH}")
+
+    reference_probs, reference_latency = predict_in_batches(model.predict_keras, windows)
+    print(f"float32: {len(windows)} windows, {reference_latency:.2f} ms/window, {model.memory_bytes / (1024 * 1024):.1f}MB")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    report = {"model_info": model.model_info_url, "threshold": args.threshold, "windows": len(windows), "variants": {}}
+    for variant in args.variants:
+        model_content = TFLiteBackend.convert(model.model, quantization=variant)
+        result = evaluate_variant(model_content, windows, reference_probs)
+        result["passed"] = result["top1_agreement"] >= args.threshold
+        report["variants"][variant] = result
+        print(
+            f"{variant}: top-1 agreement {result['top1_agreement']:.4f}, max error {result['max_abs_error']:.2e}, "
+            f"{result['latency_ms_per_window']:.2f} ms/window, {result['size_bytes'] / (1024 * 1024):.1f}MB "
+            f"-> {'PASS' if result['passed'] else 'FAIL'}"
+        )
+        if not result["passed"]:
+            continue
+
+        variant_key = quantized_model_key(model.model_info["model_path"], variant)
+        local_path = os.path.join(args.output_dir, os.path.basename(variant_key))
+        with open(local_path, "wb") as f:
+            f.write(model_content)
+        if args.publish:
+            result["published"] = s3_utils.upload_file_to_s3(local_path, f"s3://waterandfish-s3/{variant_key}")
+            print(f"  published: {result['published']}")
+
+    report_path = os.path.join(args.output_dir, "quantization_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"report: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,428 @@
+"""
+수어 분류기 WebSocket 서버 녹화 세션 재생 벤치마크
+
+실제 클라이언트 세션을 녹화해 두었다가 로컬에서 실행 중인 분류기 서버에 N개의 동시
+클라이언트로 재생하고 end-to-end 지연 시간(p50/p95/p99), 초당 예측 수, 누락 프레임,
+서버 CPU/RSS를 측정합니다. 최적화 전후 비교와 성능 회귀 확인용입니다.
+
+    # 1) 녹화: 프런트엔드를 프록시(9100)에 연결하면 서버(9001)로 중계하며 세션을 저장
+    python src/scripts/replay_benchmark.py record --upstream ws://localhost:9001 --listen-port 9100 --output sessions/
+    # (녹화가 없으면 합성 세션 생성)
+    python src/scripts/replay_benchmark.py synthesize --output sessions/ --frames 600
+    # 2) 재생
+    python src/scripts/replay_benchmark.py replay ws://localhost:9001 sessions/*.wfrec --clients 8 --fps 30 --server-pid <PID>
+
+세션 파일(.wfrec)은 b"WFREC" + 버전(u8) 헤더 뒤에 레코드를 이어 붙인 형식입니다.
+각 레코드는 <세션 시작 후 경과 시간(f64 초), 길이(u32)> + 바이너리 랜드마크 프로토콜 메시지
+(landmark_protocol.encode_frames)이므로 JSON 녹화보다 약 5배 작습니다.
+
+지연 시간은 송신부터 결과 수신까지를 잽니다. JSON 모드는 클라이언트가 보낸 timestamp를
+서버가 결과에 그대로 돌려주고 (landmarks: 예측을 발생시킨 프레임, landmarks_sequence: 시퀀스 메시지),
+바이너리 모드는 헤더의 message_id를 결과에 돌려주므로 message_id별 송신 시각과 비교합니다.
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import struct
+import sys
+import time
+
+import numpy as np
+import psutil
+import websockets
+
+# src/ 를 import 경로에 추가 (services 패키지 사용)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.landmark_preprocessing import LANDMARK_PARTS, NUM_LANDMARKS, RIGHT_SHOULDER, LEFT_SHOULDER
+from services.landmark_protocol import HEADER, PRESENCE_BITS, decode_frames, encode_frames
+
+SESSION_MAGIC = b"WFREC"
+SESSION_VERSION = 1
+SESSION_HEADER = struct.Struct("<5sB")
+RECORD_HEADER = struct.Struct("<dI")
+
+# 바이너리 메시지 헤더의 마지막 필드 (message_id, 1 ~ 65535를 순환하며 사용)
+MESSAGE_ID = struct.Struct("<H")
+MESSAGE_ID_OFFSET = HEADER.size - MESSAGE_ID.size
+MAX_MESSAGE_ID = 0xFFFF
+
+
+# ---------------------------------------------------------------------------
+# 세션 파일
+# ---------------------------------------------------------------------------
+
+class SessionWriter:
+    """랜드마크 메시지를 .wfrec 세션 파일에 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "wb")
+        self.file.write(SESSION_HEADER.pack(SESSION_MAGIC, SESSION_VERSION))
+        self.start_time = time.perf_counter()
+        self.num_frames = 0
+
+    def write(self, payload, num_frames):
+        """바이너리 프로토콜 메시지 하나를 경과 시간과 함께 기록"""
+        elapsed = time.perf_counter() - self.start_time
+        self.file.write(RECORD_HEADER.pack(elapsed, len(payload)))
+        self.file.write(payload)
+        self.num_frames += num_frames
+
+    def close(self):
+        self.file.close()
+
+
+def read_session(path):
+    """세션 파일을 (경과 시간, PackedFrame) 리스트로 읽음 (메시지 안의 프레임은 같은 시각)"""
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = SESSION_HEADER.unpack_from(data, 0)
+    if magic != SESSION_MAGIC or version != SESSION_VERSION:
+        raise ValueError(f"세션 파일 형식이 아닙니다: {path}")
+    frames = []
+    offset = SESSION_HEADER.size
+    while offset < len(data):
+        elapsed, length = RECORD_HEADER.unpack_from(data, offset)
+        offset += RECORD_HEADER.size
+        frames.extend((elapsed, frame) for frame in decode_frames(data[offset:offset + length]))
+        offset += length
+    return frames
+
+
+def packed_frame_to_dict(frame):
+    """PackedFrame을 JSON landmarks 메시지의 프레임 dict로 변환"""
+    result = {}
+    offset = 0
+    for bit, (key, start, end) in zip(PRESENCE_BITS, LANDMARK_PARTS):
+        if frame.presence & bit:
+            result[key] = frame.coords[offset:offset + end - start].tolist()
+            offset += end - start
+        else:
+            result[key] = None
+    return result
+
+
+def json_message_frames(data):
+    """클라이언트 JSON 메시지에서 녹화할 프레임 dict 리스트 추출"""
+    if data.get("type") == "landmarks" and isinstance(data.get("data"), dict):
+        return [data["data"]]
+    if data.get("type") == "landmarks_sequence" and isinstance(data.get("data"), dict):
+        return [frame for frame in data["data"].get("sequence", []) if isinstance(frame, dict)]
+    return []
+
+
+# ---------------------------------------------------------------------------
+# record: 프록시로 실제 세션 녹화
+# ---------------------------------------------------------------------------
+
+async def record(args):
+    os.makedirs(args.output, exist_ok=True)
+    session_counter = 0
+
+    async def handle(client):
+        nonlocal session_counter
+        session_counter += 1
+        path = os.path.join(args.output, f"session_{time.strftime('%Y%m%d_%H%M%S')}_{session_counter:03d}.wfrec")
+        writer = SessionWriter(path)
+        upstream_url = args.upstream + (client.request.path if client.request else "")
+        print(f"recording {path} ({upstream_url})")
+        async with websockets.connect(upstream_url, max_size=None) as upstream:
+            async def client_to_upstream():
+                async for message in client:
+                    if isinstance(message, bytes):
+                        try:
+                            writer.write(message, len(decode_frames(message)))
+                        except ValueError:
+                            pass
+                    else:
+                        try:
+                            frames = json_message_frames(json.loads(message))
+                        except json.JSONDecodeError:
+                            frames = []
+                        if frames:
+                            writer.write(encode_frames(frames), len(frames))
+                    await upstream.send(message)
+
+            async def upstream_to_client():
+                async for message in upstream:
+                    await client.send(message)
+
+            try:
+                await asyncio.gather(client_to_upstream(), upstream_to_client())
+            except websockets.exceptions.ConnectionClosed:
+                pass
+            finally:
+                writer.close()
+                print(f"saved {path}: {writer.num_frames} frames, {os.path.getsize(path) / 1024:.1f}KB")
+
+    async with websockets.serve(handle, "localhost", args.listen_port, max_size=None):
+        print(f"recording proxy ws://localhost:{args.listen_port} -> {args.upstream} (Ctrl+C to stop)")
+        await asyncio.Future()
+
+
+# ---------------------------------------------------------------------------
+# synthesize: 녹화가 없을 때 쓸 합성 세션
+# ---------------------------------------------------------------------------
+
+def synthesize(args):
+    """어깨 너비가 현실적인 랜덤 워크 랜드마크 세션 생성 (손은 가끔 사라짐)"""
+    os.makedirs(args.output, exist_ok=True)
+    rng = np.random.default_rng(args.seed)
+    for index in range(args.sessions):
+        base = rng.uniform(0.3, 0.7, (NUM_LANDMARKS, 3)).astype(np.float32)
+        base[LEFT_SHOULDER, 0], base[RIGHT_SHOULDER, 0] = 0.35, 0.60
+        path = os.path.join(args.output, f"synthetic_{index:03d}.wfrec")
+        with open(path, "wb") as f:
+            f.write(SESSION_HEADER.pack(SESSION_MAGIC, SESSION_VERSION))
+            landmarks = base.copy()
+            for frame_number in range(args.frames):
+                landmarks += rng.normal(0.0, 0.004, landmarks.shape).astype(np.float32)
+                frame = {
+                    key: (landmarks[start:end].tolist() if key == "pose" or rng.random() > 0.1 else None)
+                    for key, start, end in LANDMARK_PARTS
+                }
+                payload = encode_frames([frame])
+                f.write(RECORD_HEADER.pack(frame_number / args.fps, len(payload)))
+                f.write(payload)
+        print(f"saved {path}: {args.frames} frames, {os.path.getsize(path) / 1024:.1f}KB")
+
+
+# ---------------------------------------------------------------------------
+# replay: N개 동시 클라이언트로 재생
+# ---------------------------------------------------------------------------
+
+class ClientStats:
+    def __init__(self):
+        self.sent_frames = 0
+        self.dropped_frames = 0
+        self.predictions = 0
+        self.errors = 0
+        self.received_bytes = 0
+        self.latencies_ms = []
+
+
+def now_ms():
+    return time.perf_counter() * 1000
+
+
+async def replay_client(args, url, session, stats, stop_time):
+    """세션 하나를 반복 재생하는 클라이언트 - 송신 페이스를 못 맞추면 프레임을 누락시킴"""
+    group_size = args.sequence_size
+    groups = [session[i:i + group_size] for i in range(0, len(session), group_size)]
+    if args.protocol == "json":
+        payloads = [[packed_frame_to_dict(frame) for _, frame in group] for group in groups]
+    else:
+        # 송신할 때마다 message_id만 헤더에 덮어씀
+        payloads = [bytearray(encode_frames([packed_frame_to_dict(frame) for _, frame in group])) for group in groups]
+    if args.fps > 0:
+        offsets = [i * group_size / args.fps for i in range(len(groups))]
+        loop_length = len(groups) * group_size / args.fps
+    else:
+        # 녹화된 타이밍 그대로
+        offsets = [group[0][0] - session[0][0] for group in groups]
+        loop_length = session[-1][0] - session[0][0] + 1 / 30
+
+    params = []
+    if args.protocol == "binary":
+        params.append("protocol=binary")
+    if args.results != "full":
+        params.append(f"results={args.results}")
+    if args.change_band is not None:
+        params.append(f"change_band={args.change_band}")
+    connect_url = url + ("?" + "&".join(params) if params else "")
+    sent_at = [None] * (MAX_MESSAGE_ID + 1)  # 바이너리 message_id별 마지막 송신 시각
+    message_id = 0
+
+    def record_latency(data, received):
+        if args.protocol == "json":
+            stats.latencies_ms.append(received - data["timestamp"])
+        elif data.get("message_id") is not None and sent_at[data["message_id"]] is not None:
+            stats.latencies_ms.append(received - sent_at[data["message_id"]])
+
+    async with websockets.connect(connect_url, max_size=None) as websocket:
+        async def receive():
+            async for message in websocket:
+                received = now_ms()
+                stats.received_bytes += len(message)
+                data = json.loads(message)
+                if data.get("type") == "classification_result":
+                    stats.predictions += 1
+                    record_latency(data, received)
+                elif data.get("type") == "classification_results":
+                    stats.predictions += len(data["data"])
+                    record_latency(data, received)
+                elif data.get("type") == "error":
+                    stats.errors += 1
+
+        receiver = asyncio.create_task(receive())
+        loop_start = time.perf_counter()
+        try:
+            while time.perf_counter() < stop_time:
+                for offset, group, payload in zip(offsets, groups, payloads):
+                    delay = loop_start + offset - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    elif -delay > args.max_lag_ms / 1000:
+                        # 실시간 카메라처럼 늦은 프레임은 보내지 않음
+                        stats.dropped_frames += len(group)
+                        continue
+                    if time.perf_counter() >= stop_time:
+                        break
+                    if args.protocol == "binary":
+                        message_id = message_id % MAX_MESSAGE_ID + 1
+                        MESSAGE_ID.pack_into(payload, MESSAGE_ID_OFFSET, message_id)
+                        sent_at[message_id] = now_ms()
+                        await websocket.send(bytes(payload))
+                    elif group_size == 1:
+                        await websocket.send(json.dumps({"type": "landmarks", "data": payload[0], "timestamp": now_ms()}))
+                    else:
+                        await websocket.send(json.dumps({
+                            "type": "landmarks_sequence",
+                            "data": {"sequence": payload, "frame_count": len(payload), "timestamp": now_ms()}
+                        }))
+                    stats.sent_frames += len(group)
+                loop_start += loop_length
+            # 마지막 예측 결과 대기
+            await asyncio.sleep(args.drain_seconds)
+        finally:
+            receiver.cancel()
+
+
+async def sample_server(pid, samples, stop_event, interval=0.5):
+    """서버 프로세스 CPU 사용률과 RSS를 주기적으로 샘플링"""
+    process = psutil.Process(pid)
+    process.cpu_percent(None)
+    while not stop_event.is_set():
+        await asyncio.sleep(interval)
+        try:
+            samples.append((process.cpu_percent(None), process.memory_info().rss))
+        except psutil.NoSuchProcess:
+            break
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else float("nan")
+
+
+async def replay(args):
+    paths = sorted(path for pattern in args.sessions for path in glob.glob(pattern))
+    if not paths:
+        raise SystemExit("재생할 세션 파일이 없습니다")
+    sessions = [read_session(path) for path in paths]
+    print(f"{len(sessions)} sessions, {sum(len(s) for s in sessions)} frames, {args.clients} clients, "
+          f"protocol={args.protocol}, fps={args.fps or 'recorded'}, sequence size={args.sequence_size}")
+
+    stop_event = asyncio.Event()
+    server_samples = []
+    sampler = None
+    if args.server_pid:
+        sampler = asyncio.create_task(sample_server(args.server_pid, server_samples, stop_event))
+
+    client_stats = [ClientStats() for _ in range(args.clients)]
+    start = time.perf_counter()
+    stop_time = start + args.duration
+    results = await asyncio.gather(*[
+        replay_client(args, args.url, sessions[i % len(sessions)], client_stats[i], stop_time)
+        for i in range(args.clients)
+    ], return_exceptions=True)
+    elapsed = time.perf_counter() - start - args.drain_seconds
+    stop_event.set()
+    if sampler is not None:
+        await sampler
+
+    failures = [result for result in results if isinstance(result, Exception)]
+    report = build_report(args, client_stats, failures, elapsed, server_samples)
+    for failure in failures:
+        print(f"client failed: {failure!r}")
+    print(json.dumps(report, indent=2))
+    if args.output_json:
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+def build_report(args, client_stats, failures, elapsed, server_samples):
+    """클라이언트별 통계와 서버 샘플을 합쳐 벤치마크 결과 dict 생성"""
+    latencies = [latency for stats in client_stats for latency in stats.latencies_ms]
+    sent = sum(stats.sent_frames for stats in client_stats)
+    dropped = sum(stats.dropped_frames for stats in client_stats)
+    predictions = sum(stats.predictions for stats in client_stats)
+    report = {
+        "clients": args.clients,
+        "failed_clients": len(failures),
+        "protocol": args.protocol,
+        "duration_s": elapsed,
+        "sent_frames": sent,
+        "dropped_frames": dropped,
+        "dropped_ratio": dropped / (sent + dropped) if sent + dropped else 0.0,
+        "predictions": predictions,
+        "predictions_per_s": predictions / elapsed if elapsed > 0 else 0.0,
+        "errors": sum(stats.errors for stats in client_stats),
+        "received_kb": sum(stats.received_bytes for stats in client_stats) / 1024,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "max": max(latencies) if latencies else float("nan"),
+        },
+    }
+    if server_samples:
+        cpu = [sample[0] for sample in server_samples]
+        rss = [sample[1] for sample in server_samples]
+        report["server"] = {
+            "cpu_percent_avg": float(np.mean(cpu)),
+            "cpu_percent_max": float(np.max(cpu)),
+            "rss_mb_avg": float(np.mean(rss)) / (1024 * 1024),
+            "rss_mb_max": float(np.max(rss)) / (1024 * 1024),
+        }
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay sign classifier WebSocket sessions for benchmarking")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="Record sessions through a local proxy")
+    record_parser.add_argument("--upstream", type=str, default="ws://localhost:9001")
+    record_parser.add_argument("--listen-port", type=int, default=9100)
+    record_parser.add_argument("--output", type=str, default="sessions")
+
+    synth_parser = subparsers.add_parser("synthesize", help="Generate synthetic sessions")
+    synth_parser.add_argument("--output", type=str, default="sessions")
+    synth_parser.add_argument("--sessions", type=int, default=4)
+    synth_parser.add_argument("--frames", type=int, default=600)
+    synth_parser.add_argument("--fps", type=float, default=30.0)
+    synth_parser.add_argument("--seed", type=int, default=0)
+
+    replay_parser = subparsers.add_parser("replay", help="Replay sessions against a running server")
+    replay_parser.add_argument("url", type=str, help="Server URL, e.g. ws://localhost:9001")
+    replay_parser.add_argument("sessions", nargs="+", help="Session files or glob patterns")
+    replay_parser.add_argument("--clients", type=int, default=4, help="Concurrent simulated clients (default: 4)")
+    replay_parser.add_argument("--fps", type=float, default=30.0, help="Frame rate per client, 0 = recorded timing (default: 30)")
+    replay_parser.add_argument("--duration", type=float, default=30.0, help="Replay duration in seconds (default: 30)")
+    replay_parser.add_argument("--protocol", choices=("json", "binary"), default="json")
+    replay_parser.add_argument("--results", choices=("full", "topk", "array"), default="full",
+                               help="Result format to negotiate; topk/array receive the label table once (default: full)")
+    replay_parser.add_argument("--change-band", type=float, default=None,
+                               help="Only receive results when the top label or its confidence band changes")
+    replay_parser.add_argument("--sequence-size", type=int, default=1,
+                               help="Frames per message; >1 sends landmarks_sequence or multi-frame binary messages (default: 1)")
+    replay_parser.add_argument("--max-lag-ms", type=float, default=100.0,
+                               help="Frames later than this are dropped instead of sent (default: 100)")
+    replay_parser.add_argument("--drain-seconds", type=float, default=1.0, help="Time to wait for final results (default: 1)")
+    replay_parser.add_argument("--server-pid", type=int, default=None, help="Server PID for CPU/RSS sampling")
+    replay_parser.add_argument("--output-json", type=str, default=None)
+
+    args = parser.parse_args()
+    if args.command == "record":
+        asyncio.run(record(args))
+    elif args.command == "synthesize":
+        synthesize(args)
+    else:
+        asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    main()
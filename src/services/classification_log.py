@@ -0,0 +1,110 @@
+"""
+분류 결과 모니터링 채널 (classification_log 구독)
+
+분류 결과가 나올 때마다 classification_log 메시지를 연결된 모든 클라이언트에
+send 태스크로 뿌리는 대신, {"type": "subscribe", "channel": "classification_log"}로
+구독한 모니터링 연결에만 전달합니다. 학습자 연결은 자기 예측 결과
+(classification_result)만 받습니다.
+
+- 이벤트마다 JSON 직렬화는 한 번만 하고, 구독자가 없으면 직렬화하지 않습니다.
+- 구독자마다 크기 제한 큐(가득 차면 가장 오래된 메시지부터 버림)와 전송 태스크 하나를 둡니다.
+- 구독자별 초당 최대 전송 횟수(max_rate)를 넘지 않도록 전송 간격을 둡니다.
+
+멀티 프로세스 모드(--workers, --frontends)에서는 구독한 연결이 속한 프로세스에서
+처리된 결과만 전달됩니다.
+"""
+import asyncio
+import json
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "classification_log"
+
+
+class LogSubscription:
+    """구독자 하나의 전송 큐와 전송 태스크"""
+
+    __slots__ = ("websocket", "queue", "max_rate", "min_interval", "sent", "dropped", "_wakeup", "_task")
+
+    def __init__(self, websocket, queue_size, max_rate):
+        self.websocket = websocket
+        self.queue = deque(maxlen=queue_size)
+        self.max_rate = max_rate
+        self.min_interval = 1.0 / max_rate
+        self.sent = 0
+        self.dropped = 0  # 큐가 가득 차 버려진 메시지 수
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run())
+
+    def offer(self, message):
+        """직렬화된 메시지를 큐에 추가 (가득 차면 가장 오래된 메시지를 버림)"""
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1
+        self.queue.append(message)
+        self._wakeup.set()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        last_sent = None
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                while self.queue:
+                    # 전송 간격 제한 - 기다리는 동안 들어온 메시지는 큐 크기 안에서만 쌓임
+                    if last_sent is not None:
+                        delay = last_sent + self.min_interval - loop.time()
+                        if delay > 0:
+                            await asyncio.sleep(delay)
+                    await self.websocket.send(self.queue.popleft())
+                    last_sent = loop.time()
+                    self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 연결이 끊긴 경우 - 정리는 연결 종료 처리(unsubscribe)에서 수행
+            logger.info(f"classification_log 전송 중단: {e}")
+
+    def close(self):
+        self._task.cancel()
+
+
+class ClassificationLogHub:
+    """classification_log 구독 관리와 결과 발행"""
+
+    def __init__(self, queue_size=32, max_rate=10.0):
+        if not max_rate > 0:
+            raise ValueError(f"max_rate는 0보다 커야 합니다: {max_rate}")
+        self.queue_size = queue_size  # 구독자별 최대 대기 메시지 수
+        self.max_rate = max_rate  # 구독자별 초당 최대 전송 횟수 (클라이언트는 이보다 낮게만 요청 가능)
+        self.subscriptions = set()
+
+    def subscribe(self, websocket, max_rate=None):
+        """구독 추가 - max_rate는 서버 상한 이하로 제한"""
+        rate = self.max_rate
+        if max_rate is not None and 0 < float(max_rate) < rate:
+            rate = float(max_rate)
+        subscription = LogSubscription(websocket, self.queue_size, rate)
+        self.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.discard(subscription)
+            subscription.close()
+            logger.info(f"classification_log 구독 해제 (전송 {subscription.sent}개, 버림 {subscription.dropped}개)")
+
+    def publish(self, result, client_id, timestamp):
+        """분류 결과 하나를 모든 구독자 큐에 추가 (직렬화는 한 번만)"""
+        if not self.subscriptions:
+            return
+        message = json.dumps({
+            "type": CHANNEL,
+            "data": result,
+            "client_id": client_id,
+            "timestamp": timestamp
+        })
+        for subscription in self.subscriptions:
+            subscription.offer(message)
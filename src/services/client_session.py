@@ -0,0 +1,115 @@
+"""
+WebSocket 연결별 분류 세션
+
+클라이언트 상태를 client_id 문자열을 키로 하는 여러 dict에 나눠 두는 대신, 연결마다
+__slots__ 객체 하나에 모아 연결 처리 코루틴이 프레임 처리 함수에 직접 넘깁니다.
+프레임 처리 경로는 해시 조회 없이 속성 접근만 하며, 같은 NAT 뒤의 클라이언트끼리
+ip:port 키가 겹쳐 상태를 공유하는 일도 없습니다.
+"""
+import itertools
+import time
+
+try:
+    from .frame_queue import FrameQueue
+    from .landmark_buffer import LandmarkRingBuffer
+    from .result_format import ResultFormat
+    from .result_smoother import ResultSmoother
+except ImportError:
+    # sign_classifier_websocket_server.py를 스크립트로 실행하는 경우
+    from frame_queue import FrameQueue
+    from landmark_buffer import LandmarkRingBuffer
+    from result_format import ResultFormat
+    from result_smoother import ResultSmoother
+
+_session_ids = itertools.count(1)
+
+
+class ClientSession:
+    """연결 하나의 링 버퍼, 카운터, 스무딩 상태, 타이밍/지표"""
+
+    __slots__ = (
+        # 식별 / 연결 설정
+        "client_id",
+        "protocol",
+        "result_format",
+        "model",
+        # 프레임 수집
+        "frame_queue",
+        "sequence",
+        "vector_count",
+        # 스무딩 상태
+        "result_smoother",
+        "prediction",
+        "confidence",
+        # 진행 중인 예측 / 모션 게이트
+        "inflight",
+        "last_result",
+        "last_inference_time",
+        # 타이밍 / 지표
+        "connected_at",
+        "predictions",
+        "gated_predictions",
+        # 처리 시간 계정 / CPU 예산 (토큰 버킷)
+        "service_time",
+        "budget_tokens",
+        "budget_updated",
+        # classification_log 구독 (모니터링 연결만, 없으면 None)
+        "log_subscription",
+    )
+
+    def __init__(self, remote_address, model, result_buffer_size, smoothing="mean", smoothing_alpha=None,
+                 frame_queue=None):
+        # ip:port 뒤에 연결 순번을 붙여 같은 주소에서 다시 접속해도 구분
+        self.client_id = f"{remote_address[0]}:{remote_address[1]}#{next(_session_ids)}"
+        self.protocol = "json"
+        self.result_format = ResultFormat()
+        self.model = model
+        self.frame_queue = frame_queue if frame_queue is not None else FrameQueue()
+        self.sequence = LandmarkRingBuffer(model.MAX_SEQ_LENGTH)
+        self.vector_count = 0
+        self.result_smoother = ResultSmoother(len(model.ACTIONS), result_buffer_size, smoothing, smoothing_alpha)
+        self.prediction = "None"
+        self.confidence = 0.0
+        self.inflight = None
+        self.last_result = None
+        self.last_inference_time = 0.0
+        self.connected_at = time.time()
+        self.predictions = 0
+        self.gated_predictions = 0
+        self.service_time = 0.0
+        self.budget_tokens = 0.0
+        self.budget_updated = time.monotonic()
+        self.log_subscription = None
+
+    def cancel_inflight(self):
+        """진행 중인 예측 취소 (연결 종료, 모델 변경 시)"""
+        if self.inflight is not None and not self.inflight.done():
+            self.inflight.cancel()
+        self.inflight = None
+
+    def charge(self, seconds):
+        """처리 시간 기록 (이벤트 루프에서 쓴 시간 + 배치 추론 시간 중 이 클라이언트 몫)"""
+        self.service_time += seconds
+        self.budget_tokens -= seconds
+
+    def budget_delay(self, rate, burst, now):
+        """CPU 예산(초당 rate초, 최대 burst초까지 적립)을 넘었으면 다음 처리까지 기다릴 시간 반환"""
+        if rate <= 0:
+            return 0.0
+        self.budget_tokens = min(burst, self.budget_tokens + (now - self.budget_updated) * rate)
+        self.budget_updated = now
+        return -self.budget_tokens / rate if self.budget_tokens < 0 else 0.0
+
+    def switch_model(self, model):
+        """모델 변경 - 윈도우 길이와 라벨이 달라질 수 있으므로 수집/스무딩 상태 초기화
+
+        큐에 남은 프레임은 이전 모델(레슨) 기준으로 보낸 것이므로 처리하지 않고 버립니다.
+        """
+        self.cancel_inflight()
+        self.frame_queue.clear()
+        self.model = model
+        self.sequence = LandmarkRingBuffer(model.MAX_SEQ_LENGTH)
+        self.vector_count = 0
+        self.result_smoother.reset(len(model.ACTIONS))
+        self.result_format.reset()
+        self.last_result = None
@@ -0,0 +1,97 @@
+"""
+클라이언트별 프레임 입력 큐 (backpressure)
+
+수신 루프에서 프레임을 바로 처리하면 서버가 밀릴 때 websockets가 메시지를 계속 버퍼링하고,
+쌓인 프레임을 순서대로 모두 처리하느라 예측이 학습자의 실제 동작보다 점점 늦어집니다.
+수신 태스크는 프레임 메시지를 이 큐에 넣기만 하고, 처리 태스크가 큐에서 꺼내 처리합니다.
+
+- drop_oldest: 큐에 쌓인 프레임이 max_frames를 넘으면 가장 오래된 메시지부터 버림
+- coalesce: 처리 태스크가 꺼낼 때마다 최신 coalesce_frames개 프레임만 남기고 나머지를 버림
+  (밀린 만큼 건너뛰어 항상 최신 프레임을 처리, 큐 자체는 max_frames로 제한)
+
+메시지 단위로 버리므로 시퀀스 메시지는 통째로 남거나 버려지며, 가장 최신 메시지는 항상 남습니다.
+부하가 걸리면 오래된 프레임 대신 더 최신이고 성긴 프레임으로 예측하게 됩니다.
+"""
+import asyncio
+from collections import deque, namedtuple
+
+QUEUE_POLICIES = ("drop_oldest", "coalesce")
+
+# 프레임 메시지: 프레임 리스트(dict 또는 PackedFrame), 시퀀스 메시지 여부, 결과에 돌려줄 timestamp,
+# 결과에 돌려줄 바이너리 메시지 번호 (없으면 None)
+FrameMessage = namedtuple("FrameMessage", ["frames", "sequence", "timestamp", "message_id"], defaults=(None,))
+
+
+class FrameQueue:
+    """프레임 수 기준으로 제한되는 메시지 큐 + 깊이/버림 통계"""
+
+    __slots__ = (
+        "policy",
+        "max_frames",
+        "coalesce_frames",
+        "_messages",
+        "_frames",
+        "_ready",
+        "queued_frames",
+        "dropped_frames",
+        "max_depth",
+    )
+
+    def __init__(self, policy="drop_oldest", max_frames=60, coalesce_frames=10):
+        if policy not in QUEUE_POLICIES:
+            raise ValueError(f"지원하지 않는 큐 정책: {policy}")
+        self.policy = policy
+        self.max_frames = max(1, max_frames)
+        self.coalesce_frames = max(1, coalesce_frames)
+        self._messages = deque()
+        self._frames = 0  # 현재 큐에 있는 프레임 수
+        self._ready = asyncio.Event()
+        self.queued_frames = 0  # 큐에 들어온 전체 프레임 수
+        self.dropped_frames = 0  # 처리하지 못하고 버린 프레임 수
+        self.max_depth = 0  # 최대 큐 깊이 (프레임 수)
+
+    def __len__(self):
+        """현재 큐 깊이 (프레임 수)"""
+        return self._frames
+
+    def put(self, message):
+        """프레임 메시지 추가 - 큐가 넘치면 가장 오래된 메시지부터 버림"""
+        self._messages.append(message)
+        self._frames += len(message.frames)
+        self.queued_frames += len(message.frames)
+        self._drop_oldest(self.max_frames)
+        self.max_depth = max(self.max_depth, self._frames)
+        self._ready.set()
+
+    async def get(self):
+        """처리할 다음 메시지 (coalesce 정책이면 최신 coalesce_frames개 프레임만 남긴 뒤 꺼냄)"""
+        while not self._messages:
+            self._ready.clear()
+            await self._ready.wait()
+        if self.policy == "coalesce":
+            self._drop_oldest(self.coalesce_frames)
+        message = self._messages.popleft()
+        self._frames -= len(message.frames)
+        return message
+
+    def clear(self):
+        """큐에 남은 메시지를 모두 버림 (모델 변경 시 이전 레슨의 프레임) - 버린 프레임 수 반환"""
+        cleared = self._frames
+        self._messages.clear()
+        self._frames = 0
+        self.dropped_frames += cleared
+        return cleared
+
+    def _drop_oldest(self, limit):
+        while self._frames > limit and len(self._messages) > 1:
+            dropped = self._messages.popleft()
+            self._frames -= len(dropped.frames)
+            self.dropped_frames += len(dropped.frames)
+
+    def stats(self):
+        return {
+            "queue_depth": self._frames,
+            "max_queue_depth": self.max_depth,
+            "queued_frames": self.queued_frames,
+            "dropped_frames": self.dropped_frames,
+        }
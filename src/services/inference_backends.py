@@ -0,0 +1,255 @@
+"""
+수어 분류기 CPU 추론 백엔드
+
+Keras 모델을 한 번만 가벼운 런타임 형식(TFLite 또는 ONNX)으로 변환하고, 변환 결과를
+모델 파일 내용의 해시로 캐시합니다. 같은 모델로 다시 시작하면 변환을 건너뜁니다.
+
+양자화 변형(float16, 동적 범위 int8)은 src/scripts/quantize_classifier.py가 검증 세트로
+top-1 일치율을 확인한 뒤 원본 모델 옆 경로(<model>.<variant>.tflite)에 게시합니다.
+
+백엔드를 만든 직후 고정된 warmup 입력으로 Keras 출력과 비교하는 parity check를 수행하며,
+BACKEND_PARITY_TOLERANCE를 넘거나 예측 라벨이 달라지면 사용하지 않고 Keras로 되돌아갑니다.
+모든 백엔드는 (B, T, 675) float32 -> (B, num_labels) numpy 배열 형태의 호출 가능 객체입니다.
+
+Keras 경로의 tf.function은 float32 입력 시그니처로 고정하고, 배치를 BATCH_BUCKETS 크기로
+0 패딩해 XLA가 시작 시 warmup한 형태만 보도록 합니다. TFLite 백엔드도 같은 버킷으로 패딩하고
+버킷마다 인터프리터를 하나씩 두어 배치 크기가 바뀔 때마다 텐서를 다시 할당하지 않습니다.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    from .landmark_preprocessing import MODEL_FEATURE_DIM
+except ImportError:
+    # sign_classifier_websocket_server.py를 스크립트로 실행하는 경우
+    from landmark_preprocessing import MODEL_FEATURE_DIM
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("keras", "tflite", "onnx")
+QUANTIZATION_VARIANTS = ("float16", "int8")
+
+CONVERTED_CACHE_DIR = os.getenv(
+    'CONVERTED_MODEL_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'waterandfish-converted-models')
+)
+
+# Keras 출력 대비 허용 오차 (확률 절대 오차)
+BACKEND_PARITY_TOLERANCE = 1e-4
+PARITY_BATCH_SIZE = 4
+
+# tf.function / XLA가 컴파일하는 배치 크기 (시작 시 전부 warmup)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+
+def _file_digest(path):
+    """모델 파일 내용의 sha256 (디렉터리 형식 모델은 경로 + 수정 시각 기준)"""
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        digest.update(f"{os.path.abspath(path)}:{os.path.getmtime(path)}".encode("utf-8"))
+        return digest.hexdigest()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def converted_model_path(model_path, backend):
+    """변환된 아티팩트 캐시 경로"""
+    extension = {"tflite": ".tflite", "onnx": ".onnx"}[backend]
+    return os.path.join(CONVERTED_CACHE_DIR, f"{_file_digest(model_path)}{extension}")
+
+
+def quantized_model_key(model_path, variant):
+    """원본 모델 경로 옆의 양자화 변형 경로 (models/a.h5 -> models/a.int8.tflite)"""
+    return f"{os.path.splitext(model_path)[0]}.{variant}.tflite"
+
+
+def batch_buckets(max_batch_size):
+    """max_batch_size까지의 배치 버킷 (max_batch_size를 담을 수 있는 가장 작은 버킷까지 포함)"""
+    buckets = [b for b in BATCH_BUCKETS if b < max_batch_size]
+    buckets.append(next((b for b in BATCH_BUCKETS if b >= max_batch_size), max_batch_size))
+    return tuple(buckets)
+
+
+def bucket_batches(inputs, buckets):
+    """(B, T, F) 입력을 버킷 크기 배치들로 분할/0 패딩 - [(padded_batch, 실제 개수)] 반환"""
+    largest = buckets[-1]
+    batches = []
+    for start in range(0, len(inputs), largest):
+        chunk = inputs[start:start + largest]
+        size = next(b for b in buckets if b >= len(chunk))
+        if size != len(chunk):
+            padded = np.zeros((size,) + chunk.shape[1:], dtype=np.float32)
+            padded[:len(chunk)] = chunk
+            chunk = padded
+        batches.append((chunk, min(largest, len(inputs) - start)))
+    return batches
+
+
+def _atomic_write(path, data):
+    """임시 파일에 쓴 뒤 os.replace로 교체 (동시에 시작한 프로세스 보호)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = f"{path}.{os.getpid()}.part"
+    with open(part_path, "wb") as f:
+        f.write(data)
+    os.replace(part_path, path)
+
+
+class TFLiteBackend:
+    """TFLite 인터프리터 백엔드 (tflite_runtime이 있으면 사용, 없으면 tf.lite)"""
+
+    name = "tflite"
+
+    def __init__(self, model_content, buckets=BATCH_BUCKETS):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            import tensorflow as tf
+            Interpreter = tf.lite.Interpreter
+        self._interpreter_class = Interpreter
+        self.model_content = model_content
+        self.memory_bytes = len(model_content)
+        self.buckets = buckets
+        # 배치 버킷별 인터프리터 - 입력 크기 재설정/텐서 할당은 버킷마다 처음 한 번만 수행
+        self._interpreters = {}  # {버킷 크기: (interpreter, input_index, output_index)}
+
+    def _interpreter(self, input_shape):
+        entry = self._interpreters.get(input_shape[0])
+        if entry is None:
+            interpreter = self._interpreter_class(model_content=self.model_content)
+            input_index = interpreter.get_input_details()[0]["index"]
+            interpreter.resize_tensor_input(input_index, input_shape)
+            interpreter.allocate_tensors()
+            entry = (interpreter, input_index, interpreter.get_output_details()[0]["index"])
+            self._interpreters[input_shape[0]] = entry
+        return entry
+
+    @staticmethod
+    def convert(model, quantization=None):
+        """Keras 모델을 TFLite flatbuffer로 변환 (quantization: None, float16, int8)"""
+        import tensorflow as tf
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if quantization is not None:
+            # 가중치만 양자화 (int8은 동적 범위 양자화, 대표 데이터셋 불필요)
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+            if quantization == "float16":
+                converter.target_spec.supported_types = [tf.float16]
+        # LSTM 등 TFLite 기본 연산으로 바뀌지 않는 연산은 TF 연산으로 유지
+        converter.target_spec.supported_ops = [
+            tf.lite.OpsSet.TFLITE_BUILTINS,
+            tf.lite.OpsSet.SELECT_TF_OPS,
+        ]
+        converter._experimental_lower_tensor_list_ops = False
+        return converter.convert()
+
+    @classmethod
+    def from_keras(cls, model, model_path, max_seq_length):
+        """캐시된 .tflite가 있으면 읽고, 없으면 변환 후 캐시"""
+        path = converted_model_path(model_path, cls.name)
+        if os.path.exists(path):
+            logger.info(f"캐시된 TFLite 모델 사용: {path}")
+            with open(path, "rb") as f:
+                return cls(f.read())
+        logger.info("Keras 모델을 TFLite로 변환 중...")
+        model_content = cls.convert(model)
+        _atomic_write(path, model_content)
+        logger.info(f"TFLite 변환 완료: {path} ({len(model_content) / (1024 * 1024):.1f}MB)")
+        return cls(model_content)
+
+    def __call__(self, inputs):
+        # Keras 경로와 같은 배치 버킷으로 0 패딩해 버킷별 인터프리터로 실행
+        inputs = np.asarray(inputs, dtype=np.float32)
+        outputs = []
+        for batch, size in bucket_batches(inputs, self.buckets):
+            interpreter, input_index, output_index = self._interpreter(batch.shape)
+            interpreter.set_tensor(input_index, batch)
+            interpreter.invoke()
+            outputs.append(interpreter.get_tensor(output_index)[:size].copy())
+        return outputs[0] if len(outputs) == 1 else np.concatenate(outputs)
+
+
+class OnnxBackend:
+    """ONNX Runtime CPU 백엔드 (변환에는 tf2onnx 필요)"""
+
+    name = "onnx"
+
+    def __init__(self, model_path):
+        import onnxruntime as ort
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.memory_bytes = os.path.getsize(model_path)
+        self.input_name = self.session.get_inputs()[0].name
+
+    @staticmethod
+    def convert(model, max_seq_length, output_path):
+        import tensorflow as tf
+        import tf2onnx
+        input_signature = [tf.TensorSpec((None, max_seq_length, MODEL_FEATURE_DIM), tf.float32, name="input")]
+        tf2onnx.convert.from_keras(model, input_signature=input_signature, output_path=output_path)
+
+    @classmethod
+    def from_keras(cls, model, model_path, max_seq_length):
+        """캐시된 .onnx가 있으면 사용하고, 없으면 변환 후 캐시"""
+        path = converted_model_path(model_path, cls.name)
+        if os.path.exists(path):
+            logger.info(f"캐시된 ONNX 모델 사용: {path}")
+            return cls(path)
+        logger.info("Keras 모델을 ONNX로 변환 중...")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part_path = f"{path}.{os.getpid()}.part"
+        cls.convert(model, max_seq_length, part_path)
+        os.replace(part_path, path)
+        logger.info(f"ONNX 변환 완료: {path}")
+        return cls(path)
+
+    def __call__(self, inputs):
+        return self.session.run(None, {self.input_name: inputs})[0]
+
+
+BACKEND_CLASSES = {
+    "tflite": TFLiteBackend,
+    "onnx": OnnxBackend,
+}
+
+
+def parity_inputs(max_seq_length, batch_size=PARITY_BATCH_SIZE):
+    """parity check용 고정 warmup 입력 (0 입력 + 재현 가능한 난수 입력)"""
+    rng = np.random.default_rng(0)
+    inputs = rng.normal(0.0, 0.5, (batch_size, max_seq_length, MODEL_FEATURE_DIM)).astype(np.float32)
+    inputs[0] = 0.0
+    return inputs
+
+
+def check_parity(backend, reference_fn, inputs, tolerance=BACKEND_PARITY_TOLERANCE):
+    """백엔드 출력이 Keras 출력과 일치하는지 확인 - (통과 여부, 최대 절대 오차)"""
+    expected = np.asarray(reference_fn(inputs))
+    actual = np.asarray(backend(inputs))
+    if actual.shape != expected.shape:
+        return False, float("inf")
+    max_error = float(np.max(np.abs(actual - expected)))
+    same_labels = np.array_equal(actual.argmax(axis=1), expected.argmax(axis=1))
+    return max_error <= tolerance and same_labels, max_error
+
+
+def create_backend(backend_name, model, model_path, max_seq_length, reference_fn, tolerance=BACKEND_PARITY_TOLERANCE):
+    """Keras 모델로부터 백엔드를 만들고 parity check 통과 시 반환 (실패하면 None)"""
+    backend_class = BACKEND_CLASSES[backend_name]
+    try:
+        backend = backend_class.from_keras(model, model_path, max_seq_length)
+    except Exception as e:
+        logger.warning(f"{backend_name} 백엔드 생성 실패, Keras 사용: {e}")
+        return None
+
+    passed, max_error = check_parity(backend, reference_fn, parity_inputs(max_seq_length), tolerance)
+    if not passed:
+        logger.warning(
+            f"{backend_name} parity check 실패 (최대 오차 {max_error:.2e}, 허용 {tolerance:.0e}), Keras 사용"
+        )
+        return None
+    logger.info(f"{backend_name} parity check 통과 (최대 오차 {max_error:.2e})")
+    return backend
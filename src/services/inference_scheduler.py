@@ -0,0 +1,154 @@
+"""
+클라이언트 간 마이크로 배칭 추론 스케줄러
+
+각 클라이언트의 예측 윈도우를 큐에 모았다가 max_batch_size개가 모이거나
+첫 요청 이후 max_wait_ms가 지나면 하나의 배치 텐서로 묶어 모델을 한 번만 호출합니다.
+결과는 요청별 Future로 각 클라이언트에 돌려줍니다.
+
+모델 호출은 전용 executor 스레드에서 실행되므로 이벤트 루프(ping, 수신, 전송)는
+추론 중에도 막히지 않습니다. 배치 실행 중에 도착한 요청은 다음 배치로 모입니다.
+
+요청에 account(charge(seconds) 메서드를 가진 객체, 예: ClientSession)를 넘기면
+배치 실행 시간 중 그 요청의 윈도우 비율만큼을 클라이언트 처리 시간으로 기록합니다.
+"""
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceScheduler:
+    """예측 요청을 배치로 묶어 실행하는 스케줄러"""
+
+    def __init__(self, predict_batch_fn, executor=None, max_batch_size=16, max_wait_ms=5.0, max_queue_depth=256):
+        self.predict_batch_fn = predict_batch_fn  # (B, T, F) float32 -> (B, num_labels)
+        self.executor = executor  # None이면 이벤트 루프 기본 executor 사용
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_queue_depth = max_queue_depth
+        self._queue = None
+        self._task = None
+        self.stats = {
+            'batches': 0,
+            'requests': 0,
+            'rejected': 0,
+            'avg_batch_size': 0.0,
+            'max_batch_size_seen': 0,
+            'avg_batch_time': 0.0,
+        }
+
+    def start(self):
+        """이벤트 루프 안에서 배치 처리 태스크 시작"""
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+            self._task = asyncio.create_task(self._run())
+            logger.info(
+                f"추론 스케줄러 시작: 최대 배치={self.max_batch_size}, "
+                f"최대 대기={self.max_wait*1000:.1f}ms, 큐 깊이={self.max_queue_depth}"
+            )
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def queue_depth(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, window):
+        """(T, F) 윈도우 하나를 제출하고 (num_labels,) 확률 배열을 기다림
+
+        큐가 가득 찬 경우 asyncio.QueueFull을 발생시킵니다.
+        """
+        probs = await self.submit_many(window[None])
+        return probs[0]
+
+    async def submit_many(self, windows, account=None):
+        """(K, T, F) 윈도우 묶음을 하나의 요청으로 제출하고 (K, num_labels) 확률 배열을 기다림
+
+        묶음은 나뉘지 않고 항상 같은 배치에서 예측됩니다.
+        """
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((windows, future, account))
+        except asyncio.QueueFull:
+            self.stats['rejected'] += 1
+            raise
+        return await future
+
+    async def _collect_batch(self):
+        """첫 요청을 기다린 뒤 윈도우 수가 max_batch_size에 이르거나 max_wait 마감까지 요청을 모음"""
+        batch = [await self._queue.get()]
+        num_windows = len(batch[0][0])
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while num_windows < self.max_batch_size:
+            # 이미 대기 중인 요청은 기다리지 않고 바로 가져옴
+            if not self._queue.empty():
+                item = self._queue.get_nowait()
+            else:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            batch.append(item)
+            num_windows += len(item[0])
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            # 연결이 끊겨 취소된 요청은 제외
+            batch = [item for item in batch if not item[1].cancelled()]
+            if batch:
+                await self._flush(batch)
+
+    def _predict_windows(self, windows):
+        """executor 스레드에서 실행 - 윈도우를 배치로 묶어 예측"""
+        inputs = windows[0] if len(windows) == 1 else np.concatenate(windows)
+        inputs = inputs.astype(np.float32, copy=False)
+        return np.asarray(self.predict_batch_fn(inputs))
+
+    async def _flush(self, batch):
+        """모은 요청을 하나의 배치로 예측하고 각 Future에 결과 전달"""
+        start_time = time.time()
+        loop = asyncio.get_running_loop()
+        try:
+            probs = await loop.run_in_executor(
+                self.executor, self._predict_windows, [item[0] for item in batch]
+            )
+        except Exception as e:
+            logger.error(f"배치 예측 실패 (배치 크기 {len(batch)}): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        batch_time = time.time() - start_time
+
+        batch_size = sum(len(item[0]) for item in batch)
+        offset = 0
+        for windows, future, account in batch:
+            if account is not None:
+                # 배치 실행 시간을 윈도우 수 비율로 나눠 요청한 클라이언트에 기록
+                account.charge(batch_time * len(windows) / batch_size)
+            if not future.done():
+                future.set_result(probs[offset:offset + len(windows)])
+            offset += len(windows)
+
+        stats = self.stats
+        stats['batches'] += 1
+        stats['requests'] += batch_size
+        stats['avg_batch_size'] = stats['requests'] / stats['batches']
+        stats['max_batch_size_seen'] = max(stats['max_batch_size_seen'], batch_size)
+        stats['avg_batch_time'] += (batch_time - stats['avg_batch_time']) / stats['batches']
@@ -0,0 +1,192 @@
+"""
+클라이언트별 랜드마크 링 버퍼
+
+deque에 프레임 dict(중첩 리스트)를 쌓는 대신, 미리 할당된 float32 배열에
+프레임을 그대로 기록합니다. 각 프레임을 i와 i + capacity 두 위치에 함께 기록하므로
+최근 capacity개 프레임은 항상 하나의 연속된 구간이 되고, 복사 없이 view로 꺼낼 수 있습니다.
+
+프레임이 들어올 때 상대 좌표와 직전 프레임 대비 속도/가속도를 한 번만 계산해
+함께 저장합니다. 예측 시에는 저장된 행을 그대로 모아 윈도우 앞 두 행만 보정하므로,
+윈도우 전체를 다시 전처리한 결과와 비트 단위로 동일한 모델 입력을 얻습니다.
+
+클라이언트가 프레임별 timestamp를 보내고 윈도우의 프레임 간격이 불규칙하면
+(TIMESTAMP_JITTER_TOLERANCE), 캐시된 상대 좌표를 실제 시각 기준으로 다시 보간한 뒤
+속도/가속도를 계산합니다.
+"""
+import numpy as np
+
+try:
+    from .landmark_preprocessing import (
+        FEATURE_DIM,
+        LANDMARK_PARTS,
+        MODEL_FEATURE_DIM,
+        NUM_LANDMARKS,
+        add_dynamic_features,
+        decode_frame,
+        frame_timestamp,
+        resample_sequence,
+        timestamps_irregular,
+        to_relative_coordinates,
+        write_parts,
+    )
+except ImportError:
+    # sign_classifier_websocket_server.py를 스크립트로 실행하는 경우
+    from landmark_preprocessing import (
+        FEATURE_DIM,
+        LANDMARK_PARTS,
+        MODEL_FEATURE_DIM,
+        NUM_LANDMARKS,
+        add_dynamic_features,
+        decode_frame,
+        frame_timestamp,
+        resample_sequence,
+        timestamps_irregular,
+        to_relative_coordinates,
+        write_parts,
+    )
+
+
+# 속도 블록 안의 손(left_hand, right_hand) 좌표 열 범위
+_HAND_VELOCITY = slice(FEATURE_DIM + LANDMARK_PARTS[1][1] * 3, FEATURE_DIM + LANDMARK_PARTS[2][2] * 3)
+
+
+class LandmarkRingBuffer:
+    """고정 크기 (capacity, 75, 3) float32 링 버퍼 + 부위별 존재 마스크"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._landmarks = np.zeros((2 * capacity, NUM_LANDMARKS, 3), dtype=np.float32)
+        self._presence = np.zeros((2 * capacity, len(LANDMARK_PARTS)), dtype=bool)
+        # 프레임별 [상대좌표 | 속도 | 가속도] 캐시 (2 * capacity, 675)
+        self._features = np.zeros((2 * capacity, MODEL_FEATURE_DIM), dtype=np.float32)
+        # 프레임별 클라이언트 timestamp (없으면 NaN)
+        self._timestamps = np.full(2 * capacity, np.nan)
+        self._head = -1  # 가장 최근에 기록된 슬롯 (0 ~ capacity-1)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def is_full(self):
+        return self._count == self.capacity
+
+    def _advance(self):
+        """다음 기록 슬롯으로 이동하고 슬롯 인덱스 반환"""
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+        return self._head
+
+    def _commit(self, slot, timestamp):
+        """새 프레임의 특성을 계산하고 슬롯 내용을 뒤쪽 미러 슬롯에 복사"""
+        features = self._features[slot]
+        relative = features[:FEATURE_DIM]
+        velocity = features[FEATURE_DIM:2 * FEATURE_DIM]
+        acceleration = features[2 * FEATURE_DIM:]
+
+        relative[:] = to_relative_coordinates(
+            self._landmarks[slot:slot + 1], self._presence[slot:slot + 1]
+        ).reshape(FEATURE_DIM)
+        if self._count > 1:
+            previous = self._features[(slot - 1) % self.capacity]
+            np.subtract(relative, previous[:FEATURE_DIM], out=velocity)
+            np.subtract(velocity, previous[FEATURE_DIM:2 * FEATURE_DIM], out=acceleration)
+        else:
+            velocity[:] = 0.0
+            acceleration[:] = 0.0
+
+        mirror = slot + self.capacity
+        self._landmarks[mirror] = self._landmarks[slot]
+        self._presence[mirror] = self._presence[slot]
+        self._features[mirror] = features
+        self._timestamps[slot] = self._timestamps[mirror] = np.nan if timestamp is None else timestamp
+
+    def append_frame(self, frame):
+        """프레임 dict(pose/left_hand/right_hand, 선택적으로 timestamp)를 버퍼에 직접 기록
+
+        잘못된 프레임은 버퍼를 건드리기 전에 LandmarkValidationError로 거부합니다.
+        """
+        self.append_parts(decode_frame(frame), frame_timestamp(frame))
+
+    def append_parts(self, parts, timestamp=None):
+        """decode_frame으로 검증된 부위별 배열 튜플을 버퍼에 기록"""
+        slot = self._advance()
+        write_parts(parts, self._landmarks[slot], self._presence[slot])
+        self._commit(slot, timestamp)
+
+    def append(self, landmarks, presence, timestamp=None):
+        """(75, 3) 좌표 배열과 (3,) 존재 마스크를 버퍼에 기록"""
+        slot = self._advance()
+        self._landmarks[slot] = landmarks
+        self._presence[slot] = presence
+        self._commit(slot, timestamp)
+
+    def append_packed(self, presence_bits, coords, timestamp=None):
+        """존재하는 부위의 좌표만 이어 붙인 (N, 3) 배열을 버퍼에 기록
+
+        presence_bits의 p번째 비트는 LANDMARK_PARTS[p] 부위의 존재 여부입니다.
+        바이너리 프로토콜에서 np.frombuffer로 얻은 view를 그대로 받습니다.
+        """
+        slot = self._advance()
+        landmarks = self._landmarks[slot]
+        presence = self._presence[slot]
+        offset = 0
+        for p, (_, start, end) in enumerate(LANDMARK_PARTS):
+            if presence_bits & (1 << p):
+                landmarks[start:end] = coords[offset:offset + end - start]
+                offset += end - start
+                presence[p] = True
+            else:
+                landmarks[start:end] = 0.0
+                presence[p] = False
+        self._commit(slot, timestamp)
+
+    def window(self):
+        """오래된 순서의 (len, 75, 3) 좌표 view와 (len, 3) 마스크 view 반환 (복사 없음)"""
+        end = self._head + 1 + self.capacity
+        start = end - self._count
+        return self._landmarks[start:end], self._presence[start:end]
+
+    def model_input(self, out=None):
+        """캐시된 특성으로 (len, 675) 모델 입력 생성
+
+        윈도우 첫 프레임의 속도/가속도는 0, 두 번째 프레임의 가속도는 속도와 같도록
+        보정합니다 (np.diff(prepend=첫 행)과 동일한 정의).
+        윈도우의 프레임 간격이 불규칙하면 상대 좌표를 타임스탬프 기준으로 다시 보간합니다.
+        """
+        end = self._head + 1 + self.capacity
+        start = end - self._count
+        if out is None:
+            out = np.empty((self._count, MODEL_FEATURE_DIM), dtype=np.float32)
+        out[:] = self._features[start:end]
+        timestamps = self._timestamps[start:end]
+        if timestamps_irregular(timestamps):
+            sequence = resample_sequence(out[:, :FEATURE_DIM], self._count, timestamps)
+            out[:] = add_dynamic_features(sequence)
+            return out
+        if self._count > 0:
+            out[0, FEATURE_DIM:] = 0.0
+        if self._count > 1:
+            out[1, 2 * FEATURE_DIM:] = out[1, FEATURE_DIM:2 * FEATURE_DIM]
+        return out
+
+    def motion_score(self, num_frames):
+        """최근 num_frames 프레임의 손 좌표 평균 절대 속도 (어깨 너비 단위 / 프레임)
+
+        수신 시점에 캐시된 속도를 그대로 사용하므로 추가 전처리가 없습니다.
+        """
+        num_frames = min(num_frames, self._count)
+        if num_frames == 0:
+            return 0.0
+        end = self._head + 1 + self.capacity
+        return float(np.abs(self._features[end - num_frames:end, _HAND_VELOCITY]).mean())
+
+    def hands_present(self, num_frames):
+        """최근 num_frames 프레임 중 한 손이라도 보인 프레임이 있는지"""
+        num_frames = min(num_frames, self._count)
+        end = self._head + 1 + self.capacity
+        return bool(self._presence[end - num_frames:end, 1:].any())
+
+    def clear(self):
+        self._head = -1
+        self._count = 0
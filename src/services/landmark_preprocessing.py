@@ -0,0 +1,246 @@
+"""
+수어 분류기용 랜드마크 전처리 엔진 (NumPy 벡터 연산)
+
+모든 연산은 (T, 75, 3) float32 배열 하나를 대상으로 수행됩니다.
+- 0~32: pose, 33~53: left_hand, 54~74: right_hand
+- presence: (T, 3) bool 배열 (pose, left_hand, right_hand 존재 여부)
+
+기존 파이썬 루프 구현(float64)과의 차이는 float32 반올림 오차뿐이며,
+일반적인 입력(어깨 너비가 정규화 좌표 기준 0.2 이상)에서
+PARITY_TOLERANCE(절대/상대 오차) 이내로 동일한 결과를 보장합니다.
+"""
+from functools import lru_cache
+
+import numpy as np
+
+POSE_LANDMARKS = 33
+HAND_LANDMARKS = 21
+NUM_LANDMARKS = POSE_LANDMARKS + 2 * HAND_LANDMARKS  # 75
+FEATURE_DIM = NUM_LANDMARKS * 3  # 225
+MODEL_FEATURE_DIM = FEATURE_DIM * 3  # 675 (좌표 + 속도 + 가속도)
+
+# (키, 시작 인덱스, 끝 인덱스)
+LANDMARK_PARTS = (
+    ("pose", 0, POSE_LANDMARKS),
+    ("left_hand", POSE_LANDMARKS, POSE_LANDMARKS + HAND_LANDMARKS),
+    ("right_hand", POSE_LANDMARKS + HAND_LANDMARKS, NUM_LANDMARKS),
+)
+PART_SIZES = np.array([end - start for _, start, end in LANDMARK_PARTS])
+
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+
+# 기존 float64 루프 구현 대비 허용 오차
+PARITY_TOLERANCE = 1e-5
+
+# 프레임 간격이 평균 간격에서 이 비율 넘게 벗어나면 프레임 인덱스 대신 타임스탬프 기준으로 보간
+TIMESTAMP_JITTER_TOLERANCE = 0.25
+
+
+# 프레임 검증 오류 코드 (클라이언트 error 메시지의 code 필드)
+ERROR_MALFORMED_FRAME = "malformed_frame"  # 프레임이 dict가 아님
+ERROR_MISSING_PART = "missing_part"  # pose/left_hand/right_hand 키 누락
+ERROR_MALFORMED_PART = "malformed_part"  # 숫자 배열로 변환할 수 없음
+ERROR_BAD_SHAPE = "bad_shape"  # 부위별 (33/21/21, 3) 형태가 아님
+ERROR_NON_FINITE = "non_finite"  # NaN 또는 inf 좌표
+
+
+class LandmarkValidationError(ValueError):
+    """잘못된 랜드마크 프레임 - code는 클라이언트에 돌려줄 오류 코드"""
+
+    code = ERROR_MALFORMED_FRAME
+
+    def __init__(self, message, code=None):
+        super().__init__(message)
+        if code is not None:
+            self.code = code
+
+
+def _part_to_array(key, part, num_points):
+    """랜드마크 한 부위를 검증하며 (num_points, 3) float32 배열로 변환 (MediaPipe 객체도 지원)
+
+    부위가 없거나(None, 빈 리스트) 비어 있으면 None을 반환합니다.
+    """
+    if part is None:
+        return None
+    if hasattr(part, 'landmark'):
+        part = [[l.x, l.y, l.z] for l in part.landmark]
+    try:
+        array = np.asarray(part, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise LandmarkValidationError(f"{key}: 숫자 좌표 배열이 아닙니다", ERROR_MALFORMED_PART)
+    if array.size == 0:
+        return None
+    if array.shape != (num_points, 3):
+        raise LandmarkValidationError(
+            f"{key}: 형태 {array.shape}, 기대 형태 ({num_points}, 3)", ERROR_BAD_SHAPE
+        )
+    if not np.isfinite(array).all():
+        raise LandmarkValidationError(f"{key}: NaN 또는 inf 좌표 포함", ERROR_NON_FINITE)
+    return array
+
+
+def decode_frame(frame):
+    """프레임 dict 하나를 검증하고 부위별 (N, 3) float32 배열 튜플로 변환 (없는 부위는 None)
+
+    부위마다 float32 변환 한 번과 형태/유한값 검사만 수행하며, 잘못된 프레임은
+    LandmarkValidationError(code 포함)로 거부합니다.
+    """
+    if not isinstance(frame, dict):
+        raise LandmarkValidationError(f"프레임이 객체가 아닙니다: {type(frame).__name__}")
+    parts = []
+    for key, start, end in LANDMARK_PARTS:
+        if key not in frame:
+            raise LandmarkValidationError(f"누락된 랜드마크 키: {key}", ERROR_MISSING_PART)
+        parts.append(_part_to_array(key, frame[key], end - start))
+    return tuple(parts)
+
+
+def write_parts(parts, landmarks_out, presence_out):
+    """decode_frame 결과를 미리 할당된 (75, 3) / (3,) 배열에 그대로 기록"""
+    for p, ((_, start, end), part) in enumerate(zip(LANDMARK_PARTS, parts)):
+        if part is None:
+            landmarks_out[start:end] = 0.0
+            presence_out[p] = False
+        else:
+            landmarks_out[start:end] = part
+            presence_out[p] = True
+
+
+def write_frame(frame, landmarks_out, presence_out):
+    """프레임 dict 하나를 검증한 뒤 미리 할당된 (75, 3) / (3,) 배열에 기록"""
+    write_parts(decode_frame(frame), landmarks_out, presence_out)
+
+
+def frames_to_array(landmarks_list):
+    """프레임 dict 리스트를 (T, 75, 3) 좌표 배열과 (T, 3) 존재 마스크로 변환"""
+    num_frames = len(landmarks_list)
+    landmarks = np.zeros((num_frames, NUM_LANDMARKS, 3), dtype=np.float32)
+    presence = np.zeros((num_frames, len(LANDMARK_PARTS)), dtype=bool)
+    for t, frame in enumerate(landmarks_list):
+        write_frame(frame, landmarks[t], presence[t])
+    return landmarks, presence
+
+
+def to_relative_coordinates(landmarks, presence):
+    """어깨 중심/어깨 너비 기준 상대 좌표로 변환하고 누락된 부위는 0으로 채움
+
+    pose가 없는 프레임은 기존 구현과 동일하게 원본 좌표를 그대로 사용합니다.
+    """
+    landmarks = np.asarray(landmarks, dtype=np.float32)
+    pose_present = presence[:, 0]
+
+    left = landmarks[:, LEFT_SHOULDER]
+    right = landmarks[:, RIGHT_SHOULDER]
+    center = (left + right) / 2
+    width = np.abs(right[:, 0] - left[:, 0])
+    width[width == 0] = 1.0
+
+    # pose가 없는 프레임은 변환하지 않음 (중심 0, 너비 1)
+    center[~pose_present] = 0.0
+    width[~pose_present] = 1.0
+
+    relative = (landmarks - center[:, None, :]) / width[:, None, None]
+
+    # 누락된 부위 zero-fill
+    point_mask = np.repeat(presence, PART_SIZES, axis=1)
+    relative *= point_mask[:, :, None]
+    return relative
+
+
+def _two_taps(positions, source_length):
+    """소수 프레임 위치마다 인접한 두 프레임 인덱스와 뒤쪽 프레임 가중치 (lower, upper, frac)
+
+    선형 보간 행렬은 행마다 0이 아닌 값이 최대 2개이므로 (target, source) 행렬 대신
+    인덱스/가중치 쌍만 저장합니다.
+    """
+    if source_length == 1:
+        zeros = np.zeros(len(positions), dtype=np.int64)
+        return zeros, zeros, np.zeros(len(positions), dtype=np.float32)
+    lower = np.minimum(positions.astype(np.int64), source_length - 2)
+    frac = (positions - lower).astype(np.float32)
+    return lower, lower + 1, frac
+
+
+@lru_cache(maxsize=128)
+def interpolation_taps(source_length, target_length):
+    """균일 간격 선형 보간 (lower, upper, frac) - 길이 쌍마다 한 번만 생성
+
+    캐시를 공유하므로 읽기 전용입니다.
+    """
+    positions = np.linspace(0, source_length - 1, target_length)
+    taps = _two_taps(positions, source_length)
+    for array in taps:
+        array.flags.writeable = False
+    return taps
+
+
+def timestamp_interpolation_taps(timestamps, target_length):
+    """프레임 타임스탬프 기준 선형 보간 (lower, upper, frac) - 첫/마지막 타임스탬프 사이를 균일 시간 간격으로 샘플링
+
+    프레임 간격이 불규칙한 클라이언트용입니다. 타임스탬프가 감소하거나 모두 같으면
+    프레임 인덱스 기준으로 보간합니다.
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    source_length = len(timestamps)
+    deltas = np.diff(timestamps)
+    if source_length < 2 or np.any(deltas < 0) or timestamps[-1] == timestamps[0]:
+        return interpolation_taps(source_length, target_length)
+    targets = np.linspace(timestamps[0], timestamps[-1], target_length)
+    upper = np.clip(np.searchsorted(timestamps, targets, side='right'), 1, source_length - 1)
+    lower = upper - 1
+    span = timestamps[upper] - timestamps[lower]
+    span[span == 0] = 1.0
+    frac = np.clip((targets - timestamps[lower]) / span, 0.0, 1.0)
+    return _two_taps(lower + frac, source_length)
+
+
+def timestamps_irregular(timestamps, tolerance=TIMESTAMP_JITTER_TOLERANCE):
+    """모든 프레임에 증가하는 타임스탬프가 있고, 프레임 간격이 평균 간격에서 tolerance 비율 넘게 벗어나는지"""
+    if len(timestamps) < 3 or not np.isfinite(timestamps).all():
+        return False
+    deltas = np.diff(timestamps)
+    if np.any(deltas <= 0):
+        return False
+    mean = deltas.mean()
+    return bool(np.abs(deltas - mean).max() > tolerance * mean)
+
+
+def frame_timestamp(frame, default=None):
+    """프레임 dict의 timestamp (없으면 default) - 숫자가 아니면 None (타임스탬프 보간을 사용하지 않음)"""
+    timestamp = frame.get("timestamp", default)
+    if isinstance(timestamp, bool) or not isinstance(timestamp, (int, float)):
+        return None
+    return timestamp
+
+
+def resample_sequence(sequence, target_length, timestamps=None):
+    """시퀀스 길이를 선형 보간으로 target_length에 맞춤 (인접한 두 프레임의 가중합)
+
+    timestamps가 주어지면 프레임 인덱스 대신 실제 시각 기준으로 보간합니다.
+    """
+    if timestamps is None:
+        if len(sequence) == target_length:
+            return sequence
+        lower, upper, frac = interpolation_taps(len(sequence), target_length)
+    else:
+        lower, upper, frac = timestamp_interpolation_taps(timestamps, target_length)
+    frac = frac[:, None]
+    return (sequence[lower] * (1 - frac) + sequence[upper] * frac).astype(sequence.dtype, copy=False)
+
+
+def add_dynamic_features(sequence):
+    """(T, F) 시퀀스에 속도/가속도를 붙여 (T, 3F) 배열 생성"""
+    velocity = np.diff(sequence, axis=0, prepend=sequence[0:1])
+    acceleration = np.diff(velocity, axis=0, prepend=velocity[0:1])
+    return np.concatenate([sequence, velocity, acceleration], axis=1)
+
+
+def preprocess_landmark_array(landmarks, presence, target_length, timestamps=None):
+    """(T, 75, 3) 좌표 배열을 모델 입력 (target_length, 675) float32 배열로 변환"""
+    if len(landmarks) == 0:
+        return np.zeros((target_length, MODEL_FEATURE_DIM), dtype=np.float32)
+    relative = to_relative_coordinates(landmarks, presence)
+    sequence = relative.reshape(len(relative), FEATURE_DIM)
+    sequence = resample_sequence(sequence, target_length, timestamps)
+    return add_dynamic_features(sequence)
@@ -0,0 +1,119 @@
+"""
+수어 분류기 WebSocket 바이너리 랜드마크 프로토콜 (v1)
+
+JSON의 중첩 [x, y, z] 리스트 대신 little-endian float32로 좌표를 묶어 전송합니다.
+클라이언트는 연결 직후 {"type": "hello", "protocol": "binary", "version": 1} 메시지
+(또는 접속 URL의 ?protocol=binary)로 바이너리 모드를 요청하며, 협상하지 않은
+클라이언트는 기존 JSON 형식을 그대로 사용합니다.
+
+메시지 구조 (모든 정수/실수는 little-endian):
+    헤더 (8 bytes)
+        magic        2s   b"WF"
+        version      u8   1
+        msg_type     u8   1 = 랜드마크 프레임
+        frame_count  u16  메시지에 포함된 프레임 수 (1이면 단일 프레임, 2 이상이면 시퀀스)
+        message_id   u16  클라이언트 메시지 번호 (선택, 0이면 없음) - 이 메시지로 발생한
+                          예측 결과에 "message_id"로 그대로 돌려줌 (지연 시간 측정용)
+    프레임 (frame_count개 반복)
+        presence     u8   bit0 = pose, bit1 = left_hand, bit2 = right_hand
+        reserved     3x   0 (float32 4바이트 정렬 유지)
+        coords       f32  존재하는 부위의 좌표만 pose, left_hand, right_hand 순서로
+                          (33 * 3, 21 * 3, 21 * 3개)
+"""
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+try:
+    from .landmark_preprocessing import ERROR_NON_FINITE, LANDMARK_PARTS, LandmarkValidationError
+except ImportError:
+    # sign_classifier_websocket_server.py를 스크립트로 실행하는 경우
+    from landmark_preprocessing import ERROR_NON_FINITE, LANDMARK_PARTS, LandmarkValidationError
+
+PROTOCOL_NAME = "binary"
+PROTOCOL_VERSION = 1
+SUPPORTED_VERSIONS = (PROTOCOL_VERSION,)
+
+MAGIC = b"WF"
+MSG_TYPE_FRAMES = 1
+
+HEADER = struct.Struct("<2sBBHH")
+FRAME_HEADER = struct.Struct("<B3x")
+COORD_DTYPE = np.dtype("<f4")
+
+PRESENCE_POSE = 0x01
+PRESENCE_LEFT_HAND = 0x02
+PRESENCE_RIGHT_HAND = 0x04
+PRESENCE_BITS = (PRESENCE_POSE, PRESENCE_LEFT_HAND, PRESENCE_RIGHT_HAND)
+
+# presence 비트마스크별 좌표 개수 (점 단위)
+_POINTS_BY_MASK = tuple(
+    sum(end - start for bit, (_, start, end) in zip(PRESENCE_BITS, LANDMARK_PARTS) if mask & bit)
+    for mask in range(8)
+)
+
+# 디코딩된 프레임: presence 비트마스크와 존재하는 부위의 (N, 3) 좌표 view
+PackedFrame = namedtuple("PackedFrame", ["presence", "coords"])
+
+
+class LandmarkProtocolError(LandmarkValidationError):
+    """바이너리 랜드마크 메시지 형식 오류"""
+
+    code = "malformed_message"
+
+
+def decode_frames(payload):
+    """바이너리 메시지를 PackedFrame 리스트로 디코딩 (좌표는 payload를 참조하는 view)"""
+    if len(payload) < HEADER.size:
+        raise LandmarkProtocolError(f"헤더 길이 부족: {len(payload)} bytes")
+    magic, version, msg_type, frame_count, _ = HEADER.unpack_from(payload, 0)
+    if magic != MAGIC:
+        raise LandmarkProtocolError(f"잘못된 magic: {magic!r}")
+    if version not in SUPPORTED_VERSIONS:
+        raise LandmarkProtocolError(f"지원하지 않는 프로토콜 버전: {version}")
+    if msg_type != MSG_TYPE_FRAMES:
+        raise LandmarkProtocolError(f"알 수 없는 메시지 타입: {msg_type}")
+
+    frames = []
+    offset = HEADER.size
+    for _ in range(frame_count):
+        if offset + FRAME_HEADER.size > len(payload):
+            raise LandmarkProtocolError("프레임 헤더가 잘렸습니다")
+        (presence,) = FRAME_HEADER.unpack_from(payload, offset)
+        if presence > 0x07:
+            raise LandmarkProtocolError(f"잘못된 presence 비트마스크: {presence:#04x}")
+        offset += FRAME_HEADER.size
+        num_points = _POINTS_BY_MASK[presence]
+        end = offset + num_points * 3 * COORD_DTYPE.itemsize
+        if end > len(payload):
+            raise LandmarkProtocolError("좌표 데이터가 잘렸습니다")
+        coords = np.frombuffer(payload, dtype=COORD_DTYPE, count=num_points * 3, offset=offset)
+        if not np.isfinite(coords).all():
+            raise LandmarkProtocolError(f"프레임 {len(frames)}: NaN 또는 inf 좌표 포함", ERROR_NON_FINITE)
+        frames.append(PackedFrame(presence, coords.reshape(num_points, 3)))
+        offset = end
+    if offset != len(payload):
+        raise LandmarkProtocolError(f"메시지 끝에 불필요한 데이터: {len(payload) - offset} bytes")
+    return frames
+
+
+def message_id(payload):
+    """decode_frames로 검증한 메시지 헤더의 message_id (0이면 None)"""
+    return HEADER.unpack_from(payload, 0)[4] or None
+
+
+def encode_frames(frames, message_id=0):
+    """프레임 dict(pose/left_hand/right_hand) 리스트를 바이너리 메시지로 인코딩"""
+    chunks = [HEADER.pack(MAGIC, PROTOCOL_VERSION, MSG_TYPE_FRAMES, len(frames), message_id)]
+    for frame in frames:
+        presence = 0
+        parts = []
+        for bit, (key, _, _) in zip(PRESENCE_BITS, LANDMARK_PARTS):
+            part = frame.get(key)
+            if part is not None and len(part) > 0:
+                presence |= bit
+                parts.append(np.asarray(part, dtype=COORD_DTYPE).reshape(-1))
+        chunks.append(FRAME_HEADER.pack(presence))
+        chunks.extend(part.tobytes() for part in parts)
+    return b"".join(chunks)
@@ -82,6 +82,7 @@ def cleanup_dead_servers():
                 print(f"[CLEANUP] Removing dead server info for {model_id}")
                 model_server_manager.running_servers.pop(model_id, None)
                 model_server_manager.server_processes.pop(model_id, None)
+                model_server_manager.hosted_by.pop(model_id, None)
                 # 포트 회수
                 release_port(model_id)
 
@@ -104,6 +105,8 @@ async def deploy_model(chapter_id, db=None):
     cleanup_dead_servers()
 
     ws_urls = []
+    # 멀티 모델 호스팅 시 이번 배포에서 프로세스를 띄운 첫 모델 (model_id, ws_url)
+    host = None
 
     for model_data_url in model_data_urls:
         model_id = model_data_url
@@ -134,11 +137,14 @@ async def deploy_model(chapter_id, db=None):
                     if server_alive:
                         print(f"Model server already running for {model_id}")
                         ws_urls.append(model_server_manager.running_servers[model_id])
+                        if host is None and model_id not in model_server_manager.hosted_by:
+                            host = (model_id, model_server_manager.running_servers[model_id])
                         continue
                     else:
                         print(f"Model server for {model_id} is not alive. Restarting...")
                         model_server_manager.running_servers.pop(model_id, None)
                         model_server_manager.server_processes.pop(model_id, None)
+                        model_server_manager.hosted_by.pop(model_id, None)
 
         # 3단계: 서버 시작 전에 다시 한번 종료 상태 확인
         with shutdown_lock:  # 종료 작업이 시작되지 않았는지 최종 확인
@@ -147,6 +153,14 @@ async def deploy_model(chapter_id, db=None):
                     print(f"Model server {model_id} shutdown detected during startup, skipping...")
                     continue
 
+        # 4단계(멀티 모델): 이미 띄운 프로세스에 모델을 함께 올림
+        if settings.MODEL_SERVER_MULTI_MODEL and host is not None:
+            with models_lock:
+                ws_url = model_server_manager.attach_model(model_id, model_data_url, *host)
+                ws_urls.append(ws_url)
+            print(f"model attached for chapter {chapter_id}: {ws_url}")
+            continue
+
         # 4단계: 포트 할당 및 모델 서버 시작 (락 외부에서 실행)
         port = allocate_port(model_id)
         try:
@@ -162,6 +176,8 @@ async def deploy_model(chapter_id, db=None):
             if model_id not in shutting_down_models:
                 ws_urls.append(ws_url)
                 model_server_manager.running_servers[model_id] = ws_url
+                if host is None:
+                    host = (model_id, ws_url)
             else:
                 print(f"Model server {model_id} was shut down during startup, not registering")
                 release_port(model_id)
@@ -202,6 +218,7 @@ async def deploy_lesson_model(lesson_id, db=None):
                 print(f"Model server for {model_id} is not alive. Restarting...")
                 model_server_manager.running_servers.pop(model_id, None)
                 model_server_manager.server_processes.pop(model_id, None)
+                model_server_manager.hosted_by.pop(model_id, None)
                 ws_url = None
         else:
             ws_url = None
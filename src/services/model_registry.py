@@ -0,0 +1,449 @@
+"""
+수어 분류 모델 레지스트리
+
+한 분류기 프로세스가 여러 레슨 모델을 함께 호스팅할 수 있도록 model_info URL을 키로
+모델을 관리합니다. 모델은 처음 요청될 때 로드되고(지연 로딩), 추정 메모리 합계가
+예산을 넘으면 사용 중이 아닌 모델부터 LRU 순서로 내립니다.
+TensorFlow 런타임과 추론 executor는 모든 모델이 공유합니다.
+"""
+import asyncio
+import gc
+import json
+import logging
+import os
+from collections import OrderedDict
+
+import numpy as np
+import tensorflow as tf
+
+try:
+    from .s3_utils import s3_utils
+    from .inference_scheduler import InferenceScheduler
+    from .landmark_preprocessing import MODEL_FEATURE_DIM
+    from .inference_backends import (
+        TFLiteBackend, batch_buckets, bucket_batches, create_backend, quantized_model_key
+    )
+except ImportError:
+    # sign_classifier_websocket_server.py를 스크립트로 실행하는 경우
+    from s3_utils import s3_utils
+    from inference_scheduler import InferenceScheduler
+    from landmark_preprocessing import MODEL_FEATURE_DIM
+    from inference_backends import (
+        TFLiteBackend, batch_buckets, bucket_batches, create_backend, quantized_model_key
+    )
+
+logger = logging.getLogger(__name__)
+
+MODEL_INFO_S3_PREFIX = "s3://waterandfish-s3/model-info/"
+
+
+def resolve_model_info_url(model_info_url):
+    """파일명만 전달된 경우 s3://waterandfish-s3/model-info/ 경로로 변환 (레지스트리 키)"""
+    if os.path.basename(model_info_url) == model_info_url:
+        return f"{MODEL_INFO_S3_PREFIX}{model_info_url}"
+    return model_info_url
+
+
+def load_model_info(model_info_url):
+    """모델 정보 파일을 로드합니다."""
+    try:
+        # S3 URL인지 확인
+        if model_info_url.startswith('s3://'):
+            logger.info(f"📁 S3에서 모델 정보 파일 다운로드 중: {model_info_url}")
+
+            # S3에서 파일 다운로드
+            local_path = s3_utils.download_cached(model_info_url)
+            model_info_url = local_path
+            logger.info(f"✅ S3 파일 다운로드 완료: {local_path}")
+        else:
+            # 로컬 파일 경로 처리
+            # 현재 스크립트 파일의 위치를 기준으로 프로젝트 루트 계산
+            current_dir = os.path.dirname(os.path.abspath(__file__))
+            # src/services에서 프로젝트 루트로 이동 (2단계 상위)
+            project_root = os.path.dirname(os.path.dirname(current_dir))
+
+            # 파일명만 전달된 경우 public/model-info/ 디렉터리에서 찾기
+            if os.path.basename(model_info_url) == model_info_url:
+                # 파일명만 전달된 경우
+                model_info_url = os.path.join("public", "model-info", model_info_url)
+
+            # 상대 경로인 경우 프로젝트 루트를 기준으로 절대 경로로 변환
+            if not os.path.isabs(model_info_url):
+                model_info_url = os.path.join(project_root, model_info_url)
+
+            # 경로 정규화
+            model_info_url = os.path.normpath(model_info_url)
+
+        logger.info(f"📁 모델 정보 파일 경로: {model_info_url}")
+
+        # 파일 존재 여부 확인 (S3에서 다운로드한 경우는 이미 존재함)
+        if not model_info_url.startswith('s3://') and not os.path.exists(model_info_url):
+            logger.error(f"❌ 모델 정보 파일을 찾을 수 없습니다: {model_info_url}")
+            return None
+
+        with open(model_info_url, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"❌ 모델 정보 파일 로드 실패: {e}")
+        return None
+
+
+class ClassifierModel:
+    """model_info 하나에 대응하는 로드된 분류 모델과 전용 배치 스케줄러"""
+    
+    def __init__(self, model_info_url, executor=None, max_batch_size=16, max_batch_wait_ms=5.0, max_queue_depth=256,
+                 backend="keras", quantization=None):
+        self.model_info_url = model_info_url
+        self.backend_name = "keras"
+        self.backend = None  # keras 외 백엔드 사용 시 (B, T, 675) -> (B, num_labels) 호출 객체
+        self.batch_buckets = batch_buckets(max_batch_size)  # tf.function에 들어가는 배치 크기
+        self.trace_count = 0  # optimized_predict 추적(trace) 횟수
+        self.warmup_trace_count = 0  # warmup 중 발생한 추적 횟수
+        
+        # 모델 정보 로드
+        self.model_info = load_model_info(model_info_url)
+        if not self.model_info:
+            raise ValueError("모델 정보를 로드할 수 없습니다.")
+        
+        # 설정값
+        self.MAX_SEQ_LENGTH = self.model_info["input_shape"][0]
+        
+        # 모델 경로 처리 (S3 URL 또는 로컬 경로)
+        model_path = self.model_info["model_path"]
+        
+        # s3://waterandfish-s3/models/ 디렉터리에서 찾기
+        model_path = f"s3://waterandfish-s3/{model_path}"
+        
+        # 먼저 S3에서 시도
+        
+        try:
+            logger.info(f"S3에서 모델 파일 다운로드 중: {model_path}")
+            # S3에서 모델 파일 다운로드
+            self.MODEL_SAVE_PATH = s3_utils.download_cached(model_path)
+            logger.info(f"S3 모델 파일 다운로드 완료: {self.MODEL_SAVE_PATH}")
+        except Exception as e:
+            logger.warning(f"S3 다운로드 실패, 로컬 경로로 시도: {e}")
+            # 로컬 경로 처리
+            # model_path가 이미 "models/"로 시작하는 경우 중복 방지
+            if model_path.startswith("models/"):
+                # "models/" 부분을 제거하고 파일명만 사용
+                model_filename = model_path[7:]  # "models/" 제거
+                local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "models", model_filename)
+            else:
+                # 그대로 사용
+                local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "models", model_path)
+            
+            self.MODEL_SAVE_PATH = local_path
+            # self._setup_local_model_path(model_path)
+        
+        self.ACTIONS = self.model_info["labels"]
+        self.QUIZ_LABELS = [a for a in self.ACTIONS if a != "None"]
+        
+        logger.info(f"로드된 라벨: {self.ACTIONS}")
+        logger.info(f"퀴즈 라벨: {self.QUIZ_LABELS}")
+        logger.info(f"원본 모델 경로: {self.model_info['model_path']}")
+        logger.info(f"변환된 모델 경로: {self.MODEL_SAVE_PATH}")
+        logger.info(f"시퀀스 길이: {self.MAX_SEQ_LENGTH}")
+        
+        # 모델 파일 존재 확인
+        if not os.path.exists(self.MODEL_SAVE_PATH):
+            logger.error(f"모델 파일을 찾을 수 없습니다: {self.MODEL_SAVE_PATH}")
+            raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {self.MODEL_SAVE_PATH}")
+        logger.info(f"모델 파일 존재 확인: {self.MODEL_SAVE_PATH}")
+        
+        # 모델 로드
+        try:
+            # Keras 3와 tf-keras 호환성을 위한 모델 로딩
+            model_loaded = False
+            
+            # 방법 1: tf-keras로 시도
+            if not model_loaded:
+                try:
+                    self.model = tf.keras.models.load_model(self.MODEL_SAVE_PATH)
+                    logger.info(f"tf-keras로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
+                    model_loaded = True
+                except Exception as tf_error:
+                    logger.info(f"tf-keras 로딩 실패: {tf_error}")
+            
+            # 방법 2: keras로 시도
+            if not model_loaded:
+                try:
+                    import keras
+                    self.model = keras.models.load_model(self.MODEL_SAVE_PATH)
+                    logger.info(f"keras로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
+                    model_loaded = True
+                except Exception as keras_error:
+                    logger.info(f"keras 로딩 실패: {keras_error}")
+            
+            # 방법 3: tf-keras with compile=False
+            if not model_loaded:
+                try:
+                    self.model = tf.keras.models.load_model(self.MODEL_SAVE_PATH, compile=False)
+                    logger.info(f"tf-keras (compile=False)로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
+                    model_loaded = True
+                except Exception as compile_false_error:
+                    logger.info(f"tf-keras (compile=False) 로딩 실패: {compile_false_error}")
+            
+            # 방법 4: keras with compile=False
+            if not model_loaded:
+                try:
+                    import keras
+                    self.model = keras.models.load_model(self.MODEL_SAVE_PATH, compile=False)
+                    logger.info(f"keras (compile=False)로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
+                    model_loaded = True
+                except Exception as keras_compile_false_error:
+                    logger.info(f"keras (compile=False) 로딩 실패: {keras_compile_false_error}")
+            
+            # 방법 5: custom_objects 없이 시도
+            if not model_loaded:
+                try:
+                    self.model = tf.keras.models.load_model(self.MODEL_SAVE_PATH, custom_objects={})
+                    logger.info(f"tf-keras (custom_objects={{}})로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
+                    model_loaded = True
+                except Exception as custom_objects_error:
+                    logger.info(f"tf-keras (custom_objects={{}}) 로딩 실패: {custom_objects_error}")
+            
+            if not model_loaded:
+                raise Exception("모든 모델 로딩 방법이 실패했습니다.")
+            
+            # TensorFlow 성능 최적화 설정
+            tf.config.optimizer.set_jit(True)  # XLA JIT 컴파일 활성화
+            
+            # TensorFlow 2.x 호환성을 위한 설정
+            # 그래프 모드 대신 tf.function을 사용한 최적화
+            logger.info("TensorFlow 2.x 호환 모드 활성화됨")
+            
+            # 모델을 tf.function으로 최적화
+            try:
+                # 입력 시그니처를 float32 (None, T, 675)로 고정해 dtype/shape 차이로 재추적하지 않도록 함
+                input_signature = [
+                    tf.TensorSpec((None, self.MAX_SEQ_LENGTH, MODEL_FEATURE_DIM), tf.float32, name="input")
+                ]
+                
+                @tf.function(input_signature=input_signature)
+                def optimized_predict(input_data):
+                    # 파이썬 본문은 추적할 때만 실행되므로 추적 횟수 집계에 사용
+                    self.trace_count += 1
+                    return self.model(input_data, training=False)
+                
+                self.model_predict_fn = optimized_predict
+                logger.info("모델을 tf.function으로 최적화 완료")
+            except Exception as e:
+                logger.warning(f"tf.function 최적화 실패, 기본 모드 사용: {e}")
+                self.model_predict_fn = None
+            
+            # 모델 warming up - 배치 버킷마다 한 번씩 실행해 추적/XLA 컴파일을 시작 시에 끝냄
+            try:
+                for bucket in self.batch_buckets:
+                    dummy_input = np.zeros((bucket, self.MAX_SEQ_LENGTH, MODEL_FEATURE_DIM), dtype=np.float32)
+                    if self.model_predict_fn:
+                        _ = self.model_predict_fn(dummy_input)
+                    else:
+                        _ = self.model.predict(dummy_input, verbose=0)
+                self.warmup_trace_count = self.trace_count
+                logger.info(f"모델 warming up 완료 (배치 버킷 {list(self.batch_buckets)}, 추적 {self.trace_count}회)")
+            except Exception as e:
+                logger.warning(f"모델 warming up 실패: {e}")
+            
+        except Exception as e:
+            logger.error(f"모델 로딩 실패: {e}")
+            raise
+        
+        # 추정 메모리 사용량 (가중치 크기 기준)
+        self.memory_bytes = self.estimate_memory_bytes()
+        
+        # 게시된 양자화 변형 (없거나 로드 실패 시 아래 백엔드 설정 사용)
+        if quantization is not None:
+            self.backend = self.load_quantized_backend(quantization)
+            if self.backend is not None:
+                self.backend_name = f"tflite-{quantization}"
+        
+        # 경량 CPU 런타임 백엔드 (parity check 실패 시 Keras 유지)
+        if self.backend is None and backend != "keras":
+            self.backend = create_backend(
+                backend, self.model, self.MODEL_SAVE_PATH, self.MAX_SEQ_LENGTH, self.predict_keras
+            )
+            if self.backend is not None:
+                self.backend_name = backend
+        
+        if self.backend is not None:
+            # 예측은 백엔드가 담당하므로 Keras 모델과 tf.function 그래프 해제
+            self.model_predict_fn = None
+            self.model = None
+            gc.collect()
+            self.memory_bytes = self.backend.memory_bytes
+        logger.info(f"추론 백엔드: {self.backend_name} (추정 메모리 {self.memory_bytes / (1024 * 1024):.1f}MB)")
+        logger.info(f"모델 추정 메모리: {self.memory_bytes / (1024 * 1024):.1f}MB")
+        
+        # 같은 모델을 쓰는 클라이언트끼리 배치 추론 (executor는 모든 모델이 공유)
+        self.inference_scheduler = InferenceScheduler(
+            self.predict_batch,
+            executor=executor,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_batch_wait_ms,
+            max_queue_depth=max_queue_depth
+        )
+    
+    def load_quantized_backend(self, quantization):
+        """model_path 옆에 게시된 양자화 TFLite 변형을 로드 (없으면 None)"""
+        variant_url = f"s3://waterandfish-s3/{quantized_model_key(self.model_info['model_path'], quantization)}"
+        try:
+            with open(s3_utils.download_cached(variant_url), "rb") as f:
+                backend = TFLiteBackend(f.read())
+            # 변형은 게시 전에 검증 세트로 평가되었으므로 출력 형태만 확인
+            probs = backend(np.zeros((1, self.MAX_SEQ_LENGTH, MODEL_FEATURE_DIM), dtype=np.float32))
+            if probs.shape != (1, len(self.ACTIONS)):
+                raise ValueError(f"출력 형태 불일치: {probs.shape}")
+        except Exception as e:
+            logger.warning(f"{quantization} 양자화 모델을 사용할 수 없습니다 ({variant_url}): {e}")
+            return None
+        logger.info(f"{quantization} 양자화 모델 로드 완료: {variant_url}")
+        return backend
+    
+    def estimate_memory_bytes(self):
+        """가중치 바이트 수로 모델 메모리 사용량 추정"""
+        try:
+            return int(sum(np.prod(w.shape) * w.dtype.size for w in self.model.weights))
+        except Exception:
+            return int(self.model.count_params()) * 4
+    
+    def predict_batch(self, inputs):
+        """(B, T, 675) 배치 예측 - (B, num_labels) numpy 확률 배열 반환"""
+        if self.backend is not None:
+            return self.backend(inputs)
+        return self.predict_keras(inputs)
+    
+    @property
+    def retrace_count(self):
+        """warmup 이후 발생한 tf.function 재추적 횟수 (0이 아니면 요청 경로에서 컴파일 발생)"""
+        return self.trace_count - self.warmup_trace_count
+    
+    def predict_keras(self, inputs):
+        """Keras 모델로 배치 예측 (백엔드 parity check 기준)"""
+        # 최적화된 함수가 있으면 사용, 없으면 기본 모드 사용
+        if self.model_predict_fn is not None:
+            # tf.function으로 최적화된 예측 - warmup한 버킷 크기로만 호출
+            try:
+                inputs = np.asarray(inputs, dtype=np.float32)
+                trace_count = self.trace_count
+                outputs = [
+                    self.model_predict_fn(tf.convert_to_tensor(batch)).numpy()[:size]
+                    for batch, size in bucket_batches(inputs, self.batch_buckets)
+                ]
+                if self.trace_count != trace_count:
+                    logger.warning(f"tf.function 재추적 발생 (입력 {inputs.shape}, 누적 {self.retrace_count}회)")
+                return outputs[0] if len(outputs) == 1 else np.concatenate(outputs)
+            except Exception as e:
+                logger.warning(f"최적화된 예측 실패, 기본 모드로 전환: {e}")
+        # 기본 모드로 예측
+        return self.model.predict(inputs, verbose=0)
+    
+    async def close(self):
+        """배치 스케줄러를 멈추고 모델 참조 해제"""
+        await self.inference_scheduler.stop()
+        self.model_predict_fn = None
+        self.backend = None
+        self.model = None
+
+
+class ModelRegistry:
+    """model_info URL -> ClassifierModel 레지스트리 (지연 로딩 + LRU 메모리 예산)"""
+    
+    def __init__(self, model_factory, memory_budget_bytes):
+        self.model_factory = model_factory  # model_info_url -> ClassifierModel
+        self.memory_budget_bytes = memory_budget_bytes
+        self._models = OrderedDict()  # {model_key: ClassifierModel} (오래 사용하지 않은 순서)
+        self._loading = {}  # {model_key: asyncio.Future}
+        self._ref_counts = {}  # {model_key: 사용 중인 클라이언트 수}
+        self._pinned = set()  # 내리지 않는 모델 (프로세스 기본 모델)
+    
+    def __contains__(self, model_key):
+        return model_key in self._models
+    
+    def total_memory_bytes(self):
+        return sum(model.memory_bytes for model in self._models.values())
+    
+    def get(self, model_info_url):
+        """이미 로드된 모델 반환 (없으면 None, 로딩하지 않음)"""
+        return self._models.get(resolve_model_info_url(model_info_url))
+    
+    def load(self, model_info_url, pinned=False):
+        """모델을 동기적으로 로드 (서버 시작 시 기본 모델용)"""
+        model_key = resolve_model_info_url(model_info_url)
+        if model_key not in self._models:
+            self._models[model_key] = self.model_factory(model_key)
+            self._ref_counts.setdefault(model_key, 0)
+        if pinned:
+            self._pinned.add(model_key)
+        self._models.move_to_end(model_key)
+        return self._models[model_key]
+    
+    async def acquire(self, model_info_url):
+        """모델을 가져오고 사용 카운트 증가 - 없으면 기본 executor에서 로드"""
+        model_key = resolve_model_info_url(model_info_url)
+        model = self._models.get(model_key)
+        if model is None:
+            loading = self._loading.get(model_key)
+            if loading is None:
+                logger.info(f"모델 지연 로딩 시작: {model_key}")
+                loop = asyncio.get_running_loop()
+                loading = loop.run_in_executor(None, self.model_factory, model_key)
+                self._loading[model_key] = loading
+                try:
+                    model = await loading
+                finally:
+                    self._loading.pop(model_key, None)
+                self._models[model_key] = model
+                self._ref_counts.setdefault(model_key, 0)
+                logger.info(f"모델 로딩 완료: {model_key} (로드된 모델 {len(self._models)}개)")
+            else:
+                model = await loading
+        self._ref_counts[model_key] += 1
+        self._models.move_to_end(model_key)
+        await self.evict_if_needed()
+        return model
+    
+    def retain(self, model):
+        """이미 로드된 모델의 사용 카운트 증가"""
+        self._ref_counts[model.model_info_url] = self._ref_counts.get(model.model_info_url, 0) + 1
+        self._models.move_to_end(model.model_info_url)
+    
+    def release(self, model):
+        """클라이언트가 모델 사용을 마침"""
+        model_key = model.model_info_url
+        if self._ref_counts.get(model_key, 0) > 0:
+            self._ref_counts[model_key] -= 1
+    
+    async def evict_if_needed(self):
+        """메모리 예산을 넘으면 사용 중이 아닌 모델을 LRU 순서로 내림"""
+        while self.total_memory_bytes() > self.memory_budget_bytes:
+            victim = next(
+                (key for key in self._models
+                 if key not in self._pinned and self._ref_counts.get(key, 0) == 0),
+                None
+            )
+            if victim is None:
+                logger.warning(
+                    f"모델 메모리 예산 초과 ({self.total_memory_bytes() / (1024 * 1024):.1f}MB), "
+                    f"모든 모델이 사용 중이라 내릴 수 없습니다"
+                )
+                return
+            model = self._models.pop(victim)
+            self._ref_counts.pop(victim, None)
+            await model.close()
+            gc.collect()
+            logger.info(f"LRU 모델 제거: {victim}")
+    
+    async def close_all(self):
+        """모든 모델의 배치 스케줄러 정지"""
+        for model in self._models.values():
+            await model.inference_scheduler.stop()
+    
+    def stats(self):
+        return {
+            "models": list(self._models.keys()),
+            "ref_counts": dict(self._ref_counts),
+            "memory_mb": self.total_memory_bytes() / (1024 * 1024),
+            "memory_budget_mb": self.memory_budget_bytes / (1024 * 1024),
+            "retraces": {key: model.retrace_count for key, model in self._models.items()},
+        }
@@ -4,12 +4,34 @@ import os
 import threading
 import time
 import json
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
 import sys
 from ..core.config import settings
 from .s3_utils import s3_utils
 
 ppath = sys.executable
+
+# sign_classifier_websocket_server.py가 리슨을 시작하면 출력하는 줄
+# (이 모듈에서 TensorFlow를 import하지 않도록 서버 모듈과 별도로 정의)
+MODEL_SERVER_READY_LINE = "MODEL_SERVER_READY"
+
+
+class ModelServerWorker:
+    """모델 서버 프로세스 하나와 준비 상태 (대기 워커는 모델이 배정될 때까지 model_id가 None)"""
+
+    def __init__(self, process: subprocess.Popen, model_id: Optional[str] = None):
+        self.process = process
+        self.model_id = model_id
+        self.ready = threading.Event()  # 웹소켓 리슨 시작 시 설정
+        self.idle_since = time.time()
+        self.log_thread: Optional[threading.Thread] = None
+
+    @property
+    def label(self) -> str:
+        return self.model_id or f"standby-{self.process.pid}"
+
+
 class ModelServerManager:
     
     def __init__(self):
@@ -17,60 +39,140 @@ class ModelServerManager:
         self.running_servers: Dict[str, int] = {}  # {model_id: port}
         self.server_processes: Dict[str, subprocess.Popen] = {}  # {model_id: process}
         self.log_threads: Dict[str, threading.Thread] = {}  # {model_id: thread}
+        self.hosted_by: Dict[str, str] = {}  # {model_id: host_model_id} 다른 프로세스에 함께 올라간 모델
+        # TensorFlow import까지 끝내고 모델 배정을 기다리는 대기 워커
+        self.standby_workers: List[ModelServerWorker] = []
+        self.standby_lock = threading.Lock()
         self.count = 0
 
+    def _worker_command(self, server_args: List[str]) -> List[str]:
+        """모델 서버 프로세스 실행 명령"""
+        script_path = os.path.join(os.path.dirname(__file__), "sign_classifier_websocket_server.py")
+        return [
+            ppath, "-u", script_path,
+            *server_args,
+            "--log-level", "OFF",
+            "--backend", settings.MODEL_SERVER_BACKEND,
+            "--quantization", settings.MODEL_SERVER_QUANTIZATION,
+            # 같은 포트를 SO_REUSEPORT로 나눠 쓰는 워커 수 (부모 프로세스 하나로 관리)
+            "--workers", str(settings.MODEL_SERVER_WORKERS),
+            *(["--uvloop"] if settings.MODEL_SERVER_UVLOOP else []),
+            # "--host", "0.0.0.0", #외부에서 접근 가능하게 바인딩 해야함
+            # "--debug-video",
+            # "--accuracy-mode",
+            "--profile", # 프로파일링 모드 활성화
+        ]
+
+    def _spawn_worker(self, server_args: List[str], model_id: Optional[str] = None,
+                      model_data_url: Optional[str] = None) -> ModelServerWorker:
+        """모델 서버 프로세스를 시작하고 로그 처리 스레드를 붙임 (model_id가 없으면 대기 워커)"""
+        env = os.environ.copy()
+        env["PYTHONUNBUFFERED"] = "1"  # Python 출력 버퍼링 비활성화
+        if model_data_url is not None:
+            env["MODEL_DATA_URL"] = model_data_url
+
+        # Set the working directory to the parent of the services directory
+        working_dir = os.path.dirname(os.path.dirname(__file__))
+        process = subprocess.Popen(self._worker_command(server_args),
+        env=env,
+        stdin=subprocess.PIPE if model_id is None else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=0,
+        universal_newlines=True,
+        cwd=working_dir)
+
+        print(f"Model server process PID: {process.pid}")
+        worker = ModelServerWorker(process, model_id)
+
+        # 로그 처리 스레드 시작
+        worker.log_thread = threading.Thread(
+            target=self._handle_logs_thread,
+            args=(worker,),
+            daemon=True
+        )
+        worker.log_thread.start()
+        return worker
+
+    def fill_standby_pool(self) -> None:
+        """대기 워커 수를 MODEL_SERVER_STANDBY_POOL_SIZE까지 채움"""
+        with self.standby_lock:
+            # 유휴 시간 초과로 스스로 종료했거나 죽은 워커 제거
+            self.standby_workers = [w for w in self.standby_workers if w.process.poll() is None]
+            while len(self.standby_workers) < settings.MODEL_SERVER_STANDBY_POOL_SIZE:
+                worker = self._spawn_worker([
+                    "--standby",
+                    "--standby-max-idle", str(settings.MODEL_SERVER_STANDBY_MAX_IDLE),
+                ])
+                self.standby_workers.append(worker)
+                print(f"Started standby model server worker (PID {worker.process.pid})")
+
+    def _take_standby_worker(self) -> Optional[ModelServerWorker]:
+        """배정 가능한 대기 워커를 하나 꺼냄 (없으면 None)"""
+        # 유휴 시간 만료 직전인 워커는 배정 도중 종료될 수 있으므로 사용하지 않음
+        max_idle = settings.MODEL_SERVER_STANDBY_MAX_IDLE - 5
+        with self.standby_lock:
+            while self.standby_workers:
+                worker = self.standby_workers.pop(0)
+                if worker.process.poll() is not None:
+                    continue
+                if time.time() - worker.idle_since >= max_idle:
+                    worker.process.terminate()
+                    continue
+                return worker
+        return None
+
+    async def _wait_until_ready(self, worker: ModelServerWorker) -> bool:
+        """워커가 준비 완료 줄을 출력할 때까지 대기 (프로세스 종료 또는 시간 초과 시 False)"""
+        deadline = time.time() + settings.MODEL_SERVER_READY_TIMEOUT
+        while not worker.ready.is_set():
+            if worker.process.poll() is not None or time.time() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
     async def start_model_server(self, model_id: str, model_data_url: str, port: int = None) -> str:
-        """모델 서버를 시작하고 웹소켓 URL을 반환. port가 주어지면 해당 포트 사용"""
+        """모델 서버를 시작하고 웹소켓 URL을 반환. port가 주어지면 해당 포트 사용
+
+        대기 워커가 있으면 모델만 배정해 TensorFlow import와 프로세스 시작 비용을 건너뜁니다.
+        """
 
         if model_id not in self.running_servers:
             # 외부에서 포트가 주어지면 그대로 사용, 아니면 기존 방식대로 할당
             if port is None:
                 port = self.MODEL_PORT_BASE + (self.count % 100)
                 self.count = ((self.count + 1) % 100)
-            # 모델 서버 프로세스 시작
-            env = os.environ.copy()
-            env["MODEL_DATA_URL"] = model_data_url
-            env["PYTHONUNBUFFERED"] = "1"  # Python 출력 버퍼링 비활성화
-
-            script_path = os.path.join(os.path.dirname(__file__), "sign_classifier_websocket_server.py")
-            # Set the working directory to the parent of the services directory
-            working_dir = os.path.dirname(os.path.dirname(__file__))
-            process = subprocess.Popen([
-                ppath, "-u", script_path,
-                "--port", str(port),
-                "--env", model_data_url,
-                "--log-level", "OFF",
-                # "--host", "0.0.0.0", #외부에서 접근 가능하게 바인딩 해야함
-                # "--debug-video",
-                # "--accuracy-mode",
-                "--profile", # 프로파일링 모드 활성화
-            ],
-            env=env,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=0,
-            universal_newlines=True,
-            cwd=working_dir)
-
-            print(f"Model server process PID: {process.pid}")
 
-            self.running_servers[model_id] = port
-            self.server_processes[model_id] = process
+            start_time = time.time()
+            worker = self._take_standby_worker()
+            if worker is not None:
+                # 대기 워커에 모델 배정 (stdin으로 JSON 한 줄)
+                worker.model_id = model_id
+                worker.process.stdin.write(json.dumps({"port": port, "env": model_data_url}) + "\n")
+                worker.process.stdin.flush()
+                print(f"Assigned standby worker (PID {worker.process.pid}) to {model_id}")
+            else:
+                # 모델 서버 프로세스 시작
+                worker = self._spawn_worker(
+                    ["--port", str(port), "--env", model_data_url], model_id, model_data_url
+                )
 
-            # 로그 처리 스레드 시작
-            log_thread = threading.Thread(
-                target=self._handle_logs_thread,
-                args=(model_id, process),
-                daemon=True
-            )
-            log_thread.start()
-            self.log_threads[model_id] = log_thread
+            self.running_servers[model_id] = port
+            self.server_processes[model_id] = worker.process
+            self.log_threads[model_id] = worker.log_thread
 
             print(f"Started model server for {model_id} on port {port}")
 
-            # 서버가 시작될 때까지 잠시 대기
-            await asyncio.sleep(2)
+            # 서버가 리슨을 시작할 때까지 대기
+            if await self._wait_until_ready(worker):
+                print(f"Model server for {model_id} ready in {time.time() - start_time:.2f}s")
+            else:
+                print(f"Model server for {model_id} did not report readiness "
+                      f"(exit code: {worker.process.poll()})")
+
+            # 다음 요청을 위해 대기 워커 보충
+            self.fill_standby_pool()
         else:
             port = self.running_servers[model_id]
         MODEL_SERVER_HOST = settings.MODEL_SERVER_HOST
@@ -80,6 +182,26 @@ class ModelServerManager:
         else:
             return f"wss://{MODEL_SERVER_HOST}/ws/{port}/ws"
     
+    def attach_model(self, model_id: str, model_data_url: str, host_model_id: str, host_ws_url: str) -> str:
+        """이미 실행 중인 모델 서버 프로세스에 모델을 함께 올리고 웹소켓 URL을 반환
+
+        모델은 첫 연결 시 서버의 모델 레지스트리가 지연 로드합니다.
+        """
+        self.hosted_by[model_id] = host_model_id
+        self.server_processes[model_id] = self.server_processes[host_model_id]
+        ws_url = f"{host_ws_url}?{urlencode({'model': model_data_url})}"
+        self.running_servers[model_id] = ws_url
+        print(f"Attached model {model_id} to model server of {host_model_id}")
+        return ws_url
+
+    def _is_process_shared(self, model_id: str) -> bool:
+        """같은 프로세스를 사용하는 다른 모델이 남아 있는지 확인"""
+        process = self.server_processes.get(model_id)
+        return any(
+            other_id != model_id and other is process
+            for other_id, other in self.server_processes.items()
+        )
+
     def stop_model_server(self, model_id: str) -> bool:
         """모델 서버를 중지 (높은 우선순위)"""
         # 종료 작업은 우선순위가 높음 - shutdown_lock을 먼저 획득
@@ -91,7 +213,10 @@ class ModelServerManager:
         
         if model_id in self.running_servers:
             # 프로세스 종료
-            if model_id in self.server_processes:
+            if model_id in self.server_processes and self._is_process_shared(model_id):
+                # 다른 모델이 같은 프로세스를 사용 중이면 등록만 해제
+                del self.server_processes[model_id]
+            elif model_id in self.server_processes:
                 process = self.server_processes[model_id]
                 process.terminate()
                 try:
@@ -104,6 +229,7 @@ class ModelServerManager:
             if model_id in self.log_threads:
                 del self.log_threads[model_id]
             
+            self.hosted_by.pop(model_id, None)
             del self.running_servers[model_id]
             print(f"Stopped model server for {model_id}")
             
@@ -126,10 +252,11 @@ class ModelServerManager:
             return f"ws://0.0.0.0:{port}/ws"
         return None
     
-    def _handle_logs_thread(self, model_id: str, process: subprocess.Popen):
-        """스레드에서 실시간으로 프로세스 로그를 처리"""
+    def _handle_logs_thread(self, worker: ModelServerWorker):
+        """스레드에서 실시간으로 프로세스 로그를 처리 (준비 완료 줄을 보면 worker.ready 설정)"""
+        process = worker.process
         try:
-            print(f"[{model_id}] Log monitoring started")
+            print(f"[{worker.label}] Log monitoring started")
             
             while True:
                 # 프로세스가 종료되었는지 확인
@@ -139,25 +266,27 @@ class ModelServerManager:
                     if remaining_output:
                         for line in remaining_output.splitlines():
                             if line.strip():
-                                print(f"[{model_id}] {line}")
+                                print(f"[{worker.label}] {line}")
                     break
                 
                 # 한 줄씩 읽기
                 try:
                     line = process.stdout.readline()
+                    if line.startswith(MODEL_SERVER_READY_LINE):
+                        worker.ready.set()
                     if line:
-                        print(f"[{model_id}] {line.rstrip()}")
+                        print(f"[{worker.label}] {line.rstrip()}")
                     else:
                         # 출력이 없으면 잠시 대기
                         time.sleep(0.01)
                 except Exception as read_error:
-                    print(f"[{model_id}] Error reading line: {read_error}")
+                    print(f"[{worker.label}] Error reading line: {read_error}")
                     break
                         
         except Exception as e:
-            print(f"Error handling logs for {model_id}: {e}")
+            print(f"Error handling logs for {worker.label}: {e}")
         finally:
-            print(f"[{model_id}] Log monitoring stopped")
+            print(f"[{worker.label}] Log monitoring stopped")
     
     def get_server_logs(self, model_id: str) -> Optional[str]:
         """모델 서버의 로그 반환"""
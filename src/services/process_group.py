@@ -0,0 +1,76 @@
+"""
+하나의 포트를 나눠 쓰는 분류 서버 프로세스 그룹
+
+--workers N(SO_REUSEPORT로 같은 포트를 공유하는 서버 N개)과 --frontends N(공유 메모리
+프론트엔드 N개 + 추론 워커)은 모두 부모 프로세스가 자식 프로세스를 fork해 만듭니다.
+ModelServerManager는 부모 프로세스 하나만 관리하므로 그룹 전체를 하나의 서버처럼 다룹니다.
+
+- 유휴 종료는 그룹 전체 연결 수(client_counter)가 0일 때만 하며, 종료를 결정한 자식이
+  request_shutdown()을 호출하면 부모가 나머지 자식을 정리하고 종료합니다.
+- 부모가 SIGTERM을 받으면(매니저의 stop_model_server) 자식도 함께 종료합니다.
+"""
+import logging
+import signal
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class ServerProcessGroup:
+    """fork된 서버 프로세스들의 공유 상태 (연결 수 합계, 종료 요청)와 부모 쪽 관리"""
+
+    def __init__(self, mp_context):
+        self.mp_context = mp_context
+        self.client_counter = mp_context.Value("i", 0)
+        self.shutdown_requested = mp_context.Event()
+        self.processes = []
+
+    def start(self, target, args, name):
+        """자식 프로세스 시작 (부모가 비정상 종료해도 남지 않도록 daemon)"""
+        process = self.mp_context.Process(target=target, args=args, name=name, daemon=True)
+        process.start()
+        self.processes.append(process)
+        return process
+
+    def client_connected(self):
+        with self.client_counter.get_lock():
+            self.client_counter.value += 1
+
+    def client_disconnected(self):
+        with self.client_counter.get_lock():
+            self.client_counter.value -= 1
+
+    def active_clients(self):
+        """그룹 전체의 연결 수"""
+        return self.client_counter.value
+
+    def request_shutdown(self):
+        self.shutdown_requested.set()
+
+    def should_stop(self):
+        """종료 요청이 있거나 자식이 모두 끝났는지 (자식이 없으면 종료 요청만 확인)"""
+        if self.shutdown_requested.is_set():
+            return True
+        return bool(self.processes) and not any(p.is_alive() for p in self.processes)
+
+    def install_signal_handlers(self):
+        """SIGTERM을 SystemExit로 바꿔 부모의 finally 블록(terminate)이 실행되도록 함"""
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    def terminate(self, timeout=5):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+        for process in self.processes:
+            process.join(timeout=timeout)
+
+    def supervise(self, poll_interval=1.0):
+        """부모 프로세스 - 종료 요청이나 모든 자식 종료까지 대기한 뒤 자식 정리"""
+        self.install_signal_handlers()
+        try:
+            while not self.should_stop():
+                time.sleep(poll_interval)
+        finally:
+            self.terminate()
+            logger.info("서버 프로세스 그룹 종료")
@@ -0,0 +1,88 @@
+"""
+분류 결과 전송 형식 (클라이언트별 협상)
+
+- full: 라벨 문자열을 키로 하는 probabilities dict 전체 (기존 형식, 기본값)
+- topk: 최상위 라벨 인덱스/신뢰도 + 상위 k개 라벨 인덱스와 점수
+        {"index": 3, "confidence": 0.81, "indices": [3, 0, 7], "scores": [0.81, 0.12, 0.03]}
+- array: 최상위 라벨 인덱스/신뢰도 + 라벨 테이블 순서의 전체 점수 배열
+        {"index": 3, "confidence": 0.81, "scores": [...]}
+
+topk/array를 협상한 클라이언트는 hello_ack(모델이 바뀌면 labels 메시지)로 라벨 테이블을
+한 번만 받고, 이후 결과에는 라벨 인덱스만 받습니다. 점수는 소수점 4자리로 반올림합니다.
+
+change_band를 지정하면 변화 전용 모드로 동작합니다 - 스무딩된 최상위 라벨이 바뀌거나
+신뢰도가 다른 구간(폭 change_band)으로 넘어갈 때만 결과를 보냅니다.
+"""
+import numpy as np
+
+RESULT_FORMATS = ("full", "topk", "array")
+DEFAULT_TOP_K = 5
+SCORE_DECIMALS = 4
+
+
+def _round_scores(scores):
+    # float32를 그대로 tolist()하면 0.12349999696016312처럼 길게 직렬화되므로 float64로 반올림
+    return np.round(scores.astype(np.float64), SCORE_DECIMALS).tolist()
+
+
+class ResultFormat:
+    """클라이언트 하나의 결과 전송 형식과 변화 전용 모드 상태"""
+
+    __slots__ = ("name", "top_k", "change_band", "_last_emitted")
+
+    def __init__(self, name="full", top_k=DEFAULT_TOP_K, change_band=None):
+        if name not in RESULT_FORMATS:
+            raise ValueError(f"지원하지 않는 결과 형식: {name}")
+        if top_k < 1:
+            raise ValueError(f"top_k는 1 이상이어야 합니다: {top_k}")
+        if change_band is not None and not 0 < change_band <= 1:
+            raise ValueError(f"change_band는 0보다 크고 1 이하여야 합니다: {change_band}")
+        self.name = name
+        self.top_k = top_k
+        self.change_band = change_band
+        self._last_emitted = None
+
+    @property
+    def compact(self):
+        """라벨 테이블을 따로 받고 결과에는 인덱스만 받는 형식인지"""
+        return self.name != "full"
+
+    def reset(self):
+        """변화 전용 모드 기준 초기화 (모델 변경 시)"""
+        self._last_emitted = None
+
+    def should_emit(self, result):
+        """변화 전용 모드에서 최상위 라벨이나 신뢰도 구간이 바뀐 결과만 전송"""
+        if self.change_band is None:
+            return True
+        key = (result["index"], int(result["confidence"] / self.change_band))
+        if key == self._last_emitted:
+            return False
+        self._last_emitted = key
+        return True
+
+    def format(self, result, labels):
+        """평균 결과(index, confidence, scores 배열)를 클라이언트에 보낼 dict로 변환"""
+        scores = result["scores"]
+        if self.name == "full":
+            return {
+                "prediction": result["prediction"],
+                "confidence": result["confidence"],
+                # 기존 클라이언트와 같은 값으로 직렬화되도록 float64로 변환
+                "probabilities": dict(zip(labels, scores.astype(np.float64).tolist())),
+                "buffer_size": result["buffer_size"]  # 디버깅용 정보
+            }
+        payload = {"index": result["index"], "confidence": round(result["confidence"], SCORE_DECIMALS)}
+        if self.name == "topk":
+            k = min(self.top_k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind="stable")]
+            payload["indices"] = top.tolist()
+            payload["scores"] = _round_scores(scores[top])
+        else:
+            payload["scores"] = _round_scores(scores)
+        return payload
+
+
+# 클라이언트 형식과 관계없이 classification_log 모니터링에 사용하는 형식
+FULL_RESULT_FORMAT = ResultFormat()
@@ -0,0 +1,71 @@
+"""
+클라이언트별 분류 확률 스무딩
+
+예측 결과 dict를 deque에 쌓아 두고 예측마다 모든 결과의 probabilities dict를 다시
+더하는 대신(O(버퍼 크기 x 라벨 수) 파이썬 연산), 확률 벡터를 미리 할당된
+(capacity, num_labels) float64 링 버퍼에 기록하고 누적 합을 갱신합니다(O(라벨 수)).
+기존 구현처럼 float64로 더하므로 full 형식으로 보내는 평균 확률 값이 기존과 같습니다.
+- mean: 최근 capacity개 예측의 단순 평균 (기존 결과 버퍼와 동일)
+- ema: 지수 이동 평균, alpha 기본값은 capacity개 단순 평균과 같은 중심 지연을 갖는 2 / (capacity + 1)
+
+라벨 dict 변환은 결과를 클라이언트에 보낼 때만 수행합니다.
+"""
+import numpy as np
+
+SMOOTHING_MODES = ("mean", "ema")
+
+
+class ResultSmoother:
+    """(capacity, num_labels) float64 확률 링 버퍼 + 누적 합 (또는 EMA)"""
+
+    __slots__ = ("mode", "capacity", "alpha", "_history", "_sum", "_index", "_count")
+
+    def __init__(self, num_labels, capacity, mode="mean", alpha=None):
+        if mode not in SMOOTHING_MODES:
+            raise ValueError(f"지원하지 않는 스무딩 모드: {mode}")
+        self.mode = mode
+        self.capacity = max(1, capacity)
+        self.alpha = alpha if alpha is not None else 2.0 / (self.capacity + 1)
+        self._allocate(num_labels)
+
+    def _allocate(self, num_labels):
+        rows = self.capacity if self.mode == "mean" else 0
+        self._history = np.zeros((rows, num_labels), dtype=np.float64)
+        self._sum = np.zeros(num_labels, dtype=np.float64)
+        self._index = 0
+        self._count = 0
+
+    def reset(self, num_labels=None):
+        """스무딩 상태 초기화 (모델 변경으로 라벨 수가 바뀌면 다시 할당)"""
+        if num_labels is not None and num_labels != self._sum.shape[0]:
+            self._allocate(num_labels)
+            return
+        self._history[:] = 0.0
+        self._sum[:] = 0.0
+        self._index = 0
+        self._count = 0
+
+    def __len__(self):
+        """스무딩에 반영된 예측 수 (최대 capacity)"""
+        return min(self._count, self.capacity)
+
+    def add(self, probs):
+        """예측 확률 벡터 하나를 반영하고 스무딩된 확률 (num_labels,) 반환 (내부 배열 복사본)"""
+        if self.mode == "ema":
+            if self._count == 0:
+                self._sum[:] = probs
+            else:
+                self._sum += self.alpha * (probs - self._sum)
+            self._count += 1
+            return self._sum.copy()
+
+        slot = self._index
+        self._sum -= self._history[slot]
+        self._history[slot] = probs
+        self._sum += self._history[slot]
+        self._index = (slot + 1) % self.capacity
+        self._count += 1
+        if self._index == 0:
+            # 링 버퍼가 한 바퀴 돌 때마다 다시 합산해 빼기로 인한 누적 오차가 쌓이지 않도록 함
+            np.sum(self._history, axis=0, out=self._sum)
+        return self._sum / len(self)
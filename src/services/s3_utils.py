@@ -1,6 +1,7 @@
 import boto3
 import os
 import tempfile
+import hashlib
 import logging
 from urllib.parse import urlparse
 from typing import Optional
@@ -12,6 +13,113 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# 모델 서버 재시작 간에 유지되는 S3 아티팩트 캐시 설정
+S3_CACHE_DIR = os.getenv('S3_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'waterandfish-s3-cache'))
+S3_CACHE_MAX_BYTES = int(os.getenv('S3_CACHE_MAX_MB', '2048')) * 1024 * 1024
+
+
+class S3ArtifactCache:
+    """
+    (bucket, key, ETag)를 키로 하는 로컬 S3 아티팩트 캐시
+
+    파일은 <cache_dir>/<sha256(bucket/key)>/<ETag>/<basename> 에 저장되므로 이름이 같은
+    다른 키끼리 덮어쓰지 않고, 확장자(.h5, .keras 등)도 그대로 유지됩니다.
+    다운로드는 같은 디렉터리의 임시 파일에 받은 뒤 os.replace로 교체하므로 동시에
+    시작한 다른 프로세스가 받다 만 파일을 읽지 않습니다. 전체 크기가 max_bytes를
+    넘으면 가장 오래 사용하지 않은(mtime 기준) 항목부터 삭제합니다.
+    """
+
+    def __init__(self, s3_client, cache_dir: str = S3_CACHE_DIR, max_bytes: int = S3_CACHE_MAX_BYTES):
+        self.s3_client = s3_client
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _key_dir(self, bucket_name: str, key: str) -> str:
+        digest = hashlib.sha256(f"{bucket_name}/{key}".encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest)
+
+    def _entries(self, key_dir: str):
+        """키 디렉터리 아래 캐시된 (ETag 디렉터리, 파일 경로) 목록"""
+        if not os.path.isdir(key_dir):
+            return []
+        entries = []
+        for etag in os.listdir(key_dir):
+            etag_dir = os.path.join(key_dir, etag)
+            for name in os.listdir(etag_dir) if os.path.isdir(etag_dir) else []:
+                if not name.endswith('.part'):
+                    entries.append((etag_dir, os.path.join(etag_dir, name)))
+        return entries
+
+    def fetch(self, bucket_name: str, key: str) -> str:
+        """ETag가 바뀌지 않았으면 캐시된 파일을, 바뀌었으면 새로 받아 로컬 경로를 반환"""
+        key_dir = self._key_dir(bucket_name, key)
+        try:
+            etag = self.s3_client.head_object(Bucket=bucket_name, Key=key)['ETag'].strip('"')
+        except Exception as e:
+            # S3에 접근할 수 없으면 가장 최근에 받은 버전이라도 사용
+            cached = sorted(self._entries(key_dir), key=lambda entry: os.path.getmtime(entry[1]))
+            if cached:
+                logger.warning(f"⚠️ S3 ETag 확인 실패, 캐시된 파일 사용: {e}")
+                return self._touch(cached[-1][1])
+            raise
+
+        etag_dir = os.path.join(key_dir, hashlib.sha256(etag.encode("utf-8")).hexdigest()[:32])
+        local_path = os.path.join(etag_dir, os.path.basename(key))
+        if os.path.exists(local_path):
+            logger.info(f"♻️ S3 캐시 적중 (ETag {etag}): {local_path}")
+            return self._touch(local_path)
+
+        os.makedirs(etag_dir, exist_ok=True)
+        part_path = f"{local_path}.{os.getpid()}.part"
+        try:
+            self.s3_client.download_file(bucket_name, key, part_path)
+            os.replace(part_path, local_path)
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+
+        # 같은 키의 이전 ETag 버전 삭제
+        for old_dir, old_path in self._entries(key_dir):
+            if old_dir != etag_dir:
+                self._remove(old_path)
+        self.evict(keep=local_path)
+        return local_path
+
+    def evict(self, keep: Optional[str] = None):
+        """캐시 크기가 max_bytes 이하가 될 때까지 LRU 순서로 삭제 (keep 파일 제외)"""
+        files = []
+        for key_name in os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []:
+            for _, path in self._entries(os.path.join(self.cache_dir, key_name)):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _touch(path: str) -> str:
+        """LRU 순서를 위해 사용 시각 갱신"""
+        os.utime(path, None)
+        return path
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+        logger.info(f"🗑️ S3 캐시 항목 삭제: {path}")
+
+
 class S3Utils:
     def __init__(self):
         """S3 유틸리티 초기화"""
@@ -21,6 +129,27 @@ class S3Utils:
             aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
             region_name=os.getenv('AWS_REGION', 'ap-northeast-2')
         )
+        self.artifact_cache = S3ArtifactCache(self.s3_client)
+    
+    def download_cached(self, s3_url: str) -> str:
+        """
+        S3 파일을 로컬 아티팩트 캐시를 거쳐 다운로드합니다.
+        
+        Args:
+            s3_url: S3 URL (예: s3://bucket-name/path/to/file)
+            
+        Returns:
+            캐시된 파일의 로컬 경로 (ETag가 같으면 전송 없이 기존 파일)
+        """
+        parsed_url = urlparse(s3_url)
+        if parsed_url.scheme != 's3':
+            raise ValueError(f"Invalid S3 URL: {s3_url}")
+        
+        try:
+            return self.artifact_cache.fetch(parsed_url.netloc, parsed_url.path.lstrip('/'))
+        except Exception as e:
+            logger.error(f"❌ S3 파일 다운로드 실패: {e}")
+            raise
     
     def download_file_from_s3(self, s3_url: str, local_path: Optional[str] = None) -> str:
         """
@@ -64,6 +193,25 @@ class S3Utils:
             logger.error(f"❌ S3 파일 다운로드 실패: {e}")
             raise
     
+    def upload_file_to_s3(self, local_path: str, s3_url: str) -> str:
+        """
+        로컬 파일을 S3에 업로드합니다.
+        
+        Args:
+            local_path: 업로드할 로컬 파일 경로
+            s3_url: 대상 S3 URL (예: s3://bucket-name/path/to/file)
+            
+        Returns:
+            업로드된 S3 URL
+        """
+        parsed_url = urlparse(s3_url)
+        if parsed_url.scheme != 's3':
+            raise ValueError(f"Invalid S3 URL: {s3_url}")
+        
+        logger.info(f"📤 S3에 파일 업로드 중: {local_path} -> {s3_url}")
+        self.s3_client.upload_file(local_path, parsed_url.netloc, parsed_url.path.lstrip('/'))
+        return s3_url
+    
     def file_exists_in_s3(self, s3_url: str) -> bool:
         """
         S3에 파일이 존재하는지 확인합니다.
@@ -0,0 +1,353 @@
+"""
+공유 메모리 기반 프론트엔드 / 추론 워커 분리
+
+WebSocket 수신, 전처리, 스무딩은 여러 프론트엔드 프로세스가 나눠 처리하고, TensorFlow
+추론은 추론 워커 프로세스 하나가 모아서 배치로 실행합니다(--frontends N).
+
+- 윈도우 입력과 확률 출력은 multiprocessing.shared_memory 슬롯 배열(SharedWindowRing)로
+  주고받으며, 큐에는 슬롯 번호 같은 작은 메시지만 보냅니다.
+- 슬롯은 프론트엔드별로 나눠 두고 각 프론트엔드가 자기 구간을 free list로 순환 사용하므로
+  프로세스 간 슬롯 할당 잠금이 필요 없습니다. 남은 슬롯이 없으면 asyncio.QueueFull로 알립니다.
+- 추론 워커는 모든 프론트엔드의 요청을 모델별 InferenceScheduler에 넣어 함께 배치로 묶습니다.
+- 모델 레지스트리(지연 로딩, LRU, 사용 카운트)는 추론 워커에만 있고, 프론트엔드의
+  SharedModelRegistry는 같은 인터페이스로 요청을 전달하며 라벨 등 메타데이터만 가집니다.
+"""
+import asyncio
+import itertools
+import logging
+import queue
+import threading
+from collections import deque
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    from .landmark_preprocessing import MODEL_FEATURE_DIM
+except ImportError:
+    # sign_classifier_websocket_server.py를 스크립트로 실행하는 경우
+    from landmark_preprocessing import MODEL_FEATURE_DIM
+
+logger = logging.getLogger(__name__)
+
+# 슬롯당 출력 확률 수 기본값 (모델 라벨 수) - 기본 모델 라벨이 더 많으면 그 수로 늘림
+SHARED_MAX_LABELS = 256
+# 추론 워커가 추론 실패 원인으로 보내는 값 - 프론트엔드에서 asyncio.QueueFull로 변환
+QUEUE_FULL = "queue_full"
+
+
+def _forward_messages(message_queue, loop, dispatch):
+    """수신 스레드 - 큐 메시지를 모아 이벤트 루프의 dispatch로 넘김 (None을 받으면 종료)"""
+    while True:
+        messages = [message_queue.get()]
+        # 이미 도착한 메시지는 한 번에 넘겨 루프 깨우기 횟수를 줄임
+        try:
+            while True:
+                messages.append(message_queue.get_nowait())
+        except queue.Empty:
+            pass
+        stop = None in messages
+        messages = [message for message in messages if message is not None]
+        try:
+            if messages:
+                loop.call_soon_threadsafe(dispatch, messages)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘
+            return
+        if stop:
+            return
+
+
+class SharedWindowRing:
+    """공유 메모리 윈도우 슬롯 - 입력 (num_slots, T, 675), 출력 (num_slots, max_labels) float32"""
+
+    def __init__(self, num_slots, max_seq_length, max_labels=SHARED_MAX_LABELS):
+        self.num_slots = num_slots
+        self.max_seq_length = max_seq_length
+        self.max_labels = max_labels
+        input_bytes = num_slots * max_seq_length * MODEL_FEATURE_DIM * 4
+        output_bytes = num_slots * max_labels * 4
+        self.shm = shared_memory.SharedMemory(create=True, size=input_bytes + output_bytes)
+        self.inputs = np.ndarray((num_slots, max_seq_length, MODEL_FEATURE_DIM), dtype=np.float32, buffer=self.shm.buf)
+        self.outputs = np.ndarray((num_slots, max_labels), dtype=np.float32, buffer=self.shm.buf, offset=input_bytes)
+
+    def close(self, unlink=False):
+        """매핑 해제 (unlink=True는 만든 프로세스가 마지막에 한 번만)"""
+        # shm 버퍼를 참조하는 배열을 먼저 놓아야 close 가능
+        self.inputs = None
+        self.outputs = None
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+class SharedInferenceChannel:
+    """부모 프로세스가 만들어 fork로 프론트엔드에 물려주는 공유 자원 (슬롯, 큐)"""
+
+    def __init__(self, mp_context, num_frontends, slots_per_frontend, max_seq_length, max_labels=SHARED_MAX_LABELS):
+        self.num_frontends = num_frontends
+        self.slots_per_frontend = slots_per_frontend
+        self.ring = SharedWindowRing(num_frontends * slots_per_frontend, max_seq_length, max_labels)
+        self.request_queue = mp_context.Queue()  # 프론트엔드 -> 추론 워커
+        self.response_queues = [mp_context.Queue() for _ in range(num_frontends)]  # 추론 워커 -> 프론트엔드
+
+    def frontend_slots(self, index):
+        start = index * self.slots_per_frontend
+        return range(start, start + self.slots_per_frontend)
+
+
+class SharedInferenceClient:
+    """프론트엔드 프로세스 쪽 연결 - 슬롯 할당, 요청 전송, 응답 수신 스레드"""
+
+    def __init__(self, channel, index, listen_socket=None):
+        self.channel = channel
+        self.index = index
+        self.listen_socket = listen_socket  # 부모가 bind한 소켓 (모든 프론트엔드가 함께 accept)
+        self.ring = channel.ring
+        self.response_queue = channel.response_queues[index]
+        self._free_slots = deque(channel.frontend_slots(index))
+        self._pending = {}  # {request_id: (asyncio.Future, slots)}
+        self._request_ids = itertools.count()
+        self._loop = None
+
+    def _ensure_reader(self):
+        """이벤트 루프 안에서 응답 수신 스레드 시작"""
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+            threading.Thread(target=self._read_responses, name=f"shared-inference-{self.index}", daemon=True).start()
+
+    def _read_responses(self):
+        _forward_messages(self.response_queue, self._loop, self._dispatch)
+
+    def _dispatch(self, messages):
+        for kind, request_id, payload, error in messages:
+            future, slots = self._pending.pop(request_id)
+            if kind == "done":
+                if error is None:
+                    # 슬롯을 돌려주기 전에 출력 복사
+                    payload = self.ring.outputs[slots, :payload].copy()
+                self._free_slots.extend(slots)
+            if future.done():
+                # 연결 종료 등으로 취소된 요청
+                continue
+            if error == QUEUE_FULL:
+                future.set_exception(asyncio.QueueFull())
+            elif error is not None:
+                future.set_exception(RuntimeError(error))
+            else:
+                future.set_result(payload)
+
+    def _request(self, kind, *args, slots=()):
+        self._ensure_reader()
+        request_id = next(self._request_ids)
+        future = self._loop.create_future()
+        self._pending[request_id] = (future, slots)
+        self.channel.request_queue.put((kind, self.index, request_id, *args))
+        return future
+
+    async def submit_many(self, model_key, windows):
+        """(K, T, 675) 윈도우를 슬롯에 쓰고 추론 워커의 (K, num_labels) 확률을 기다림"""
+        if len(windows) > len(self._free_slots):
+            raise asyncio.QueueFull()
+        length = windows.shape[1]
+        if length > self.ring.max_seq_length:
+            raise ValueError(f"윈도우 길이 {length}가 공유 슬롯 길이 {self.ring.max_seq_length}보다 깁니다")
+        slots = [self._free_slots.popleft() for _ in range(len(windows))]
+        self.ring.inputs[slots, :length] = windows
+        return await self._request("predict", model_key, slots, length, slots=slots)
+
+    async def acquire(self, model_key):
+        """추론 워커 레지스트리에서 모델을 가져오고(사용 카운트 증가) 메타데이터 반환"""
+        return await self._request("acquire", model_key)
+
+    def describe(self, model_key):
+        """이벤트 루프 시작 전 동기 조회 - 추론 워커에 로드된 모델의 메타데이터 (사용 카운트 변화 없음)"""
+        request_id = next(self._request_ids)
+        self.channel.request_queue.put(("describe", self.index, request_id, model_key))
+        _, _, meta, error = self.response_queue.get()
+        if error is not None:
+            raise RuntimeError(error)
+        return meta
+
+    def send(self, kind, *args):
+        """응답이 필요 없는 요청 (retain, release)"""
+        self.channel.request_queue.put((kind, self.index, None, *args))
+
+
+class SharedModelScheduler:
+    """프론트엔드의 모델별 submit_many - 추론 워커의 InferenceScheduler로 전달
+
+    추론 시간은 워커 프로세스에서 쓰이므로 account에 기록하지 않습니다
+    (프론트엔드의 클라이언트 처리 시간은 이벤트 루프 시간만 포함).
+    """
+
+    def __init__(self, client, model_key):
+        self.client = client
+        self.model_key = model_key
+
+    async def submit_many(self, windows, account=None):
+        return await self.client.submit_many(self.model_key, windows)
+
+    async def stop(self):
+        pass
+
+
+class SharedModel:
+    """추론 워커에 로드된 모델의 프론트엔드 쪽 표현 (라벨, 윈도우 길이, 모션 게이트)"""
+
+    def __init__(self, client, meta):
+        self.model_info_url = meta["model_info_url"]
+        self.model_info = meta["model_info"]
+        self.MAX_SEQ_LENGTH = meta["MAX_SEQ_LENGTH"]
+        self.MODEL_SAVE_PATH = meta["MODEL_SAVE_PATH"]
+        self.ACTIONS = meta["ACTIONS"]
+        self.QUIZ_LABELS = meta["QUIZ_LABELS"]
+        self.motion_gate = meta["motion_gate"]
+        self.backend_name = meta["backend_name"]
+        self.retrace_count = meta["retrace_count"]  # 조회 시점 값
+        self.inference_scheduler = SharedModelScheduler(client, self.model_info_url)
+
+
+def describe_model(model):
+    """추론 워커 -> 프론트엔드로 보내는 모델 메타데이터"""
+    return {
+        "model_info_url": model.model_info_url,
+        "model_info": model.model_info,
+        "MAX_SEQ_LENGTH": model.MAX_SEQ_LENGTH,
+        "MODEL_SAVE_PATH": model.MODEL_SAVE_PATH,
+        "ACTIONS": model.ACTIONS,
+        "QUIZ_LABELS": model.QUIZ_LABELS,
+        "motion_gate": model.motion_gate,
+        "backend_name": model.backend_name,
+        "retrace_count": model.retrace_count,
+    }
+
+
+class SharedModelRegistry:
+    """프론트엔드용 ModelRegistry 인터페이스 - 로딩과 사용 카운트는 추론 워커가 관리"""
+
+    def __init__(self, client, resolve_key):
+        self.client = client
+        self.resolve_key = resolve_key  # model_info_url -> 레지스트리 키
+        self._models = {}  # {model_key: SharedModel}
+
+    def _model(self, meta):
+        model = self._models.get(meta["model_info_url"])
+        if model is None:
+            model = self._models[meta["model_info_url"]] = SharedModel(self.client, meta)
+        return model
+
+    def load(self, model_info_url, pinned=False):
+        """서버 시작 시 기본 모델 조회 (추론 워커가 이미 로드해 고정한 모델)"""
+        return self._model(self.client.describe(self.resolve_key(model_info_url)))
+
+    async def acquire(self, model_info_url):
+        return self._model(await self.client.acquire(self.resolve_key(model_info_url)))
+
+    def retain(self, model):
+        self.client.send("retain", model.model_info_url)
+
+    def release(self, model):
+        self.client.send("release", model.model_info_url)
+
+    async def close_all(self):
+        # 응답 수신 스레드 종료
+        self.client.response_queue.put(None)
+
+    def stats(self):
+        return {"models": list(self._models.keys()), "frontend": self.client.index}
+
+
+class SharedInferenceWorker:
+    """추론 워커 - 프론트엔드 요청을 모델 레지스트리와 배치 스케줄러로 처리"""
+
+    def __init__(self, channel, model_registry, process_group, poll_interval=1.0):
+        self.channel = channel
+        self.ring = channel.ring
+        self.model_registry = model_registry
+        self.process_group = process_group  # 프론트엔드 프로세스와 종료 요청 (process_group.py)
+        self.poll_interval = poll_interval
+        self._loop = None
+
+    def _read_requests(self):
+        _forward_messages(self.channel.request_queue, self._loop, self._dispatch)
+
+    def _respond(self, frontend, kind, request_id, payload=None, error=None):
+        self.channel.response_queues[frontend].put((kind, request_id, payload, error))
+
+    def _dispatch(self, messages):
+        for kind, frontend, request_id, *args in messages:
+            if kind == "predict":
+                asyncio.ensure_future(self._predict(frontend, request_id, *args))
+            elif kind == "acquire":
+                asyncio.ensure_future(self._acquire(frontend, request_id, *args))
+            elif kind == "describe":
+                try:
+                    model = self.model_registry.load(args[0])
+                    self._check_slot_size(model)
+                    self._respond(frontend, "describe", request_id, describe_model(model))
+                except Exception as e:
+                    self._respond(frontend, "describe", request_id, error=str(e))
+            elif kind in ("retain", "release"):
+                model = self.model_registry.get(args[0])
+                if model is not None:
+                    getattr(self.model_registry, kind)(model)
+
+    def _check_slot_size(self, model):
+        """윈도우가 입력 슬롯보다 길거나 확률을 출력 슬롯에 모두 담을 수 없는 모델은 등록 단계에서 거부"""
+        if model.MAX_SEQ_LENGTH > self.ring.max_seq_length:
+            raise ValueError(
+                f"모델 윈도우 길이({model.MAX_SEQ_LENGTH})가 공유 입력 슬롯 길이({self.ring.max_seq_length})보다 깁니다: "
+                f"{model.model_info_url}"
+            )
+        if len(model.ACTIONS) > self.ring.max_labels:
+            raise ValueError(
+                f"모델 라벨 수({len(model.ACTIONS)})가 공유 출력 슬롯 크기({self.ring.max_labels})보다 큽니다: "
+                f"{model.model_info_url}"
+            )
+
+    async def _predict(self, frontend, request_id, model_key, slots, length):
+        try:
+            model = self.model_registry.get(model_key)
+            if model is None:
+                raise RuntimeError(f"로드되지 않은 모델: {model_key}")
+            # 슬롯은 응답을 보낼 때까지 프론트엔드가 재사용하지 않으므로 바로 읽어도 안전
+            probs = await model.inference_scheduler.submit_many(self.ring.inputs[slots, :length])
+            self.ring.outputs[slots, :probs.shape[1]] = probs
+            self._respond(frontend, "done", request_id, probs.shape[1])
+        except asyncio.QueueFull:
+            self._respond(frontend, "done", request_id, error=QUEUE_FULL)
+        except Exception as e:
+            logger.error(f"공유 추론 실패 (프론트엔드 {frontend}): {e}")
+            self._respond(frontend, "done", request_id, error=str(e))
+
+    async def _acquire(self, frontend, request_id, model_key):
+        try:
+            model = await self.model_registry.acquire(model_key)
+            try:
+                self._check_slot_size(model)
+            except ValueError:
+                self.model_registry.release(model)
+                raise
+            self._respond(frontend, "acquired", request_id, describe_model(model))
+        except Exception as e:
+            self._respond(frontend, "acquired", request_id, error=str(e))
+
+    async def run(self):
+        """종료 요청이 오거나 모든 프론트엔드가 끝날 때까지 요청 처리"""
+        self._loop = asyncio.get_running_loop()
+        threading.Thread(target=self._read_requests, name="shared-inference-worker", daemon=True).start()
+        logger.info(
+            f"공유 추론 워커 시작: 프론트엔드 {self.channel.num_frontends}개, "
+            f"슬롯 {self.ring.num_slots}개 (프론트엔드당 {self.channel.slots_per_frontend}개)"
+        )
+        try:
+            while not self.process_group.should_stop():
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            self.process_group.terminate()
+            await self.model_registry.close_all()
+            # 요청 수신 스레드 종료
+            self.channel.request_queue.put(None)
+            self.ring.close(unlink=True)
+            logger.info("공유 추론 워커 종료")
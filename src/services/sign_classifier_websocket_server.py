@@ -10,14 +10,19 @@ import os
 import asyncio
 import websockets
 import logging
-from collections import deque
 # PIL, base64, io 제거 - 이미지 처리 불필요
 # from PIL import ImageFont, ImageDraw, Image
 # import base64
 # import io
 from datetime import datetime
 import argparse
+from urllib.parse import parse_qs, urlparse
 import time  # 성능 측정용
+from concurrent.futures import ThreadPoolExecutor
+import multiprocessing
+import queue
+import socket
+import threading
 
 # Add the current directory to sys.path to enable imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -29,16 +34,53 @@ os.environ['TF_FORCE_GPU_ALLOW_GROWTH'] = 'true'
 os.environ['TF_CPP_MIN_LOG_LEVEL'] = '2'  # TensorFlow 경고 메시지 줄이기
 
 from s3_utils import s3_utils
+from client_session import ClientSession
+from result_smoother import SMOOTHING_MODES
+from result_format import DEFAULT_TOP_K, FULL_RESULT_FORMAT, ResultFormat
+from frame_queue import QUEUE_POLICIES, FrameMessage, FrameQueue
+from classification_log import CHANNEL as CLASSIFICATION_LOG_CHANNEL, ClassificationLogHub
+from model_registry import ClassifierModel, ModelRegistry, load_model_info, resolve_model_info_url
+from shared_inference import SHARED_MAX_LABELS, SharedInferenceChannel, SharedInferenceClient, SharedInferenceWorker, SharedModelRegistry
+from process_group import ServerProcessGroup
+from inference_backends import BACKENDS, QUANTIZATION_VARIANTS
+from landmark_protocol import (
+    PROTOCOL_NAME as BINARY_PROTOCOL,
+    SUPPORTED_VERSIONS as BINARY_PROTOCOL_VERSIONS,
+    PackedFrame,
+    decode_frames,
+    message_id as binary_message_id,
+)
+from landmark_preprocessing import (
+    LandmarkValidationError,
+    decode_frame,
+    frame_timestamp,
+)
 
 # 로깅 설정은 main() 함수에서 동적으로 설정됩니다
 logger = logging.getLogger(__name__)
 
+# 리슨 시작 후 stdout에 출력하는 준비 완료 줄 (ModelServerManager가 대기)
+MODEL_SERVER_READY_LINE = "MODEL_SERVER_READY"
+
 class SignClassifierWebSocketServer:
-    def __init__(self, model_info_url, host, port, debug_mode=False, prediction_interval=5, enable_profiling=False, result_buffer_size=15):
-        """수어 분류 WebSocket 서버 초기화 (벡터 데이터 처리용)"""
+    def __init__(self, model_info_url, host, port, debug_mode=False, prediction_interval=5, enable_profiling=False, result_buffer_size=15,
+                 max_batch_size=16, max_batch_wait_ms=5.0, max_queue_depth=256, model_memory_budget_mb=4096,
+                 backend="keras", quantization=None, motion_threshold=0.0, motion_window=10, motion_heartbeat=2.0,
+                 shared_client=None, process_group=None, reuse_port=False, log_queue_size=32, log_max_rate=10.0,
+                 smoothing="mean", smoothing_alpha=None, frame_queue_policy="drop_oldest", max_queued_frames=60,
+                 coalesce_frames=10, sequence_slice_frames=32, client_cpu_budget=0.25, client_cpu_burst=0.5):
+        """수어 분류 WebSocket 서버 초기화 (벡터 데이터 처리용)
+        
+        shared_client가 주어지면 프론트엔드로 동작합니다 - TensorFlow를 초기화하지 않고
+        공유 메모리로 추론 워커에 예측을 요청합니다(shared_inference.py).
+        process_group은 같은 포트를 나눠 쓰는 프로세스 그룹(process_group.py)으로,
+        유휴 종료 판단에 그룹 전체 연결 수를 사용합니다.
+        """
         self.host = host
         self.port = port
         self.clients = set()  # 연결된 클라이언트들
+        # classification_log 모니터링 구독 (subscribe 메시지를 보낸 연결에만 전달)
+        self.classification_log = ClassificationLogHub(log_queue_size, log_max_rate)
         self.debug_mode = debug_mode  # 디버그 모드
         self.enable_profiling = enable_profiling  # 성능 프로파일링 모드
         
@@ -53,632 +95,373 @@ class SignClassifierWebSocketServer:
         # 성능 최적화 설정 (벡터 처리에 최적화)
         self.prediction_interval = prediction_interval  # N개 벡터마다 예측 실행
         self.result_buffer_size = result_buffer_size  # 분류 결과 버퍼 크기 (기본값: 15개 프레임)
+        self.smoothing = smoothing  # 결과 스무딩 방식 (mean: 버퍼 평균, ema: 지수 이동 평균)
+        self.smoothing_alpha = smoothing_alpha  # ema 계수 (None이면 2 / (버퍼 크기 + 1))
+        
+        # 클라이언트별 프레임 입력 큐 (처리가 밀리면 오래된 프레임부터 버림)
+        self.frame_queue_policy = frame_queue_policy  # drop_oldest 또는 coalesce
+        self.max_queued_frames = max_queued_frames  # 큐에 쌓아 둘 최대 프레임 수
+        self.coalesce_frames = coalesce_frames  # coalesce 정책에서 처리할 최신 프레임 수
+        
+        # 클라이언트 간 공정 스케줄링 - 긴 시퀀스는 조각 단위로 처리하고 조각마다 다른 클라이언트에 양보
+        self.sequence_slice_frames = sequence_slice_frames  # 한 번에 처리할 시퀀스 프레임 수
+        self.client_cpu_budget = client_cpu_budget  # 클라이언트별 초당 처리 시간 예산 (초, 0이면 제한 없음)
+        self.client_cpu_burst = client_cpu_burst  # 예산 적립 상한 (초)
+        
+        # 클라이언트 간 마이크로 배칭 설정
+        self.max_batch_size = max_batch_size  # 한 번에 예측할 최대 윈도우 수
+        self.max_batch_wait_ms = max_batch_wait_ms  # 배치를 채우기 위해 기다리는 최대 시간
+        self.max_queue_depth = max_queue_depth  # 대기 가능한 최대 예측 요청 수
+        self.backend = backend  # 추론 백엔드 (keras, tflite, onnx)
+        self.quantization = quantization  # 게시된 양자화 변형 (None, float16, int8)
+        
+        # 모션 게이트 기본값 (기본 비활성화, --motion-threshold나 model_info의 "motion_gate" 항목으로 활성화)
+        self.motion_gate_defaults = {
+            "threshold": motion_threshold,  # 손 평균 절대 속도 기준 (0이면 게이트 비활성화)
+            "window": motion_window,  # 움직임을 판단할 최근 프레임 수
+            "heartbeat_s": motion_heartbeat,  # 정지 중에도 이 간격마다 실제 추론
+            "require_hands": True,  # 손이 보이지 않으면 정지로 간주
+        }
         
         # 성능 통계 추적
         self.performance_stats = {
             'total_vectors': 0,
             'avg_preprocessing_time': 0,
             'avg_prediction_time': 0,
+            'total_predictions': 0,
             'max_processing_time': 0,
-            'bottleneck_component': 'unknown'
+            'bottleneck_component': 'unknown',
+            'gated_predictions': 0,
+            'dropped_frames': 0
         }
         
-        # 모델 정보 로드
-        self.model_info = self.load_model_info(model_info_url)
-        if not self.model_info:
-            raise ValueError("모델 정보를 로드할 수 없습니다.")
-        
-        # 설정값
-        self.MAX_SEQ_LENGTH = self.model_info["input_shape"][0]
-        
-        # 모델 경로 처리 (S3 URL 또는 로컬 경로)
-        model_path = self.model_info["model_path"]
-        
-        # s3://waterandfish-s3/models/ 디렉터리에서 찾기
-        model_path = f"s3://waterandfish-s3/{model_path}"
-        
-        # 먼저 S3에서 시도
-        
-        try:
-            logger.info(f"S3에서 모델 파일 다운로드 중: {model_path}")
-            # S3에서 모델 파일 다운로드
-            self.MODEL_SAVE_PATH = s3_utils.download_file_from_s3(model_path)
-            logger.info(f"S3 모델 파일 다운로드 완료: {self.MODEL_SAVE_PATH}")
-        except Exception as e:
-            logger.warning(f"S3 다운로드 실패, 로컬 경로로 시도: {e}")
-            # 로컬 경로 처리
-            # model_path가 이미 "models/"로 시작하는 경우 중복 방지
-            if model_path.startswith("models/"):
-                # "models/" 부분을 제거하고 파일명만 사용
-                model_filename = model_path[7:]  # "models/" 제거
-                local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "models", model_filename)
-            else:
-                # 그대로 사용
-                local_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "public", "models", model_path)
-            
-            self.MODEL_SAVE_PATH = local_path
-            # self._setup_local_model_path(model_path)
-        
-        self.ACTIONS = self.model_info["labels"]
-        self.QUIZ_LABELS = [a for a in self.ACTIONS if a != "None"]
-        
-        logger.info(f"로드된 라벨: {self.ACTIONS}")
-        logger.info(f"퀴즈 라벨: {self.QUIZ_LABELS}")
-        logger.info(f"원본 모델 경로: {self.model_info['model_path']}")
-        logger.info(f"변환된 모델 경로: {self.MODEL_SAVE_PATH}")
-        logger.info(f"시퀀스 길이: {self.MAX_SEQ_LENGTH}")
-        logger.info(f"성능 설정: 예측 간격={self.prediction_interval}, 결과 버퍼 크기={self.result_buffer_size}")
-        
-        # 모델 파일 존재 확인
-        if not os.path.exists(self.MODEL_SAVE_PATH):
-            logger.error(f"모델 파일을 찾을 수 없습니다: {self.MODEL_SAVE_PATH}")
-            raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {self.MODEL_SAVE_PATH}")
-        logger.info(f"모델 파일 존재 확인: {self.MODEL_SAVE_PATH}")
-        
-        # MediaPipe 관련 초기화 제거 - 프론트엔드에서 처리
-        logger.info("벡터 처리 모드 - MediaPipe는 프론트엔드에서 처리됩니다")
+        # 공유 추론 프론트엔드 (None이면 이 프로세스에서 직접 추론)
+        self.shared_client = shared_client
+        # 멀티 프로세스 모드 (--workers, --frontends)의 프로세스 그룹
+        self.process_group = process_group
+        self.reuse_port = reuse_port  # SO_REUSEPORT로 다른 워커와 같은 포트 공유
         
-        # GPU 메모리 설정 (TensorFlow 초기화 전에 설정)
-        try:
-            gpus = tf.config.experimental.list_physical_devices('GPU')
-            if gpus:
-                # GPU 메모리 증가 허용
-                for gpu in gpus:
-                    tf.config.experimental.set_memory_growth(gpu, True)
-                logger.info(f"GPU 메모리 증가 설정 완료: {len(gpus)}개 GPU")
+        if self.shared_client is None:
+            # GPU 메모리 설정 (TensorFlow 초기화 전에 설정)
+            try:
+                gpus = tf.config.experimental.list_physical_devices('GPU')
+                if gpus:
+                    # GPU 메모리 증가 허용
+                    for gpu in gpus:
+                        tf.config.experimental.set_memory_growth(gpu, True)
+                    logger.info(f"GPU 메모리 증가 설정 완료: {len(gpus)}개 GPU")
                 
-                # GPU 타입 감지 및 메모리 제한 설정
-                try:
-                    # GPU 정보 확인 (NVIDIA A10G = g4.xlarge, NVIDIA A10 = g5.xlarge)
-                    gpu_name = ""
+                    # GPU 타입 감지 및 메모리 제한 설정
                     try:
-                        import subprocess
-                        result = subprocess.run(['nvidia-smi', '--query-gpu=name', '--format=csv,noheader,nounits'], 
-                                              capture_output=True, text=True, timeout=5)
-                        if result.returncode == 0:
-                            gpu_name = result.stdout.strip()
-                    except:
-                        pass
+                        # GPU 정보 확인 (NVIDIA A10G = g4.xlarge, NVIDIA A10 = g5.xlarge)
+                        gpu_name = ""
+                        try:
+                            import subprocess
+                            result = subprocess.run(['nvidia-smi', '--query-gpu=name', '--format=csv,noheader,nounits'], 
+                                                  capture_output=True, text=True, timeout=5)
+                            if result.returncode == 0:
+                                gpu_name = result.stdout.strip()
+                        except:
+                            pass
                     
-                    # GPU 타입에 따른 메모리 제한 설정
-                    if "A10G" in gpu_name:
-                        # g4.xlarge: 16GB VRAM, 14GB로 제한
-                        memory_limit = 14 * 1024
-                        logger.info(f"g4.xlarge 감지됨 (A10G): GPU 메모리 제한 설정: 14GB")
-                    elif "A10" in gpu_name:
-                        # g5.xlarge: 24GB VRAM, 20GB로 제한
-                        memory_limit = 20 * 1024
-                        logger.info(f"g5.xlarge 감지됨 (A10): GPU 메모리 제한 설정: 20GB")
-                    else:
-                        # 기본값: 12GB로 제한
-                        memory_limit = 12 * 1024
-                        logger.info(f"알 수 없는 GPU 타입: 기본 GPU 메모리 제한 설정: 12GB")
+                        # GPU 타입에 따른 메모리 제한 설정
+                        if "A10G" in gpu_name:
+                            # g4.xlarge: 16GB VRAM, 14GB로 제한
+                            memory_limit = 14 * 1024
+                            logger.info(f"g4.xlarge 감지됨 (A10G): GPU 메모리 제한 설정: 14GB")
+                        elif "A10" in gpu_name:
+                            # g5.xlarge: 24GB VRAM, 20GB로 제한
+                            memory_limit = 20 * 1024
+                            logger.info(f"g5.xlarge 감지됨 (A10): GPU 메모리 제한 설정: 20GB")
+                        else:
+                            # 기본값: 12GB로 제한
+                            memory_limit = 12 * 1024
+                            logger.info(f"알 수 없는 GPU 타입: 기본 GPU 메모리 제한 설정: 12GB")
                     
-                    tf.config.set_logical_device_configuration(
-                        gpus[0],
-                        [tf.config.LogicalDeviceConfiguration(memory_limit=memory_limit)]
-                    )
-                    logger.info(f"GPU 메모리 제한 설정 완료: {memory_limit//1024}GB")
-                except Exception as mem_limit_error:
-                    logger.warning(f"GPU 메모리 제한 설정 실패: {mem_limit_error}")
-                    logger.info("기본 GPU 메모리 설정 사용")
-        except Exception as e:
-            logger.warning(f"GPU 메모리 설정 실패: {e}")
-        
-        # 모델 로드
-        try:
-            # Keras 3와 tf-keras 호환성을 위한 모델 로딩
-            model_loaded = False
-            
-            # 방법 1: tf-keras로 시도
-            if not model_loaded:
-                try:
-                    self.model = tf.keras.models.load_model(self.MODEL_SAVE_PATH)
-                    logger.info(f"tf-keras로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
-                    model_loaded = True
-                except Exception as tf_error:
-                    logger.info(f"tf-keras 로딩 실패: {tf_error}")
-            
-            # 방법 2: keras로 시도
-            if not model_loaded:
-                try:
-                    import keras
-                    self.model = keras.models.load_model(self.MODEL_SAVE_PATH)
-                    logger.info(f"keras로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
-                    model_loaded = True
-                except Exception as keras_error:
-                    logger.info(f"keras 로딩 실패: {keras_error}")
-            
-            # 방법 3: tf-keras with compile=False
-            if not model_loaded:
-                try:
-                    self.model = tf.keras.models.load_model(self.MODEL_SAVE_PATH, compile=False)
-                    logger.info(f"tf-keras (compile=False)로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
-                    model_loaded = True
-                except Exception as compile_false_error:
-                    logger.info(f"tf-keras (compile=False) 로딩 실패: {compile_false_error}")
-            
-            # 방법 4: keras with compile=False
-            if not model_loaded:
-                try:
-                    import keras
-                    self.model = keras.models.load_model(self.MODEL_SAVE_PATH, compile=False)
-                    logger.info(f"keras (compile=False)로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
-                    model_loaded = True
-                except Exception as keras_compile_false_error:
-                    logger.info(f"keras (compile=False) 로딩 실패: {keras_compile_false_error}")
-            
-            # 방법 5: custom_objects 없이 시도
-            if not model_loaded:
-                try:
-                    self.model = tf.keras.models.load_model(self.MODEL_SAVE_PATH, custom_objects={})
-                    logger.info(f"tf-keras (custom_objects={{}})로 모델 로드 성공: {self.MODEL_SAVE_PATH}")
-                    model_loaded = True
-                except Exception as custom_objects_error:
-                    logger.info(f"tf-keras (custom_objects={{}}) 로딩 실패: {custom_objects_error}")
-            
-            if not model_loaded:
-                raise Exception("모든 모델 로딩 방법이 실패했습니다.")
-            
-            # TensorFlow 성능 최적화 설정
-            tf.config.optimizer.set_jit(True)  # XLA JIT 컴파일 활성화
-            
-            # TensorFlow 2.x 호환성을 위한 설정
-            # 그래프 모드 대신 tf.function을 사용한 최적화
-            logger.info("TensorFlow 2.x 호환 모드 활성화됨")
-            
-            # 모델을 tf.function으로 최적화
-            try:
-                # 모델을 tf.function으로 래핑하여 성능 최적화
-                @tf.function
-                def optimized_predict(input_data):
-                    return self.model(input_data, training=False)
-                
-                self.model_predict_fn = optimized_predict
-                logger.info("모델을 tf.function으로 최적화 완료")
+                        tf.config.set_logical_device_configuration(
+                            gpus[0],
+                            [tf.config.LogicalDeviceConfiguration(memory_limit=memory_limit)]
+                        )
+                        logger.info(f"GPU 메모리 제한 설정 완료: {memory_limit//1024}GB")
+                    except Exception as mem_limit_error:
+                        logger.warning(f"GPU 메모리 제한 설정 실패: {mem_limit_error}")
+                        logger.info("기본 GPU 메모리 설정 사용")
             except Exception as e:
-                logger.warning(f"tf.function 최적화 실패, 기본 모드 사용: {e}")
-                self.model_predict_fn = None
-            
-            # 모델 warming up (첫 번째 예측 시 느린 속도 방지)
-            try:
-                dummy_input = np.zeros((1, self.MAX_SEQ_LENGTH, 675), dtype=np.float32)
-                if self.model_predict_fn:
-                    _ = self.model_predict_fn(dummy_input)
-                else:
-                    _ = self.model.predict(dummy_input, verbose=0)
-                logger.info("모델 warming up 완료")
-            except Exception as e:
-                logger.warning(f"모델 warming up 실패: {e}")
-            
-            # TensorFlow 프로파일러 초기화 (프로파일링 모드가 활성화된 경우)
-            if self.enable_profiling:
-                # 프로파일 로그 디렉토리 생성
-                os.makedirs(self.profiler_log_dir, exist_ok=True)
-                logger.info(f"TensorFlow 프로파일러 로그 디렉토리: {self.profiler_log_dir}")
-            
-        except Exception as e:
-            logger.error(f"모델 로딩 실패: {e}")
-            raise
-        
-        # 시퀀스 버퍼 (클라이언트별로 관리)
-        self.client_sequences = {}  # {client_id: deque}
+                logger.warning(f"GPU 메모리 설정 실패: {e}")
         
-        # 분류 상태 (클라이언트별로 관리)
-        self.client_states = {}  # {client_id: {prediction, confidence, is_processing}}
+        # TensorFlow 프로파일러 초기화 (프로파일링 모드가 활성화된 경우)
+        if self.enable_profiling:
+            # 프로파일 로그 디렉토리 생성
+            os.makedirs(self.profiler_log_dir, exist_ok=True)
+            logger.info(f"TensorFlow 프로파일러 로그 디렉토리: {self.profiler_log_dir}")
+        
+        # 모델 레지스트리 - 한 프로세스에서 여러 model_info 모델을 호스팅 (지연 로딩 + LRU)
+        self.model_memory_budget_mb = model_memory_budget_mb
+        if self.shared_client is None:
+            # 추론 전용 executor - TensorFlow 연산이 이벤트 루프를 막지 않도록 분리
+            self.inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sign-inference")
+            self.model_registry = ModelRegistry(self.create_model, model_memory_budget_mb * 1024 * 1024)
+        else:
+            # 모델 로딩과 추론은 추론 워커가 담당
+            self.inference_executor = None
+            self.model_registry = SharedModelRegistry(self.shared_client, resolve_model_info_url)
+        
+        # 기본 모델 (--env로 지정된 모델은 항상 로드된 상태 유지)
+        self.default_model = self.model_registry.load(model_info_url, pinned=True)
+        self.model_info = self.default_model.model_info
+        self.MAX_SEQ_LENGTH = self.default_model.MAX_SEQ_LENGTH
+        self.MODEL_SAVE_PATH = self.default_model.MODEL_SAVE_PATH
+        self.ACTIONS = self.default_model.ACTIONS
+        self.QUIZ_LABELS = self.default_model.QUIZ_LABELS
+        logger.info(f"성능 설정: 예측 간격={self.prediction_interval}, 결과 버퍼 크기={self.result_buffer_size}")
         
-        # 벡터 카운터 (클라이언트별)
-        self.client_vector_counters = {}  # {client_id: vector_count}
+        # MediaPipe 관련 초기화 제거 - 프론트엔드에서 처리
+        logger.info("벡터 처리 모드 - MediaPipe는 프론트엔드에서 처리됩니다")
         
-        # 분류 결과 버퍼 (클라이언트별로 관리) - 15개 프레임의 분류 결과를 저장
-        self.client_result_buffers = {}  # {client_id: deque(maxlen=15)}
+        # 클라이언트별 상태(링 버퍼, 카운터, 결과 버퍼, 모델, 진행 중인 예측 등)는
+        # 연결마다 ClientSession 하나로 관리하며 handle_client가 처리 함수에 넘깁니다.
         
         # 분류 통계
         self.classification_count = 0
         self.last_log_time = 0
         self.log_interval = 1.0  # 1초마다 로그 출력 (너무 빈번한 로그 방지)
-        
-        # 시퀀스 관리 (클라이언트별로 관리)
-        self.client_sequence_managers = {}  # {client_id: {last_prediction, same_count}}
     
-    def load_model_info(self, model_info_url):
-        """모델 정보 파일을 로드합니다."""
-        try:
-            # S3 URL인지 확인
-            if model_info_url.startswith('s3://'):
-                logger.info(f"📁 S3에서 모델 정보 파일 다운로드 중: {model_info_url}")
-                
-                # S3에서 파일 다운로드
-                local_path = s3_utils.download_file_from_s3(model_info_url)
-                model_info_url = local_path
-                logger.info(f"✅ S3 파일 다운로드 완료: {local_path}")
-            else:
-                # 로컬 파일 경로 처리
-                # 현재 스크립트 파일의 위치를 기준으로 프로젝트 루트 계산
-                current_dir = os.path.dirname(os.path.abspath(__file__))
-                # src/services에서 프로젝트 루트로 이동 (2단계 상위)
-                project_root = os.path.dirname(os.path.dirname(current_dir))
-                
-                # 파일명만 전달된 경우 public/model-info/ 디렉터리에서 찾기
-                if os.path.basename(model_info_url) == model_info_url:
-                    # 파일명만 전달된 경우
-                    model_info_url = os.path.join("public", "model-info", model_info_url)
-                
-                # 상대 경로인 경우 프로젝트 루트를 기준으로 절대 경로로 변환
-                if not os.path.isabs(model_info_url):
-                    model_info_url = os.path.join(project_root, model_info_url)
-                
-                # 경로 정규화
-                model_info_url = os.path.normpath(model_info_url)
-            
-            logger.info(f"📁 모델 정보 파일 경로: {model_info_url}")
-            
-            # 파일 존재 여부 확인 (S3에서 다운로드한 경우는 이미 존재함)
-            if not model_info_url.startswith('s3://') and not os.path.exists(model_info_url):
-                logger.error(f"❌ 모델 정보 파일을 찾을 수 없습니다: {model_info_url}")
-                return None
-            
-            with open(model_info_url, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"❌ 모델 정보 파일 로드 실패: {e}")
-            return None
+    def get_connection_params(self, connection):
+        """접속 URL의 쿼리 파라미터 (예: ws://host:port/ws?protocol=binary)"""
+        request = getattr(connection, "request", None)
+        path = request.path if request is not None else getattr(connection, "path", "")
+        return {key: values[-1] for key, values in parse_qs(urlparse(path or "").query).items()}
     
-    def get_client_id(self, connection):
-        """클라이언트 ID 생성"""
-        return f"{connection.remote_address[0]}:{connection.remote_address[1]}"
+    def negotiate_protocol(self, session, protocol, version=None):
+        """랜드마크 전송 프로토콜 협상 - 응답 메시지 dict 반환"""
+        if protocol == BINARY_PROTOCOL:
+            version = int(version) if version is not None else max(BINARY_PROTOCOL_VERSIONS)
+            if version not in BINARY_PROTOCOL_VERSIONS:
+                return {
+                    "type": "error",
+                    "message": f"지원하지 않는 바이너리 프로토콜 버전입니다: {version}",
+                    "supported_versions": list(BINARY_PROTOCOL_VERSIONS)
+                }
+            session.protocol = BINARY_PROTOCOL
+            return {"type": "hello_ack", "protocol": BINARY_PROTOCOL, "version": version}
+        session.protocol = "json"
+        return {"type": "hello_ack", "protocol": "json"}
     
-    def initialize_client(self, client_id):
-        """클라이언트 초기화"""
-        if client_id not in self.client_sequences:
-            self.client_sequences[client_id] = deque(maxlen=self.MAX_SEQ_LENGTH)
-            self.client_states[client_id] = {
-                "prediction": "None",
-                "confidence": 0.0,
-                "is_processing": False
-            }
-            self.client_sequence_managers[client_id] = {
-                "last_prediction": None,
-                "same_count": 0
-            }
-            self.client_vector_counters[client_id] = 0
-            # 분류 결과 버퍼 초기화
-            self.client_result_buffers[client_id] = deque(maxlen=self.result_buffer_size)
-        logger.info(f"클라이언트 초기화: {client_id}")
+    def negotiate_result_format(self, session, params):
+        """결과 전송 형식 협상 - hello_ack에 추가할 필드 dict 반환 (잘못된 값이면 ValueError)
+        
+        compact 형식(topk, array)이면 라벨 테이블을 함께 보내고, 이후 결과에는 인덱스만 보냅니다.
+        """
+        change_band = params.get("change_band")
+        result_format = ResultFormat(
+            params.get("results", "full"),
+            int(params.get("top_k", DEFAULT_TOP_K)),
+            float(change_band) if change_band is not None else None
+        )
+        session.result_format = result_format
+        fields = {"results": result_format.name}
+        if result_format.name == "topk":
+            fields["top_k"] = result_format.top_k
+        if result_format.change_band is not None:
+            fields["change_band"] = result_format.change_band
+        if result_format.compact:
+            fields["labels"] = list(session.model.ACTIONS)
+        return fields
     
-    def cleanup_client(self, client_id):
-        """클라이언트 정리"""
-        if client_id in self.client_sequences:
-            del self.client_sequences[client_id]
-        if client_id in self.client_states:
-            del self.client_states[client_id]
-        if client_id in self.client_sequence_managers:
-            del self.client_sequence_managers[client_id]
-        if client_id in self.client_vector_counters:
-            del self.client_vector_counters[client_id]
-        if client_id in self.client_result_buffers:
-            del self.client_result_buffers[client_id]
-        
-        # 벡터 처리 모드에서는 별도 정리 작업 없음
+    def negotiate_hello(self, session, params):
+        """hello 메시지(또는 접속 URL 파라미터)로 프로토콜과 결과 형식 협상 - 응답 dict 반환"""
+        response = self.negotiate_protocol(session, params.get("protocol", "json"), params.get("version"))
+        if response["type"] == "error":
+            return response
+        try:
+            response.update(self.negotiate_result_format(session, params))
+        except (TypeError, ValueError) as e:
+            return {"type": "error", "code": "invalid_result_format", "message": f"잘못된 결과 형식 요청: {e}"}
+        response["model"] = session.model.model_info_url
+        return response
+    
+    def create_model(self, model_info_url):
+        """레지스트리용 모델 팩토리 - 공유 추론 executor와 배치 설정으로 모델 로드"""
+        model = ClassifierModel(
+            model_info_url,
+            executor=self.inference_executor,
+            max_batch_size=self.max_batch_size,
+            max_batch_wait_ms=self.max_batch_wait_ms,
+            max_queue_depth=self.max_queue_depth,
+            backend=self.backend,
+            quantization=self.quantization
+        )
+        model.motion_gate = {**self.motion_gate_defaults, **model.model_info.get("motion_gate", {})}
+        logger.info(f"모션 게이트 설정: {model.motion_gate}")
+        return model
+    
+    def should_gate_inference(self, session, has_result, now):
+        """모션 게이트 - 움직임이 없어 추론을 건너뛰고 마지막 평균 결과를 재사용할지 판단
         
-        logger.info(f"클라이언트 정리: {client_id}")
+        재사용할 결과가 없거나 heartbeat 간격이 지났으면 항상 추론합니다.
+        """
+        gate = session.model.motion_gate
+        if gate["threshold"] <= 0 or not has_result:
+            return False
+        if now - session.last_inference_time >= gate["heartbeat_s"]:
+            return False
+        sequence_buffer = session.sequence
+        if gate["require_hands"] and not sequence_buffer.hands_present(gate["window"]):
+            return True
+        return sequence_buffer.motion_score(gate["window"]) < gate["threshold"]
     
-    def validate_landmarks_data(self, landmarks_data):
-        """랜드마크 데이터 유효성 검사"""
+    def reuse_last_result(self, session):
+        """게이트된 예측 - 마지막 평균 결과를 담은 완료된 Future 반환"""
+        self.performance_stats['gated_predictions'] += 1
+        session.gated_predictions += 1
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(session.last_result)
+        return future
+    
+    async def select_client_model(self, session, model_info_url):
+        """클라이언트가 사용할 모델 선택 - 모델이 바뀌면 시퀀스와 결과 버퍼를 초기화"""
+        model_key = resolve_model_info_url(model_info_url)
+        if session.model is not None and session.model.model_info_url == model_key:
+            return session.model
+        
+        model = await self.model_registry.acquire(model_key)
+        if session.model is None:
+            # 로딩 중에 연결이 끊긴 경우
+            self.model_registry.release(model)
+            return None
+        self.model_registry.release(session.model)
+        session.switch_model(model)
+        logger.info(f"[{session.client_id}] 모델 변경: {model_key}")
+        return model
+    
+    async def apply_model_selection(self, websocket, session, model_info_url):
+        """요청된 모델로 전환 - 실패하면 에러를 보내고 현재 모델을 유지"""
         try:
-            # 필수 키 확인
-            required_keys = ["pose", "left_hand", "right_hand"]
-            for key in required_keys:
-                if key not in landmarks_data:
-                    logger.warning(f"누락된 랜드마크 키: {key}")
-                    return False
-            
-            # 데이터 형식 확인
-            for key in required_keys:
-                data = landmarks_data[key]
-                if data is not None:
-                    # 리스트 형태인지 확인
-                    if not isinstance(data, list):
-                        logger.warning(f"잘못된 데이터 형식 - {key}: 리스트가 아님")
-                        return False
-                    
-                    # 각 랜드마크가 3차원 좌표인지 확인
-                    for i, landmark in enumerate(data):
-                        if not isinstance(landmark, list) or len(landmark) != 3:
-                            logger.warning(f"잘못된 랜드마크 형식 - {key}[{i}]: 3차원 좌표가 아님")
-                            return False
-            
+            previous = session.model
+            model = await self.select_client_model(session, model_info_url)
+            if model is not None and model is not previous and session.result_format.compact:
+                # compact 형식 클라이언트에는 바뀐 모델의 라벨 테이블을 한 번 전송
+                await websocket.send(json.dumps({
+                    "type": "labels",
+                    "model": model.model_info_url,
+                    "labels": list(model.ACTIONS)
+                }))
             return True
-            
         except Exception as e:
-            logger.error(f"랜드마크 데이터 검증 실패: {e}")
+            logger.error(f"[{session.client_id}] 모델 로드 실패 ({model_info_url}): {e}")
+            await websocket.send(json.dumps({
+                "type": "error",
+                "message": f"모델을 로드할 수 없습니다: {model_info_url}"
+            }))
             return False
     
-    def normalize_sequence_length(self, sequence, target_length=30):
-        """시퀀스 길이를 정규화"""
-        current_length = len(sequence)
-        if current_length == target_length:
-            return sequence
-        x_old = np.linspace(0, 1, current_length)
-        x_new = np.linspace(0, 1, target_length)
-        normalized_sequence = []
-        for i in range(sequence.shape[1]):
-            f = np.interp(x_new, x_old, sequence[:, i])
-            normalized_sequence.append(f)
-        return np.array(normalized_sequence).T
+    def initialize_client(self, websocket):
+        """클라이언트 세션 생성 (기본 모델로 시작)"""
+        session = ClientSession(
+            websocket.remote_address, self.default_model, self.result_buffer_size, self.smoothing, self.smoothing_alpha,
+            FrameQueue(self.frame_queue_policy, self.max_queued_frames, self.coalesce_frames)
+        )
+        self.model_registry.retain(self.default_model)
+        logger.info(f"클라이언트 초기화: {session.client_id}")
+        return session
     
-    def extract_dynamic_features(self, sequence):
-        """동적 특성 추출 (성능 프로파일링 포함)"""
-        start_time = time.time()
-        
-        velocity_start = time.time()
-        velocity = np.diff(sequence, axis=0, prepend=sequence[0:1])
-        velocity_time = time.time() - velocity_start
-        
-        acceleration_start = time.time()
-        acceleration = np.diff(velocity, axis=0, prepend=velocity[0:1])
-        acceleration_time = time.time() - acceleration_start
-        
-        concat_start = time.time()
-        dynamic_features = np.concatenate([sequence, velocity, acceleration], axis=1)
-        concat_time = time.time() - concat_start
-        
-        total_time = time.time() - start_time
+    def cleanup_client(self, session):
+        """클라이언트 정리"""
+        session.cancel_inflight()
+        if session.log_subscription is not None:
+            self.classification_log.unsubscribe(session.log_subscription)
+            session.log_subscription = None
+        if session.model is not None:
+            self.model_registry.release(session.model)
+            session.model = None
         
-        # 성능 프로파일링 출력 (10ms 이상 걸리는 경우만)
-        if self.enable_profiling and total_time > 0.01:
-            logger.info(f"동적특성 추출 성능:")
-            logger.info(f"   전체: {total_time*1000:.1f}ms")
-            logger.info(f"   속도계산: {velocity_time*1000:.1f}ms")
-            logger.info(f"   가속도계산: {acceleration_time*1000:.1f}ms")
-            logger.info(f"   결합: {concat_time*1000:.1f}ms")
+        # 벡터 처리 모드에서는 별도 정리 작업 없음
         
-        return dynamic_features
+        queue_stats = session.frame_queue.stats()
+        self.performance_stats['dropped_frames'] += queue_stats['dropped_frames']
+        logger.info(
+            f"클라이언트 정리: {session.client_id} "
+            f"(접속 {time.time() - session.connected_at:.0f}초, 벡터 {session.vector_count}개, "
+            f"예측 {session.predictions}회, 게이트 {session.gated_predictions}회, "
+            f"버린 프레임 {queue_stats['dropped_frames']}개, 최대 큐 깊이 {queue_stats['max_queue_depth']}, "
+            f"처리 시간 {session.service_time * 1000:.0f}ms)"
+        )
     
-    def convert_to_relative_coordinates(self, landmarks_list):
-        """상대 좌표로 변환 (성능 프로파일링 포함)"""
-        start_time = time.time()
-        
-        relative_landmarks = []
-        shoulder_calc_time = 0
-        pose_calc_time = 0
-        hand_calc_time = 0
-        
-        for frame in landmarks_list:
-            if not frame["pose"]:
-                relative_landmarks.append(frame)
-                continue
-            
-            # 어깨 중심점 계산
-            shoulder_start = time.time()
-            pose_landmarks = frame["pose"]
-            
-            # MediaPipe 객체인지 리스트인지 확인
-            if hasattr(pose_landmarks, 'landmark'):
-                # MediaPipe 객체인 경우 (기존 방식)
-                left_shoulder = pose_landmarks.landmark[11]
-                right_shoulder = pose_landmarks.landmark[12]
-                shoulder_center_x = (left_shoulder.x + right_shoulder.x) / 2
-                shoulder_center_y = (left_shoulder.y + right_shoulder.y) / 2
-                shoulder_center_z = (left_shoulder.z + right_shoulder.z) / 2
-                shoulder_width = abs(right_shoulder.x - left_shoulder.x)
-            else:
-                # 리스트인 경우 (프론트엔드에서 전송된 데이터)
-                left_shoulder = pose_landmarks[11]  # [x, y, z]
-                right_shoulder = pose_landmarks[12]  # [x, y, z]
-                shoulder_center_x = (left_shoulder[0] + right_shoulder[0]) / 2
-                shoulder_center_y = (left_shoulder[1] + right_shoulder[1]) / 2
-                shoulder_center_z = (left_shoulder[2] + right_shoulder[2]) / 2
-                shoulder_width = abs(right_shoulder[0] - left_shoulder[0])
-            
-            if shoulder_width == 0:
-                shoulder_width = 1.0
-            shoulder_calc_time += time.time() - shoulder_start
-            
-            new_frame = {}
-            
-            # 포즈 랜드마크 처리
-            if frame["pose"]:
-                pose_start = time.time()
-                relative_pose = []
-                
-                if hasattr(pose_landmarks, 'landmark'):
-                    # MediaPipe 객체인 경우
-                    for landmark in pose_landmarks.landmark:
-                        rel_x = (landmark.x - shoulder_center_x) / shoulder_width
-                        rel_y = (landmark.y - shoulder_center_y) / shoulder_width
-                        rel_z = (landmark.z - shoulder_center_z) / shoulder_width
-                        relative_pose.append([rel_x, rel_y, rel_z])
-                else:
-                    # 리스트인 경우
-                    for landmark in pose_landmarks:
-                        rel_x = (landmark[0] - shoulder_center_x) / shoulder_width
-                        rel_y = (landmark[1] - shoulder_center_y) / shoulder_width
-                        rel_z = (landmark[2] - shoulder_center_z) / shoulder_width
-                        relative_pose.append([rel_x, rel_y, rel_z])
-                
-                new_frame["pose"] = relative_pose
-                pose_calc_time += time.time() - pose_start
-            
-            # 손 랜드마크 처리
-            hand_start = time.time()
-            for hand_key in ["left_hand", "right_hand"]:
-                if frame[hand_key]:
-                    relative_hand = []
-                    hand_landmarks = frame[hand_key]
-                    
-                    if hasattr(hand_landmarks, 'landmark'):
-                        # MediaPipe 객체인 경우
-                        for landmark in hand_landmarks.landmark:
-                            rel_x = (landmark.x - shoulder_center_x) / shoulder_width
-                            rel_y = (landmark.y - shoulder_center_y) / shoulder_width
-                            rel_z = (landmark.z - shoulder_center_z) / shoulder_width
-                            relative_hand.append([rel_x, rel_y, rel_z])
-                    else:
-                        # 리스트인 경우
-                        for landmark in hand_landmarks:
-                            rel_x = (landmark[0] - shoulder_center_x) / shoulder_width
-                            rel_y = (landmark[1] - shoulder_center_y) / shoulder_width
-                            rel_z = (landmark[2] - shoulder_center_z) / shoulder_width
-                            relative_hand.append([rel_x, rel_y, rel_z])
-                    
-                    new_frame[hand_key] = relative_hand
-                else:
-                    new_frame[hand_key] = None
-            hand_calc_time += time.time() - hand_start
-            
-            relative_landmarks.append(new_frame)
-        
-        total_time = time.time() - start_time
-        
-        # 성능 프로파일링 출력 (20ms 이상 걸리는 경우만)
-        if self.enable_profiling and total_time > 0.02:
-            logger.info(f"상대좌표 변환 성능:")
-            logger.info(f"   전체: {total_time*1000:.1f}ms")
-            logger.info(f"   어깨계산: {shoulder_calc_time*1000:.1f}ms")
-            logger.info(f"   포즈계산: {pose_calc_time*1000:.1f}ms")
-            logger.info(f"   손계산: {hand_calc_time*1000:.1f}ms")
-        
-        return relative_landmarks
+    def validate_landmarks_data(self, landmarks_data):
+        """랜드마크 프레임 검증 - 부위별 float32 배열 튜플 반환, 잘못된 프레임은 LandmarkValidationError"""
+        return decode_frame(landmarks_data)
     
-    def improved_preprocess_landmarks(self, landmarks_list):
-        """랜드마크 전처리 (성능 프로파일링 포함)"""
+    def preprocess_client_window(self, session):
+        """클라이언트 윈도우의 모델 입력 생성 (프레임별 특성은 수신 시점에 이미 계산됨)"""
         start_time = time.time()
-        
-        if not landmarks_list:
-            return np.zeros((self.MAX_SEQ_LENGTH, 675))
-        
-        # 1. 상대 좌표 변환
-        relative_start = time.time()
-        relative_landmarks = self.convert_to_relative_coordinates(landmarks_list)
-        relative_time = time.time() - relative_start
-        
-        # 2. 프레임 처리
-        processing_start = time.time()
-        processed_frames = []
-        for frame in relative_landmarks:
-            combined = []
-            for key in ["pose", "left_hand", "right_hand"]:
-                if frame[key]:
-                    if isinstance(frame[key], list):
-                        # 이미 리스트 형태인 경우 (프론트엔드에서 전송된 데이터)
-                        combined.extend(frame[key])
-                    else:
-                        # MediaPipe 객체인 경우
-                        combined.extend([[l.x, l.y, l.z] for l in frame[key].landmark])
-                else:
-                    num_points = {"pose": 33, "left_hand": 21, "right_hand": 21}[key]
-                    combined.extend([[0, 0, 0]] * num_points)
-            if combined:
-                processed_frames.append(np.array(combined).flatten())
-            else:
-                processed_frames.append(np.zeros(75 * 3))
-        processing_time = time.time() - processing_start
-        
-        if not processed_frames:
-            return np.zeros((self.MAX_SEQ_LENGTH, 675))
-        
-        # 3. 시퀀스 길이 정규화
-        normalize_start = time.time()
-        sequence = np.array(processed_frames)
-        if len(sequence) != self.MAX_SEQ_LENGTH:
-            sequence = self.normalize_sequence_length(sequence, self.MAX_SEQ_LENGTH)
-        normalize_time = time.time() - normalize_start
-        
-        # 4. 동적 특성 추출
-        dynamic_start = time.time()
-        sequence = self.extract_dynamic_features(sequence)
-        dynamic_time = time.time() - dynamic_start
-        
+        sequence = session.sequence.model_input()
         total_time = time.time() - start_time
         
-        # 성능 프로파일링 출력 (50ms 이상 걸리는 경우만)
         if self.enable_profiling and total_time > 0.05:
-            logger.info(f"랜드마크 전처리 성능:")
-            logger.info(f"   전체: {total_time*1000:.1f}ms")
-            logger.info(f"   상대좌표: {relative_time*1000:.1f}ms")
-            logger.info(f"   프레임처리: {processing_time*1000:.1f}ms")
-            logger.info(f"   정규화: {normalize_time*1000:.1f}ms")
-            logger.info(f"   동적특성: {dynamic_time*1000:.1f}ms")
+            logger.info(f"윈도우 전처리 성능: {total_time*1000:.1f}ms")
         
         return sequence
     
-    def add_result_to_buffer(self, result, client_id):
-        """분류 결과를 버퍼에 추가"""
-        self.client_result_buffers[client_id].append(result)
+    def add_result_to_buffer(self, pred_probs, session):
+        """예측 확률 벡터를 결과 버퍼에 반영하고 스무딩된 확률 배열 반환 (O(라벨 수))"""
+        return session.result_smoother.add(pred_probs)
     
-    def calculate_averaged_result(self, client_id):
-        """버퍼의 분류 결과들의 평균을 계산"""
-        buffer = self.client_result_buffers[client_id]
-        if not buffer:
-            return None
-        
-        # 모든 라벨에 대한 확률 합계 초기화
-        total_probabilities = {}
-        for label in self.ACTIONS:
-            total_probabilities[label] = 0.0
-        
-        # 버퍼의 모든 결과에서 확률 합계 계산
-        for result in buffer:
-            for label, prob in result['probabilities'].items():
-                total_probabilities[label] += prob
-        
-        # 평균 확률 계산
-        buffer_size = len(buffer)
-        avg_probabilities = {}
-        for label in self.ACTIONS:
-            avg_probabilities[label] = total_probabilities[label] / buffer_size
-        
-        # 평균 확률이 가장 높은 라벨 찾기
-        best_label = max(avg_probabilities, key=avg_probabilities.get)
-        best_confidence = avg_probabilities[best_label]
-        
-        # 평균 결과 생성
-        averaged_result = {
-            "prediction": best_label,
-            "confidence": best_confidence,
-            "probabilities": avg_probabilities,
-            "buffer_size": buffer_size  # 디버깅용 정보
+    def calculate_averaged_result(self, session, avg_probs):
+        """스무딩된 확률 배열로 평균 결과 생성 - 전송 형식(ResultFormat)으로의 변환은 전송 시점에 수행
+
+        전송 전에 모델이 바뀔 수 있으므로 예측한 모델을 결과에 함께 담습니다 (라벨 테이블 기준).
+        """
+        best_idx = int(np.argmax(avg_probs))
+        return {
+            "model": session.model,
+            "prediction": session.model.ACTIONS[best_idx],
+            "index": best_idx,
+            "confidence": float(avg_probs[best_idx]),
+            "scores": avg_probs,
+            "buffer_size": len(session.result_smoother)
         }
-        
-        return averaged_result
     
-    def log_classification_result(self, result, client_id):
-        """분류 결과를 로그로 출력"""
+    def log_classification_result(self, result, session):
+        """분류 결과를 로그로 출력하고 classification_log 구독자에게 발행"""
+        client_id = session.client_id
         current_time = asyncio.get_event_loop().time()
+        if self.classification_log.subscriptions:
+            # 모니터링 구독자가 있을 때만 라벨 dict 형식으로 변환
+            self.classification_log.publish(
+                FULL_RESULT_FORMAT.format(result, result["model"].ACTIONS), client_id, current_time
+            )
         
         # 로그 출력 주기 제한 (너무 빈번한 로그 방지)
         if current_time - self.last_log_time >= self.log_interval:
             # 디버그 모드에서 버퍼 정보 출력
-            if self.debug_mode and 'buffer_size' in result:
+            if self.debug_mode:
                 logger.info(f"[{client_id}] 예측: {result['prediction']} (신뢰도: {result['confidence']:.3f}, 버퍼크기: {result['buffer_size']})")
             else:
                 logger.info(f"[{client_id}] 예측: {result['prediction']} (신뢰도: {result['confidence']:.3f})")
-
-            message = json.dumps({
-                "type": "classification_log",
-                "data": result,
-                "client_id": client_id,
-                "timestamp": asyncio.get_event_loop().time()
-            })
-            for ws in list(self.clients):
-                asyncio.create_task(ws.send(message))
-
             self.last_log_time = current_time
         
         # 분류 횟수 증가
         self.classification_count += 1
     
-    def process_landmarks(self, landmarks_data, client_id):
-        """랜드마크 벡터 처리 및 분류 (성능 최적화 + 프로파일링)"""
+    def process_landmarks(self, landmarks_data, session, timestamp=None):
+        """랜드마크 벡터 처리 및 분류 요청 (성능 최적화 + 프로파일링)
+
+        프레임 수집과 전처리는 즉시 수행하고, 예측이 필요한 경우 추론 executor에서
+        실행되는 in-flight Future를 반환합니다 (결과: 평균 결과 dict 또는 None).
+        timestamp는 프레임에 timestamp가 없을 때 사용하는 메시지 timestamp입니다.
+        """
         process_start_time = time.time()
         
+        # 1. 랜드마크 데이터 유효성 검사 (잘못된 프레임은 카운트 전에 오류 코드와 함께 거부)
+        if not isinstance(landmarks_data, PackedFrame):
+            parts = self.validate_landmarks_data(landmarks_data)
+        
         # 벡터 카운터 증가
-        self.client_vector_counters[client_id] += 1
-        vector_count = self.client_vector_counters[client_id]
+        session.vector_count += 1
+        vector_count = session.vector_count
         
         # TensorFlow 프로파일러 시작 (프로파일링 모드가 활성화된 경우)
-        if self.enable_profiling and not self.profiler_started:
+        if self.enable_profiling and not self.profiler_started and self.shared_client is None:
             try:
                 tf.profiler.experimental.start(self.profiler_log_dir)
                 self.profiler_started = True
@@ -686,145 +469,65 @@ class SignClassifierWebSocketServer:
             except Exception as e:
                 logger.warning(f"TensorFlow 프로파일러 시작 실패: {e}")
         
-        # 이미 처리 중인 경우 스킵
-        if self.client_states[client_id]["is_processing"]:
-            return None
-        
-        self.client_states[client_id]["is_processing"] = True
-        
         # 성능 측정 변수들
         preprocessing_time = 0
-        prediction_time = 0
         
         try:
-            # 1. 랜드마크 데이터 유효성 검사
-            if not self.validate_landmarks_data(landmarks_data):
-                logger.warning(f"[{client_id}] 잘못된 랜드마크 데이터")
-                return None
-            
-            # 2. 랜드마크 데이터 수집
-            landmarks_list = []
-            landmarks_list.append({
-                "pose": landmarks_data["pose"],
-                "left_hand": landmarks_data["left_hand"],
-                "right_hand": landmarks_data["right_hand"]
-            })
-            
-            # 시퀀스에 추가
-            self.client_sequences[client_id].extend(landmarks_list)
+            sequence_buffer = session.sequence
+            if isinstance(landmarks_data, PackedFrame):
+                # 바이너리 프레임: 디코딩 단계에서 형식 검증 완료, 좌표 view를 버퍼에 직접 기록
+                sequence_buffer.append_packed(landmarks_data.presence, landmarks_data.coords)
+            else:
+                # 2. 검증된 랜드마크 배열을 클라이언트 링 버퍼에 직접 기록 (timestamp는 불규칙한 프레임 간격 보정용)
+                sequence_buffer.append_parts(parts, frame_timestamp(landmarks_data, timestamp))
             
             # 3. 예측 실행 빈도 제한 (성능 향상)
             should_predict = (
-                len(self.client_sequences[client_id]) >= self.MAX_SEQ_LENGTH and
+                sequence_buffer.is_full() and
                 vector_count % self.prediction_interval == 0
             )
             
-            # should_predict = False
+            # 이전 예측이 아직 진행 중이면 이번 예측은 스킵 (프레임은 계속 수집)
+            inflight = session.inflight
+            if should_predict and inflight is not None and not inflight.done():
+                should_predict = False
             
-            result = None
-            if should_predict:
+            pending = None
+            if should_predict and self.should_gate_inference(
+                session, session.last_result is not None, process_start_time
+            ):
+                # 움직임이 없으면 추론 없이 마지막 평균 결과 재사용
+                pending = self.reuse_last_result(session)
+            elif should_predict:
                 # 4. 랜드마크 전처리 (예측할 때만)
                 preprocessing_start = time.time()
-                sequence = self.improved_preprocess_landmarks(list(self.client_sequences[client_id]))
+                sequence = self.preprocess_client_window(session)
                 preprocessing_time = time.time() - preprocessing_start
                 
-                # 5. 모델 예측 (그래프 모드 사용)
-                prediction_start = time.time()
-                
-                # 최적화된 함수가 있으면 사용, 없으면 기본 모드 사용
-                if hasattr(self, 'model_predict_fn') and self.model_predict_fn is not None:
-                    # tf.function으로 최적화된 예측
-                    try:
-                        input_tensor = tf.convert_to_tensor(sequence.reshape(1, *sequence.shape), dtype=tf.float32)
-                        pred_probs = self.model_predict_fn(input_tensor)
-                        # Tensor를 numpy로 안전하게 변환
-                        if hasattr(pred_probs, 'numpy'):
-                            pred_probs = pred_probs.numpy()
-                        else:
-                            pred_probs = np.array(pred_probs)
-                    except Exception as e:
-                        logger.warning(f"최적화된 예측 실패, 기본 모드로 전환: {e}")
-                        pred_probs = self.model.predict(sequence.reshape(1, *sequence.shape), verbose=0)
-                else:
-                    # 기본 모드로 예측
-                    pred_probs = self.model.predict(sequence.reshape(1, *sequence.shape), verbose=0)
-                
-                pred_idx = np.argmax(pred_probs[0])
-                pred_label = self.ACTIONS[pred_idx]
-                confidence = float(pred_probs[0][pred_idx])
-                prediction_time = time.time() - prediction_start
-                
-                # 결과 생성
-                result = {
-                    "prediction": pred_label,
-                    "confidence": confidence,
-                    "probabilities": {label: float(prob) for label, prob in zip(self.ACTIONS, pred_probs[0])}
-                }
-                
-                # 분류 결과를 버퍼에 추가
-                self.add_result_to_buffer(result, client_id)
-                
-                # 버퍼의 평균 결과 계산
-                averaged_result = self.calculate_averaged_result(client_id)
-                
-                # 클라이언트 상태 업데이트 (평균 결과 기준)
-                if averaged_result:
-                    self.client_states[client_id]["prediction"] = averaged_result["prediction"]
-                    self.client_states[client_id]["confidence"] = averaged_result["confidence"]
-                    
-                    # 평균 결과를 로그로 출력
-                    self.log_classification_result(averaged_result, client_id)
-                    
-                    # 평균 결과 반환
-                    result = averaged_result
-            
-            # 성능 프로파일링 출력
-            total_time = time.time() - process_start_time
+                # 5. 모델 예측은 추론 executor에서 비동기로 실행
+                pending = asyncio.ensure_future(self.run_prediction(session, sequence))
+                session.inflight = pending
+                session.last_inference_time = process_start_time
             
             # 성능 통계 업데이트
+            total_time = time.time() - process_start_time
             self.performance_stats['total_vectors'] += 1
             if preprocessing_time > 0:
                 self.performance_stats['avg_preprocessing_time'] = (
                     (self.performance_stats['avg_preprocessing_time'] * (self.performance_stats['total_vectors'] - 1) + preprocessing_time) /
                     self.performance_stats['total_vectors']
                 )
-            if prediction_time > 0:
-                self.performance_stats['avg_prediction_time'] = (
-                    (self.performance_stats['avg_prediction_time'] * (self.performance_stats['total_vectors'] - 1) + prediction_time) /
-                    self.performance_stats['total_vectors']
-                )
-            if total_time > self.performance_stats['max_processing_time']:
-                self.performance_stats['max_processing_time'] = total_time
-                # 병목 컴포넌트 식별
-                times = {
-                    'preprocessing': preprocessing_time,
-                    'prediction': prediction_time,
-                }
-                self.performance_stats['bottleneck_component'] = max(times, key=times.get)
-            
-            # 성능 프로파일링 출력 (프로파일링 모드가 활성화된 경우)
-            if self.enable_profiling and total_time > 0.05:  # 50ms 이상 걸리는 경우만 로그
-                logger.info(f"[{client_id}] 프레임 #{self.performance_stats['total_vectors']}: {total_time*1000:.1f}ms (전처리:{preprocessing_time*1000:.1f}ms, 예측:{prediction_time*1000:.1f}ms)")
-                # 100프레임마다 성능 요약 출력
-                if self.performance_stats['total_vectors'] % 100 == 0:
-                    logger.info(f"성능 요약 (100벡터 평균):")
-                    logger.info(f"   평균 전처리: {self.performance_stats['avg_preprocessing_time']*1000:.1f}ms")
-                    logger.info(f"   평균 예측: {self.performance_stats['avg_prediction_time']*1000:.1f}ms")
-                    logger.info(f"   최대 프레임 시간: {self.performance_stats['max_processing_time']*1000:.1f}ms")
-                    logger.info(f"   주요 병목: {self.performance_stats['bottleneck_component']}")
             
             # 디버그 모드에서는 간단한 성능 정보만 출력
-            elif self.debug_mode and total_time > 0.1:  # 100ms 이상 걸리는 경우만 로그
-                logger.info(f"[{client_id}] 느린 벡터 감지: {total_time*1000:.1f}ms")
+            if self.debug_mode and total_time > 0.1:  # 100ms 이상 걸리는 경우만 로그
+                logger.info(f"[{session.client_id}] 느린 벡터 감지: {total_time*1000:.1f}ms")
             
-            return result
+            return pending
                 
         except Exception as e:
             logger.error(f"예측 실패: {e}")
             return None
         finally:
-            self.client_states[client_id]["is_processing"] = False
-            
             # TensorFlow 프로파일러 정지 (프로파일링 모드가 활성화된 경우)
             if self.enable_profiling and self.profiler_started and vector_count % 100 == 0:
                 try:
@@ -834,12 +537,347 @@ class SignClassifierWebSocketServer:
                 except Exception as e:
                     logger.warning(f"TensorFlow 프로파일러 정지 실패: {e}")
     
+    def finalize_prediction(self, session, pred_probs):
+        """한 윈도우의 예측 확률을 결과 버퍼에 반영하고 평균 결과 반환"""
+        # 분류 결과를 버퍼에 추가하고 스무딩된 확률로 평균 결과 생성
+        avg_probs = self.add_result_to_buffer(pred_probs, session)
+        result = self.calculate_averaged_result(session, avg_probs)
+        
+        # 클라이언트 상태 업데이트 (평균 결과 기준)
+        session.prediction = result["prediction"]
+        session.confidence = result["confidence"]
+        
+        # 평균 결과를 로그로 출력
+        self.log_classification_result(result, session)
+        session.last_result = result
+        session.predictions += 1
+        
+        return result
+    
+    async def run_prediction(self, session, sequence):
+        """전처리된 윈도우를 배치 스케줄러에 제출하고 평균 결과를 계산"""
+        results = await self.run_batch_prediction(session, sequence[None])
+        return results[0] if results else None
+    
+    async def run_batch_prediction(self, session, windows):
+        """(K, T, 675) 윈도우 묶음을 한 배치로 예측하고 윈도우별 평균 결과 리스트 반환"""
+        prediction_start = time.time()
+        model = session.model
+        try:
+            # 다른 클라이언트 요청과 함께 추론 executor에서 배치로 실행
+            try:
+                pred_probs = await model.inference_scheduler.submit_many(windows, account=session)
+            except asyncio.QueueFull:
+                logger.warning(f"[{session.client_id}] 추론 대기열이 가득 차 예측을 건너뜁니다")
+                return None
+            if session.model is not model:
+                # 예측 중 모델이 바뀜 - 스무딩 상태가 새 모델 기준으로 초기화되었으므로 반영하지 않음
+                return None
+            
+            # 윈도우 순서대로 결과 버퍼에 반영
+            results = [self.finalize_prediction(session, row) for row in pred_probs]
+            prediction_time = time.time() - prediction_start
+            
+            # 성능 통계 업데이트
+            stats = self.performance_stats
+            stats['total_predictions'] += len(results)
+            stats['avg_prediction_time'] += len(results) * (prediction_time / len(results) - stats['avg_prediction_time']) / stats['total_predictions']
+            if prediction_time > stats['max_processing_time']:
+                stats['max_processing_time'] = prediction_time
+                # 병목 컴포넌트 식별
+                times = {
+                    'preprocessing': stats['avg_preprocessing_time'],
+                    'prediction': stats['avg_prediction_time'],
+                }
+                stats['bottleneck_component'] = max(times, key=times.get)
+            
+            # 성능 프로파일링 출력 (프로파일링 모드가 활성화된 경우)
+            if self.enable_profiling and prediction_time > 0.05:  # 50ms 이상 걸리는 경우만 로그
+                logger.info(f"[{session.client_id}] 예측 #{stats['total_predictions']}: {prediction_time*1000:.1f}ms (윈도우 {len(results)}개, 배치 대기 포함)")
+                # 100회 예측마다 성능 요약 출력
+                if stats['total_predictions'] % 100 < len(results):
+                    logger.info(f"성능 요약 (평균):")
+                    logger.info(f"   평균 전처리: {stats['avg_preprocessing_time']*1000:.1f}ms")
+                    logger.info(f"   평균 예측: {stats['avg_prediction_time']*1000:.1f}ms")
+                    logger.info(f"   최대 예측 시간: {stats['max_processing_time']*1000:.1f}ms")
+                    logger.info(f"   주요 병목: {stats['bottleneck_component']}")
+                    logger.info(f"   tf.function 재추적: {session.model.retrace_count}회")
+            
+            return results
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"예측 실패: {e}")
+            return None
+    
+    def validate_sequence(self, frames):
+        """시퀀스 프레임 검증 - 잘못된 프레임이 하나라도 있으면 버퍼에 기록하기 전에 묶음 전체를 거부
+
+        (검증된 프레임, 프레임 timestamp) 리스트를 반환합니다. 바이너리 메시지(PackedFrame)는
+        decode_frames에서 이미 검증되어 그대로 반환합니다 (timestamp 없음).
+        """
+        decoded = []
+        for i, landmarks_data in enumerate(frames):
+            if isinstance(landmarks_data, PackedFrame):
+                decoded.append((landmarks_data, None))
+                continue
+            try:
+                decoded.append((self.validate_landmarks_data(landmarks_data), frame_timestamp(landmarks_data)))
+            except LandmarkValidationError as e:
+                raise LandmarkValidationError(f"시퀀스 프레임 {i}: {e}", e.code) from e
+        return decoded
+    
+    def process_landmarks_sequence(self, decoded, session, offset=0):
+        """검증된 프레임 묶음을 한 번에 버퍼에 기록하고, 묶음 안의 예측 지점만 한 배치로 예측
+
+        프레임별 process_landmarks 호출 대신 수집만 연속으로 수행하고, 예측 지점마다
+        캐시된 특성으로 윈도우를 스냅샷합니다. 예측이 필요하면
+        (frame_index 리스트, in-flight Future) 튜플을, 아니면 None을 반환합니다.
+        offset은 긴 시퀀스를 조각으로 나눠 처리할 때 원래 메시지 기준 frame_index 보정값입니다.
+        """
+        sequence_buffer = session.sequence
+        vector_count = session.vector_count
+        
+        frame_indices = []
+        windows = []
+        gated = []  # 예측 지점별 모션 게이트 여부
+        has_result = session.last_result is not None
+        now = time.time()
+        for i, (landmarks_data, timestamp) in enumerate(decoded):
+            if isinstance(landmarks_data, PackedFrame):
+                sequence_buffer.append_packed(landmarks_data.presence, landmarks_data.coords)
+            else:
+                sequence_buffer.append_parts(landmarks_data, timestamp)
+            vector_count += 1
+            
+            # 예측 지점이면 현재 윈도우를 스냅샷 (움직임이 없으면 이전 결과 재사용)
+            if sequence_buffer.is_full() and vector_count % self.prediction_interval == 0:
+                frame_indices.append(offset + i)
+                if self.should_gate_inference(session, has_result, now):
+                    gated.append(True)
+                else:
+                    gated.append(False)
+                    windows.append(sequence_buffer.model_input())
+                    has_result = True
+                    session.last_inference_time = now
+        
+        num_frames = vector_count - session.vector_count
+        session.vector_count = vector_count
+        self.performance_stats['total_vectors'] += num_frames
+        
+        if not frame_indices:
+            return None
+        
+        self.performance_stats['gated_predictions'] += sum(gated)
+        session.gated_predictions += sum(gated)
+        pending = asyncio.ensure_future(self.run_gated_batch_prediction(session, windows, gated))
+        session.inflight = pending
+        return frame_indices, pending
+    
+    async def run_gated_batch_prediction(self, session, windows, gated):
+        """게이트되지 않은 윈도우만 배치로 예측하고, 게이트된 지점은 직전 평균 결과로 채움"""
+        previous = session.last_result
+        if windows:
+            results = await self.run_batch_prediction(session, np.stack(windows))
+            if results is None:
+                return None
+        else:
+            results = []
+        
+        merged = []
+        predicted = iter(results)
+        for is_gated in gated:
+            if not is_gated:
+                previous = next(predicted)
+            merged.append(previous)
+        return merged
+    
+    async def send_sequence_results(self, websocket, session, frame_indices, pending, timestamp, message_id=None):
+        """시퀀스 예측 결과를 frame_index가 붙은 배열 하나로 전송"""
+        try:
+            results = await pending
+        except asyncio.CancelledError:
+            return
+        if not results:
+            return
+        result_format = session.result_format
+        data = []
+        for i, result in zip(frame_indices, results):
+            # 예측 이후 모델이 바뀌었으면 이전 모델 결과는 보내지 않음
+            if result and result["model"] is session.model and result_format.should_emit(result):
+                data.append({
+                    **result_format.format(result, result["model"].ACTIONS),
+                    "frame_index": i,
+                    "timestamp": timestamp + (i * 16.67)  # 60fps 기준
+                })
+        if not data:
+            # 변화 전용 모드에서 바뀐 결과가 없는 경우
+            return
+        response = {
+            "type": "classification_results",
+            "data": data,
+            "timestamp": timestamp
+        }
+        if message_id is not None:
+            response["message_id"] = message_id
+        logger.info(f"[WS] [{session.client_id}] 시퀀스 예측 결과 {len(response['data'])}개 전송")
+        try:
+            await websocket.send(json.dumps(response))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+    
+    async def send_prediction_result(self, websocket, session, pending, timestamp=None, frame_index=None, message_id=None):
+        """in-flight 예측이 끝나면 결과를 클라이언트에 전송"""
+        try:
+            result = await pending
+        except asyncio.CancelledError:
+            return
+        if not result or result["model"] is not session.model:
+            # 예측 이후 모델이 바뀌었으면 이전 모델 결과는 보내지 않음
+            return
+        logger.info(f"[WS] [{session.client_id}] 예측 결과: {result['prediction']} ({result['confidence']:.3f})")
+        result_format = session.result_format
+        if not result_format.should_emit(result):
+            return
+        response = {
+            "type": "classification_result",
+            "data": result_format.format(result, result["model"].ACTIONS),
+            "timestamp": timestamp if timestamp is not None else asyncio.get_event_loop().time()
+        }
+        if frame_index is not None:
+            response["frame_index"] = frame_index
+        if message_id is not None:
+            response["message_id"] = message_id
+        try:
+            await websocket.send(json.dumps(response))
+        except websockets.exceptions.ConnectionClosed:
+            pass
+    
+    def handle_subscription(self, websocket, session, data):
+        """classification_log 구독/해제 메시지 처리 - 클라이언트에 보낼 응답 dict 반환"""
+        channel = data.get("channel", CLASSIFICATION_LOG_CHANNEL)
+        if channel != CLASSIFICATION_LOG_CHANNEL:
+            return {"type": "error", "code": "unknown_channel", "message": f"알 수 없는 채널: {channel}"}
+        
+        # 구독 중이면 먼저 해제 (subscribe를 다시 보내면 max_rate만 갱신)
+        if session.log_subscription is not None:
+            self.classification_log.unsubscribe(session.log_subscription)
+            session.log_subscription = None
+        if data["type"] == "unsubscribe":
+            logger.info(f"[WS] [{session.client_id}] {channel} 구독 해제")
+            return {"type": "unsubscribed", "channel": channel}
+        
+        max_rate = data.get("max_rate")
+        # JSON true/false는 파이썬에서 int의 하위 타입이므로 따로 거부
+        if max_rate is not None and (isinstance(max_rate, bool) or not isinstance(max_rate, (int, float))):
+            return {"type": "error", "code": "invalid_max_rate", "message": f"잘못된 max_rate: {max_rate!r}"}
+        session.log_subscription = self.classification_log.subscribe(websocket, max_rate)
+        logger.info(f"[WS] [{session.client_id}] {channel} 구독 (최대 {session.log_subscription.max_rate}/s)")
+        return {
+            "type": "subscribed",
+            "channel": channel,
+            "max_rate": session.log_subscription.max_rate,
+            "queue_size": self.classification_log.queue_size
+        }
+    
+    async def process_frame_message(self, websocket, session, message):
+        """큐에서 꺼낸 프레임 메시지 처리 - 예측 결과는 별도 태스크로 전송
+
+        긴 시퀀스는 sequence_slice_frames개씩 나눠 처리합니다. 조각마다 예측이 끝나길 기다리고
+        다른 클라이언트에 양보하므로, 한 클라이언트의 긴 시퀀스가 이벤트 루프와 추론 배치를
+        독점하지 않습니다 (조각마다 frame_index가 원래 메시지 기준인 classification_results 전송).
+        이전 메시지(또는 조각)의 예측이 아직 진행 중이면 끝날 때까지 기다린 뒤 다음 조각을 처리하므로,
+        한 세션의 시퀀스 예측은 항상 하나씩 순서대로 스무딩에 반영됩니다.
+        기다리는 동안 모델이 바뀌면 남은 조각은 새 모델에 넣지 않고 버립니다.
+        """
+        if not message.sequence:
+            started = time.perf_counter()
+            pending = self.process_landmarks(message.frames[0], session, message.timestamp)
+            session.charge(time.perf_counter() - started)
+            if pending is not None:
+                asyncio.create_task(self.send_prediction_result(
+                    websocket, session, pending, message.timestamp, message_id=message.message_id
+                ))
+            return
+        
+        started = time.perf_counter()
+        decoded = self.validate_sequence(message.frames)
+        session.charge(time.perf_counter() - started)
+        slice_frames = max(1, self.sequence_slice_frames)
+        model = session.model
+        for offset in range(0, len(decoded), slice_frames):
+            if offset > 0:
+                await self.wait_for_turn(session)
+            inflight = session.inflight
+            if inflight is not None and not inflight.done():
+                # 게이트/스무딩이 직전 예측 결과를 기준으로 동작하도록 이전 예측 완료 후 처리
+                await asyncio.wait([inflight])
+            if session.model is not model:
+                # 기다리는 동안 모델이 바뀜 - 남은 조각은 이전 모델 기준 프레임이므로 버림
+                logger.info(f"[WS] [{session.client_id}] 모델 변경으로 시퀀스 나머지 {len(decoded) - offset}프레임 버림")
+                return
+            started = time.perf_counter()
+            scheduled = self.process_landmarks_sequence(decoded[offset:offset + slice_frames], session, offset)
+            session.charge(time.perf_counter() - started)
+            if scheduled is None:
+                continue
+            frame_indices, pending = scheduled
+            asyncio.create_task(self.send_sequence_results(
+                websocket, session, frame_indices, pending, message.timestamp, message.message_id
+            ))
+    
+    async def wait_for_turn(self, session):
+        """다른 클라이언트에 양보 - CPU 예산을 넘은 클라이언트는 예산이 회복될 때까지 대기
+        
+        대기하는 동안 들어온 프레임은 프레임 큐 정책에 따라 버려지므로, 무거운 클라이언트만
+        더 성긴 예측을 받고 다른 클라이언트의 지연 시간은 유지됩니다.
+        """
+        delay = session.budget_delay(self.client_cpu_budget, self.client_cpu_burst, time.monotonic())
+        # 다른 연결이 없으면 예산을 넘어도 기다리지 않음 (유휴 자원을 놀리지 않도록)
+        await asyncio.sleep(delay if len(self.clients) > 1 else 0)
+    
+    async def process_frame_queue(self, websocket, session):
+        """클라이언트 프레임 큐 처리 태스크 (연결 종료 시 취소)"""
+        client_id = session.client_id
+        frame_queue = session.frame_queue
+        drop_reported = False
+        while True:
+            message = await frame_queue.get()
+            try:
+                await self.process_frame_message(websocket, session, message)
+            except LandmarkValidationError as e:
+                logger.warning(f"[WS] [{client_id}] 잘못된 랜드마크 데이터 ({e.code}): {e}")
+                await self.send_error(websocket, f"잘못된 랜드마크 데이터: {e}", e.code)
+            except Exception as e:
+                logger.error(f"[WS] 프레임 처리 실패 [{client_id}]: {e}")
+                await self.send_error(websocket, "랜드마크 처리 중 오류가 발생했습니다.")
+            
+            if frame_queue.dropped_frames and not drop_reported:
+                logger.warning(
+                    f"[WS] [{client_id}] 처리가 밀려 프레임을 버리기 시작했습니다 "
+                    f"(정책 {frame_queue.policy}, 큐 깊이 {len(frame_queue)})"
+                )
+                drop_reported = True
+            # 처리하는 동안 도착한 메시지를 수신 루프가 큐로 옮길 수 있도록 양보 (예산 초과 시 대기)
+            await self.wait_for_turn(session)
+    
+    async def send_error(self, websocket, message, code=None):
+        """클라이언트에 error 메시지 전송 (연결이 끊긴 경우 무시)"""
+        response = {"type": "error", "message": message}
+        if code is not None:
+            response["code"] = code
+        try:
+            await websocket.send(json.dumps(response))
+        except Exception:
+            pass
+    
     async def handle_client(self, websocket):
         """클라이언트 연결 처리"""
-        client_id = self.get_client_id(websocket)
-        
         self.clients.add(websocket)
-        self.initialize_client(client_id)
+        if self.process_group is not None:
+            self.process_group.client_connected()
+        session = self.initialize_client(websocket)
+        client_id = session.client_id
 
         # 만약 종료 대기 태스크가 있다면 취소
         if self.shutdown_task is not None and not self.shutdown_task.done():
@@ -848,41 +886,76 @@ class SignClassifierWebSocketServer:
             self.shutdown_task = None
 
         logger.info(f"[WS] 클라이언트 연결됨: {client_id}")
-        logger.info(f"[WS] 기대 메시지 포맷: JSON with 'type': 'landmarks' or 'landmarks_sequence'")
+        logger.info(f"[WS] 기대 메시지 포맷: JSON with 'type': 'landmarks' or 'landmarks_sequence', 또는 협상된 바이너리 프레임")
+
+        # 수신과 처리를 분리 - 수신 루프는 프레임을 큐에 넣기만 하고 처리 태스크가 꺼내 처리
+        processor = asyncio.create_task(self.process_frame_queue(websocket, session))
 
         try:
+            # 접속 URL로 모델을 지정한 경우 (한 프로세스에서 여러 레슨 모델 호스팅)
+            params = self.get_connection_params(websocket)
+            if params.get("model"):
+                await self.apply_model_selection(websocket, session, params["model"])
+            # 접속 URL로 바이너리 프로토콜이나 결과 형식을 요청한 경우 바로 협상 (라벨 테이블은 여기서 한 번 전송)
+            if params.get("protocol") == BINARY_PROTOCOL or "results" in params:
+                await websocket.send(json.dumps(self.negotiate_hello(session, params)))
+
             async for message in websocket:
-                logger.info(f"[WS] [{client_id}] 메시지 수신: {str(message)[:200]}")
                 try:
                     # 메시지 타입 확인 (텍스트 또는 바이너리)
                     if isinstance(message, bytes):
-                        logger.warning(f"[WS] [{client_id}] 바이너리 메시지 수신됨 (길이: {len(message)} bytes) - 지원하지 않음")
+                        logger.info(f"[WS] [{client_id}] 바이너리 메시지 수신 (길이: {len(message)} bytes)")
+                        if session.protocol != BINARY_PROTOCOL:
+                            logger.warning(f"[WS] [{client_id}] 바이너리 프로토콜 협상 전 바이너리 메시지 수신됨 - 무시")
+                            try:
+                                await websocket.send(json.dumps({
+                                    "type": "error",
+                                    "message": "바이너리 메시지를 보내려면 먼저 hello 메시지로 바이너리 프로토콜을 협상해주세요. 협상하지 않은 경우 JSON 형식의 랜드마크 데이터를 전송해주세요."
+                                }))
+                            except:
+                                pass
+                            continue
+
                         try:
+                            frames = decode_frames(message)
+                        except LandmarkValidationError as e:
+                            logger.warning(f"[WS] [{client_id}] 잘못된 바이너리 프레임 ({e.code}): {e}")
                             await websocket.send(json.dumps({
                                 "type": "error",
-                                "message": "바이너리 메시지는 지원되지 않습니다. JSON 형식의 랜드마크 데이터를 전송해주세요."
+                                "code": e.code,
+                                "message": f"잘못된 바이너리 프레임: {e}"
                             }))
-                        except:
-                            pass
+                            continue
+
+                        if not frames:
+                            continue
+                        # 여러 프레임을 묶은 메시지는 시퀀스 fast path로 처리
+                        sequence = len(frames) > 1
+                        session.frame_queue.put(FrameMessage(
+                            frames, sequence, asyncio.get_event_loop().time() if sequence else None,
+                            binary_message_id(message)
+                        ))
                         continue
 
+                    logger.info(f"[WS] [{client_id}] 메시지 수신: {message[:200]}")
                     data = json.loads(message)
                     logger.info(f"[WS] [{client_id}] 파싱된 데이터: {data}")
 
-                    if data.get("type") == "landmarks":
+                    # 메시지 단위 모델 선택
+                    if data.get("model"):
+                        await self.apply_model_selection(websocket, session, data["model"])
+
+                    if data.get("type") == "hello":
+                        response = self.negotiate_hello(session, data)
+                        logger.info(f"[WS] [{client_id}] 프로토콜 협상: {response}")
+                        await websocket.send(json.dumps(response))
+
+                    elif data.get("type") == "landmarks":
                         landmarks_data = data.get("data")
                         if landmarks_data:
-                            logger.info(f"[WS] [{client_id}] landmarks 데이터 수신 및 처리 시작")
-                            result = self.process_landmarks(landmarks_data, client_id)
-                            logger.info(f"[WS] [{client_id}] landmarks 예측 결과: {result}")
-                            if result:
-                                response = {
-                                    "type": "classification_result",
-                                    "data": result,
-                                    "timestamp": asyncio.get_event_loop().time()
-                                }
-                                logger.info(f"[WS] [{client_id}] landmarks 결과 전송: {response}")
-                                await websocket.send(json.dumps(response))
+                            logger.info(f"[WS] [{client_id}] landmarks 데이터 수신")
+                            # 클라이언트가 보낸 timestamp는 결과에 그대로 돌려줌 (지연 시간 측정용)
+                            session.frame_queue.put(FrameMessage([landmarks_data], False, data.get("timestamp")))
                         else:
                             logger.warning(f"[WS] [{client_id}] 빈 landmarks 데이터")
 
@@ -893,25 +966,21 @@ class SignClassifierWebSocketServer:
                             frame_count = sequence_data.get("frame_count", len(sequence))
                             timestamp = sequence_data.get("timestamp", asyncio.get_event_loop().time())
                             logger.info(f"[WS] [{client_id}] landmarks_sequence 수신: {frame_count}개 프레임")
-                            # 시퀀스의 각 프레임을 처리
-                            for i, landmarks_data in enumerate(sequence):
-                                logger.info(f"[WS] [{client_id}] 시퀀스 프레임 {i} 처리 시작")
-                                result = self.process_landmarks(landmarks_data, client_id)
-                                logger.info(f"[WS] [{client_id}] 시퀀스 프레임 {i} 예측 결과: {result}")
-                                if result:
-                                    response = {
-                                        "type": "classification_result",
-                                        "data": result,
-                                        "timestamp": timestamp + (i * 16.67),  # 60fps 기준
-                                        "frame_index": i
-                                    }
-                                    logger.info(f"[WS] [{client_id}] 시퀀스 프레임 {i} 결과 전송: {response}")
-                                    await websocket.send(json.dumps(response))
+                            # 시퀀스 전체를 한 번에 수집하고 예측 지점만 배치로 예측
+                            session.frame_queue.put(FrameMessage(sequence, True, timestamp))
                         else:
                             logger.warning(f"[WS] [{client_id}] 잘못된 landmarks_sequence 데이터")
 
                     elif data.get("type") == "ping":
-                        await websocket.send(json.dumps({"type": "pong"}))
+                        # 입력 큐 깊이, 버린 프레임 수, 누적 처리 시간을 함께 알려줌
+                        await websocket.send(json.dumps({
+                            "type": "pong",
+                            **session.frame_queue.stats(),
+                            "service_ms": round(session.service_time * 1000, 1)
+                        }))
+
+                    elif data.get("type") in ("subscribe", "unsubscribe"):
+                        await websocket.send(json.dumps(self.handle_subscription(websocket, session, data)))
 
                     else:
                         logger.warning(f"[WS] [{client_id}] 알 수 없는 메시지 타입: {data.get('type')}")
@@ -939,9 +1008,12 @@ class SignClassifierWebSocketServer:
             import traceback
             logger.error(f"[WS] 상세 오류 정보: {traceback.format_exc()}")
         finally:
+            processor.cancel()
             try:
                 self.clients.remove(websocket)
-                self.cleanup_client(client_id)
+                if self.process_group is not None:
+                    self.process_group.client_disconnected()
+                self.cleanup_client(session)
                 if not self.clients:
                     logger.info("[WS] 모든 클라이언트 연결 종료됨. 20초 후 서버 프로세스 종료 예정.")
                     loop = asyncio.get_event_loop()
@@ -953,7 +1025,8 @@ class SignClassifierWebSocketServer:
         """20초 후 서버 종료 (새 클라이언트 접속 시 취소 가능)"""
         try:
             await asyncio.sleep(20)
-            if not self.clients:
+            # 멀티 프로세스 모드에서는 같은 그룹의 다른 프로세스 연결도 확인
+            if not self.clients and (self.process_group is None or self.process_group.active_clients() == 0):
                 # TensorFlow 프로파일러 정지 (프로파일링 모드가 활성화된 경우)
                 if self.enable_profiling and self.profiler_started:
                     try:
@@ -963,6 +1036,9 @@ class SignClassifierWebSocketServer:
                         logger.warning(f"TensorFlow 프로파일러 정지 실패: {e}")
                 
                 logger.info("[WS] 20초 대기 후에도 클라이언트 없음. 서버 프로세스 종료.")
+                if self.process_group is not None:
+                    # 부모 프로세스가 그룹의 다른 프로세스까지 함께 종료
+                    self.process_group.request_shutdown()
                 os._exit(0)
             else:
                 logger.info("[WS] 20초 대기 중 새 클라이언트 접속. 종료 취소.")
@@ -971,11 +1047,16 @@ class SignClassifierWebSocketServer:
     
     async def run_server(self):
         """WebSocket 서버 실행"""
-        server = await websockets.serve(
-            self.handle_client, 
-            self.host, 
-            self.port
-        )
+        if self.shared_client is not None and self.shared_client.listen_socket is not None:
+            # 부모 프로세스가 bind한 소켓을 모든 프론트엔드가 함께 accept
+            server = await websockets.serve(self.handle_client, sock=self.shared_client.listen_socket)
+        else:
+            server = await websockets.serve(
+                self.handle_client, 
+                self.host, 
+                self.port,
+                reuse_port=self.reuse_port
+            )
         logger.info(f"수어 분류 WebSocket 서버 시작: ws://{self.host}:{self.port}")
         logger.info(f"서버 정보:")
         logger.info(f"   - 호스트: {self.host}")
@@ -983,10 +1064,12 @@ class SignClassifierWebSocketServer:
         logger.info(f"   - 모델: {self.MODEL_SAVE_PATH}")
         logger.info(f"   - 라벨 수: {len(self.ACTIONS)}")
         logger.info(f"   - 시퀀스 길이: {self.MAX_SEQ_LENGTH}")
+        logger.info(f"   - 멀티 모델 호스팅: 접속 URL ?model= 또는 메시지 'model' 필드로 선택 (메모리 예산 {self.model_memory_budget_mb}MB)")
         logger.info(f"   - 디버그 모드: {self.debug_mode}")
         logger.info(f"성능 최적화 설정:")
         logger.info(f"   - 예측 간격: {self.prediction_interval}벡터마다 예측")
         logger.info(f"   - 결과 버퍼 크기: {self.result_buffer_size}개 프레임")
+        logger.info(f"   - 배치 추론: 최대 {self.max_batch_size}개, 최대 대기 {self.max_batch_wait_ms}ms, 큐 깊이 {self.max_queue_depth}")
         logger.info(f"   - TensorFlow XLA JIT: 활성화")
         logger.info(f"   - TensorFlow Graph Mode: 활성화")
         logger.info(f"   - Performance profiling: {self.enable_profiling}")
@@ -995,13 +1078,17 @@ class SignClassifierWebSocketServer:
         logger.info(f"벡터 처리 모드 - JSON 랜드마크 데이터만 지원")
         logger.info(f"결과 버퍼링 모드 - {self.result_buffer_size}개 프레임의 분류 결과를 평균화하여 전송")
         logger.info(f"Starting server with optimized settings...")
+        # 로그 레벨과 관계없이 출력 (매니저가 고정 대기 대신 이 줄을 기다림)
+        print(f"{MODEL_SERVER_READY_LINE} port={self.port}", flush=True)
         
         try:
             await server.wait_closed()
         except KeyboardInterrupt:
             logger.info(" 서버 종료 중...")
         finally:
-            # 벡터 처리 모드에서는 별도 정리 작업 없음
+            await self.model_registry.close_all()
+            if self.inference_executor is not None:
+                self.inference_executor.shutdown(wait=False)
             logger.info("🔄 벡터 처리 서버 종료 완료")
 
 def setup_logging(log_level='INFO'):
@@ -1037,12 +1124,121 @@ def setup_logging(log_level='INFO'):
     
     return logging.getLogger(__name__)
 
+def wait_for_assignment(max_idle, probe_devices=True):
+    """대기 워커 모드 - 매니저가 stdin으로 보내는 모델 배정 {"port": ..., "env": ...}을 기다림
+
+    TensorFlow import는 모듈 로드 시 이미 끝났으므로 배정 후에는 모델 로드와 warmup만 남습니다.
+    max_idle초 안에 배정이 없거나 매니저가 종료되어 stdin이 닫히면 프로세스를 종료합니다.
+    probe_devices는 단일 프로세스로 실행할 때만 켭니다 - 장치 탐색은 CUDA를 초기화하므로
+    --workers/--frontends 모드에서 fork 전에 수행하면 자식 프로세스가 GPU를 사용할 수 없습니다.
+    """
+    if probe_devices:
+        # 장치 탐색도 미리 수행 (런타임 초기화 전이라 이후 GPU 메모리 설정에 영향 없음)
+        tf.config.list_physical_devices()
+    
+    lines = queue.Queue()
+    threading.Thread(target=lambda: lines.put(sys.stdin.readline()), daemon=True).start()
+    try:
+        line = lines.get(timeout=max_idle)
+    except queue.Empty:
+        sys.exit(0)
+    if not line:
+        sys.exit(0)
+    return json.loads(line)
+
+def install_event_loop_policy(use_uvloop):
+    """--uvloop: 설치되어 있으면 uvloop 이벤트 루프 사용 (fork한 자식 프로세스도 그대로 사용)"""
+    if not use_uvloop:
+        return
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop이 설치되어 있지 않아 기본 asyncio 이벤트 루프를 사용합니다")
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("uvloop 이벤트 루프 사용")
+
+def run_worker(model_info_url, host, port, server_kwargs, process_group, intra_op_threads):
+    """--workers 워커 프로세스 - 자기 모델 인스턴스를 로드하고 SO_REUSEPORT로 같은 포트에서 수신"""
+    # 워커별 TensorFlow 스레드 예산 (런타임 초기화 전에 설정해야 적용됨)
+    tf.config.threading.set_intra_op_parallelism_threads(intra_op_threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+    server = SignClassifierWebSocketServer(
+        model_info_url, host=host, port=port, process_group=process_group, reuse_port=True, **server_kwargs
+    )
+    asyncio.run(server.run_server())
+
+def run_reuseport_workers(model_info_url, host, port, server_kwargs, num_workers):
+    """서버 프로세스 N개가 SO_REUSEPORT로 한 포트를 공유 (커널이 연결을 분산)
+    
+    워커는 TensorFlow 런타임을 초기화하기 전에 fork하며, 부모는 그룹을 감시만 합니다.
+    """
+    process_group = ServerProcessGroup(multiprocessing.get_context("fork"))
+    intra_op_threads = max(1, (os.cpu_count() or 1) // num_workers)
+    for index in range(num_workers):
+        process_group.start(
+            run_worker,
+            (model_info_url, host, port, server_kwargs, process_group, intra_op_threads),
+            name=f"sign-worker-{index}"
+        )
+    logger.info(
+        f"SO_REUSEPORT 워커 {num_workers}개 시작 (PID: {[p.pid for p in process_group.processes]}, "
+        f"워커당 TensorFlow 스레드 {intra_op_threads}개)"
+    )
+    process_group.supervise()
+
+def run_frontend(model_info_url, host, port, server_kwargs, client, process_group):
+    """프론트엔드 프로세스 - WebSocket 수신/전처리/스무딩만 하고 추론은 공유 메모리로 요청"""
+    server = SignClassifierWebSocketServer(
+        model_info_url, host=host, port=port, shared_client=client, process_group=process_group, **server_kwargs
+    )
+    asyncio.run(server.run_server())
+
+def run_shared_inference(model_info_url, host, port, server_kwargs, num_frontends, slots_per_frontend):
+    """프론트엔드 N개 + 추론 워커(현재 프로세스) 구성으로 실행
+    
+    프론트엔드는 TensorFlow 런타임을 초기화하기 전에 fork하고, 리슨 소켓은 부모가 bind해
+    물려주므로 모든 프론트엔드가 같은 포트에서 연결을 나눠 받습니다.
+    """
+    model_info = load_model_info(model_info_url)
+    if not model_info:
+        raise ValueError("모델 정보를 로드할 수 없습니다.")
+    max_seq_length = model_info["input_shape"][0]
+    # 슬롯은 기본 모델의 윈도우와 라벨을 모두 담을 수 있는 크기로 생성 (더 길거나 라벨이 많은 레슨 모델은 로드 시 거부)
+    max_labels = max(SHARED_MAX_LABELS, len(model_info["labels"]))
+    
+    listen_socket = socket.create_server((host, port))
+    mp_context = multiprocessing.get_context("fork")
+    channel = SharedInferenceChannel(mp_context, num_frontends, slots_per_frontend, max_seq_length, max_labels)
+    process_group = ServerProcessGroup(mp_context)
+    for index in range(num_frontends):
+        client = SharedInferenceClient(channel, index, listen_socket)
+        process_group.start(
+            run_frontend,
+            (model_info_url, host, port, server_kwargs, client, process_group),
+            name=f"sign-frontend-{index}"
+        )
+    listen_socket.close()
+    logger.info(f"프론트엔드 {num_frontends}개 시작 (PID: {[p.pid for p in process_group.processes]})")
+    
+    # 추론 워커는 서버 객체의 모델 레지스트리(기본 모델 고정, 지연 로딩, LRU)만 사용
+    server = SignClassifierWebSocketServer(model_info_url, host=host, port=port, **server_kwargs)
+    process_group.install_signal_handlers()
+    try:
+        asyncio.run(SharedInferenceWorker(channel, server.model_registry, process_group).run())
+    finally:
+        server.inference_executor.shutdown(wait=False)
+
 def main():
     """메인 함수"""
     
     parser = argparse.ArgumentParser(description='Sign Classifier WebSocket Server (Vector Processing Mode)')
-    parser.add_argument("--port", type=int, required=True, help="Port number for the server")
-    parser.add_argument("--env", type=str, required=True, help="Environment variable model_info_URL")
+    parser.add_argument("--port", type=int, default=None, help="Port number for the server (required unless --standby)")
+    parser.add_argument("--env", type=str, default=None, help="Environment variable model_info_URL (required unless --standby)")
+    parser.add_argument("--standby", action='store_true',
+                       help="Import TensorFlow, then wait for a JSON assignment line {\"port\": ..., \"env\": ...} on stdin")
+    parser.add_argument("--standby-max-idle", type=float, default=600.0,
+                       help="Exit if no assignment arrives within this many seconds in --standby mode (default: 600)")
     parser.add_argument("--host", type=str, default="localhost", help="Host to bind the server to (default: localhost)")
     parser.add_argument("--log-level", type=str, default='INFO', 
                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'OFF'],
@@ -1051,11 +1247,67 @@ def main():
                        help="Enable debug mode for additional logging")
     parser.add_argument("--prediction-interval", type=int, default=5,
                        help="Prediction interval (run prediction every N vectors, default: 5)")
+    parser.add_argument("--max-batch-size", type=int, default=16,
+                       help="Maximum number of client windows per batched prediction (default: 16)")
+    parser.add_argument("--max-batch-wait-ms", type=float, default=5.0,
+                       help="Maximum time to wait for a batch to fill, in milliseconds (default: 5.0)")
+    parser.add_argument("--max-queue-depth", type=int, default=256,
+                       help="Maximum number of pending prediction requests (default: 256)")
+    parser.add_argument("--model-memory-budget-mb", type=int, default=4096,
+                       help="Estimated memory budget for hosted models before LRU eviction, in MB (default: 4096)")
+    parser.add_argument("--backend", type=str, default="keras", choices=BACKENDS,
+                       help="Inference backend; tflite/onnx are converted once, cached and parity-checked against Keras (default: keras)")
+    parser.add_argument("--quantization", type=str, default="none", choices=("none",) + QUANTIZATION_VARIANTS,
+                       help="Serve the published quantized TFLite variant of each model if available (default: none)")
+    parser.add_argument("--motion-threshold", type=float, default=0.0,
+                       help="Skip inference and reuse the last result when mean hand speed (shoulder widths/frame) is below this, e.g. 0.01; 0 disables unless model_info sets motion_gate (default: 0)")
+    parser.add_argument("--motion-window", type=int, default=10,
+                       help="Recent frames used for the motion score (default: 10)")
+    parser.add_argument("--motion-heartbeat", type=float, default=2.0,
+                       help="Run a real inference at least this often in seconds while idle (default: 2.0)")
     parser.add_argument("--result-buffer-size", type=int, default=6,
                        help="Result buffer size (number of frames to average, default: 15)")
+    parser.add_argument("--frame-queue-policy", type=str, default="drop_oldest", choices=QUEUE_POLICIES,
+                       help="When frame processing falls behind: drop the oldest queued frames, or coalesce to the newest --coalesce-frames (default: drop_oldest)")
+    parser.add_argument("--max-queued-frames", type=int, default=60,
+                       help="Maximum frames queued per client before the oldest are dropped (default: 60)")
+    parser.add_argument("--coalesce-frames", type=int, default=10,
+                       help="Newest frames kept per processing step with --frame-queue-policy coalesce (default: 10)")
+    parser.add_argument("--sequence-slice-frames", type=int, default=32,
+                       help="Process long landmarks_sequence messages in slices of this many frames, yielding to other clients between slices (default: 32)")
+    parser.add_argument("--client-cpu-budget", type=float, default=0.25,
+                       help="Per-client service time budget in seconds per second; clients over budget wait before their next slice; 0 disables (default: 0.25)")
+    parser.add_argument("--client-cpu-burst", type=float, default=0.5,
+                       help="Seconds of unused budget a client may accumulate (default: 0.5)")
+    parser.add_argument("--smoothing", type=str, default="mean", choices=SMOOTHING_MODES,
+                       help="Result smoothing: mean over the result buffer or an exponential moving average (default: mean)")
+    parser.add_argument("--smoothing-alpha", type=float, default=None,
+                       help="EMA coefficient for --smoothing ema (default: 2 / (result buffer size + 1))")
+    parser.add_argument("--log-queue-size", type=int, default=32,
+                       help="Pending classification_log messages kept per subscriber before dropping the oldest (default: 32)")
+    parser.add_argument("--log-max-rate", type=float, default=10.0,
+                       help="Maximum classification_log messages per second per subscriber (default: 10.0)")
     parser.add_argument("--profile", action='store_true',
                        help="Enable detailed performance profiling")
+    parser.add_argument("--frontends", type=int, default=0,
+                       help="Split into N WebSocket front-end processes and one inference worker sharing windows via shared memory; 0 runs everything in one process (default: 0)")
+    parser.add_argument("--shared-slots", type=int, default=64,
+                       help="Shared-memory window slots per front-end in --frontends mode (default: 64)")
+    parser.add_argument("--workers", type=int, default=1,
+                       help="Fork N full server processes sharing the port via SO_REUSEPORT, each with its own model and thread budget (default: 1)")
+    parser.add_argument("--uvloop", action='store_true',
+                       help="Use the uvloop event loop policy if uvloop is installed")
     args = parser.parse_args()
+    if args.workers > 1 and args.frontends > 0:
+        parser.error("--workers and --frontends cannot be combined")
+    if args.log_max_rate <= 0:
+        parser.error("--log-max-rate must be greater than 0")
+    if args.standby:
+        assignment = wait_for_assignment(args.standby_max_idle, probe_devices=args.workers <= 1 and args.frontends == 0)
+        args.port = int(assignment["port"])
+        args.env = assignment["env"]
+    elif args.port is None or args.env is None:
+        parser.error("--port and --env are required unless --standby is given")
     
     port = args.port
     model_info_url = args.env
@@ -1063,7 +1315,26 @@ def main():
     log_level = args.log_level
     debug_mode = args.debug
     prediction_interval = args.prediction_interval
+    max_batch_size = args.max_batch_size
+    max_batch_wait_ms = args.max_batch_wait_ms
+    max_queue_depth = args.max_queue_depth
+    model_memory_budget_mb = args.model_memory_budget_mb
+    backend = args.backend
+    quantization = None if args.quantization == "none" else args.quantization
+    motion_threshold = args.motion_threshold
+    motion_window = args.motion_window
+    motion_heartbeat = args.motion_heartbeat
     result_buffer_size = args.result_buffer_size
+    frame_queue_policy = args.frame_queue_policy
+    max_queued_frames = args.max_queued_frames
+    coalesce_frames = args.coalesce_frames
+    sequence_slice_frames = args.sequence_slice_frames
+    client_cpu_budget = args.client_cpu_budget
+    client_cpu_burst = args.client_cpu_burst
+    smoothing = args.smoothing
+    smoothing_alpha = args.smoothing_alpha
+    log_queue_size = args.log_queue_size
+    log_max_rate = args.log_max_rate
     enable_profiling = args.profile
     
     # 로깅 설정 (동적으로 설정)
@@ -1079,7 +1350,15 @@ def main():
         print(f"Debug mode: {debug_mode}")
         print(f"Performance settings:")
         print(f"   - Prediction interval: {prediction_interval}")
-        print(f"   - Result buffer size: {result_buffer_size}")
+        print(f"   - Batching: max batch {max_batch_size}, max wait {max_batch_wait_ms}ms, queue depth {max_queue_depth}")
+        print(f"   - Inference backend: {backend} (quantization: {quantization or 'none'})")
+        print(f"   - Motion gate: threshold {motion_threshold}, window {motion_window}, heartbeat {motion_heartbeat}s")
+        print(f"   - Result buffer size: {result_buffer_size} (smoothing: {smoothing})")
+        print(f"   - Frame queue: {frame_queue_policy}, max {max_queued_frames} frames (coalesce to {coalesce_frames})")
+        print(f"   - Fair scheduling: {sequence_slice_frames}-frame slices, per-client budget {client_cpu_budget}s/s (burst {client_cpu_burst}s)")
+        print(f"   - classification_log subscribers: queue {log_queue_size}, max {log_max_rate}/s")
+        print(f"   - Shared-memory front-ends: {args.frontends or 'off'}")
+        print(f"   - SO_REUSEPORT workers: {args.workers} (uvloop: {args.uvloop})")
         print(f"   - TensorFlow Graph Mode: Enabled")
         print(f"   - Performance profiling: {enable_profiling}")
         if enable_profiling:
@@ -1093,10 +1372,7 @@ def main():
     project_root = os.path.dirname(os.path.dirname(current_dir))
     
     # 파일명만 전달된 경우 s3://waterandfish-s3/model-info/ 디렉터리에서 찾기
-    model_info_url_processed = model_info_url
-    if os.path.basename(model_info_url) == model_info_url:
-        # 파일명만 전달된 경우
-        model_info_url_processed = f"s3://waterandfish-s3/model-info/{model_info_url}"
+    model_info_url_processed = resolve_model_info_url(model_info_url)
     
     logger.info(f"원본 모델 데이터 URL: {model_info_url}")
     logger.info(f"처리된 모델 데이터 경로: {model_info_url_processed}")
@@ -1123,15 +1399,40 @@ def main():
     
     # 서버 생성 및 실행
     # localhost should be changed to the server's IP address when deploying to a server
-    server = SignClassifierWebSocketServer(
-        model_info_url_processed, 
-        host="0.0.0.0", 
-        port=port,
+    server_kwargs = dict(
         debug_mode=debug_mode,
         prediction_interval=prediction_interval,
         enable_profiling=enable_profiling,
-        result_buffer_size=result_buffer_size
+        result_buffer_size=result_buffer_size,
+        max_batch_size=max_batch_size,
+        max_batch_wait_ms=max_batch_wait_ms,
+        max_queue_depth=max_queue_depth,
+        model_memory_budget_mb=model_memory_budget_mb,
+        backend=backend,
+        quantization=quantization,
+        motion_threshold=motion_threshold,
+        motion_window=motion_window,
+        motion_heartbeat=motion_heartbeat,
+        log_queue_size=log_queue_size,
+        log_max_rate=log_max_rate,
+        smoothing=smoothing,
+        smoothing_alpha=smoothing_alpha,
+        frame_queue_policy=frame_queue_policy,
+        max_queued_frames=max_queued_frames,
+        coalesce_frames=coalesce_frames,
+        sequence_slice_frames=sequence_slice_frames,
+        client_cpu_budget=client_cpu_budget,
+        client_cpu_burst=client_cpu_burst
     )
+    install_event_loop_policy(args.uvloop)
+    use_shared_inference = args.frontends > 0 and hasattr(os, "fork")
+    if args.frontends > 0 and not use_shared_inference:
+        logger.warning("이 플랫폼은 fork를 지원하지 않아 단일 프로세스로 실행합니다 (--frontends 무시)")
+    use_workers = args.workers > 1 and hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")
+    if args.workers > 1 and not use_workers:
+        logger.warning("이 플랫폼은 fork/SO_REUSEPORT를 지원하지 않아 단일 프로세스로 실행합니다 (--workers 무시)")
+    if not use_shared_inference and not use_workers:
+        server = SignClassifierWebSocketServer(model_info_url_processed, host="0.0.0.0", port=port, **server_kwargs)
     
     # 디버그 모드 활성화 시 알림
     if debug_mode:
@@ -1150,7 +1451,12 @@ def main():
         logger.info("   - TensorBoard로 프로파일 결과를 시각화할 수 있습니다")
         logger.info("   - 명령어: tensorboard --logdir=./logs")
     
-    asyncio.run(server.run_server())
+    if use_shared_inference:
+        run_shared_inference(model_info_url_processed, "0.0.0.0", port, server_kwargs, args.frontends, args.shared_slots)
+    elif use_workers:
+        run_reuseport_workers(model_info_url_processed, "0.0.0.0", port, server_kwargs, args.workers)
+    else:
+        asyncio.run(server.run_server())
 
 if __name__ == "__main__":
     main() 
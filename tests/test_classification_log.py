@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from src.services.classification_log import ClassificationLogHub
+
+
+class RecordingWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, message):
+        self.messages.append(json.loads(message))
+
+
+def test_only_subscribers_receive_log_and_queue_drops_oldest():
+    async def scenario():
+        hub = ClassificationLogHub(queue_size=2, max_rate=50.0)
+        # 구독자가 없으면 직렬화/전송 없음
+        hub.publish({"prediction": "a"}, "learner", 0.0)
+
+        monitor = RecordingWebSocket()
+        subscription = hub.subscribe(monitor)
+        for i in range(5):
+            hub.publish({"prediction": str(i)}, "learner", float(i))
+        await asyncio.sleep(0.1)
+        hub.unsubscribe(subscription)
+        return monitor.messages, subscription
+
+    messages, subscription = asyncio.run(scenario())
+    # 전송 태스크가 실행되기 전에 5개가 발행되므로 최근 2개(큐 크기)만 남음
+    assert [m["data"]["prediction"] for m in messages] == ["3", "4"]
+    assert all(m["type"] == "classification_log" for m in messages)
+    assert subscription.dropped == 3
+
+
+def test_subscriber_rate_is_capped_by_server_limit():
+    async def scenario():
+        hub = ClassificationLogHub(queue_size=100, max_rate=20.0)
+        monitor = RecordingWebSocket()
+        subscription = hub.subscribe(monitor, max_rate=1000)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for i in range(5):
+            hub.publish({"prediction": str(i)}, "learner", float(i))
+        while len(monitor.messages) < 5:
+            await asyncio.sleep(0.01)
+        hub.unsubscribe(subscription)
+        return subscription.max_rate, loop.time() - start
+
+    max_rate, elapsed = asyncio.run(scenario())
+    assert max_rate == 20.0
+    # 5개 메시지 사이 간격 4번 x 50ms
+    assert elapsed >= 0.2 - 0.01
+
+
+@pytest.mark.parametrize("max_rate", [0, -1.0, float("nan")])
+def test_non_positive_server_rate_is_rejected(max_rate):
+    with pytest.raises(ValueError):
+        ClassificationLogHub(max_rate=max_rate)
@@ -0,0 +1,258 @@
+import asyncio
+import io
+import json
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip("tensorflow")
+pytest.importorskip("websockets")
+pytest.importorskip("boto3")
+pytest.importorskip("dotenv")
+
+from src.services import sign_classifier_websocket_server as server_module
+from src.services.landmark_preprocessing import frames_to_array, preprocess_landmark_array
+from src.services.landmark_protocol import encode_frames
+
+LABELS = ["None", "a", "b"]
+SEQ_LENGTH = 4
+PROBS = np.array([0.2, 0.5, 0.3], dtype=np.float32)
+
+
+class FakeSharedClient:
+    """공유 추론 클라이언트 대역 - TensorFlow 없이 일정 시간 뒤 고정 확률 반환"""
+
+    index = 0
+
+    def __init__(self, delay=0.02, motion_threshold=0.0):
+        self.delay = delay
+        self.motion_threshold = motion_threshold
+        self.batches = []
+        self.windows = []
+        self.active = 0
+        self.max_active = 0
+
+    def describe(self, model_key):
+        return {
+            "model_info_url": model_key,
+            "model_info": {},
+            "MAX_SEQ_LENGTH": SEQ_LENGTH,
+            "MODEL_SAVE_PATH": "fake.keras",
+            "ACTIONS": LABELS,
+            "QUIZ_LABELS": [],
+            "motion_gate": {"threshold": self.motion_threshold, "window": 3, "heartbeat_s": 2.0, "require_hands": True},
+            "backend_name": "fake",
+            "retrace_count": 0,
+        }
+
+    async def acquire(self, model_key):
+        return self.describe(model_key)
+
+    def send(self, kind, *args):
+        pass
+
+    async def submit_many(self, model_key, windows):
+        self.batches.append(len(windows))
+        self.windows.append(windows)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        return np.tile(PROBS, (len(windows), 1))
+
+
+class FakeWebSocket:
+    remote_address = ("127.0.0.1", 5000)
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+def make_frames(num_frames, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "pose": rng.random((33, 3)).tolist(),
+            "left_hand": rng.random((21, 3)).tolist(),
+            "right_hand": rng.random((21, 3)).tolist(),
+        }
+        for _ in range(num_frames)
+    ]
+
+
+def make_server(client, **kwargs):
+    return server_module.SignClassifierWebSocketServer(
+        "fake.json", "localhost", 0, prediction_interval=1, result_buffer_size=4, shared_client=client, **kwargs
+    )
+
+
+def test_back_to_back_sequences_predict_one_batch_at_a_time():
+    async def scenario():
+        client = FakeSharedClient()
+        server = make_server(client)
+        websocket = FakeWebSocket()
+        session = server.initialize_client(websocket)
+        server.clients.add(websocket)
+        session.frame_queue.put(server_module.FrameMessage(make_frames(8), True, 0))
+        session.frame_queue.put(server_module.FrameMessage(make_frames(8, seed=1), True, 1000))
+        processor = asyncio.create_task(server.process_frame_queue(websocket, session))
+
+        async def wait_for_results():
+            while len(websocket.sent) < 2:
+                await asyncio.sleep(0.01)
+
+        await asyncio.wait_for(wait_for_results(), timeout=5)
+        processor.cancel()
+        return client, session, websocket
+
+    client, session, websocket = asyncio.run(scenario())
+    # 두 번째 메시지는 첫 번째 메시지의 예측이 끝난 뒤에 제출됨
+    assert client.max_active == 1
+    assert client.batches == [5, 8]
+    assert session.predictions == 13
+    assert [len(message["data"]) for message in websocket.sent] == [5, 8]
+    assert websocket.sent[1]["data"][0]["buffer_size"] == 4
+
+
+def test_sequence_frame_timestamps_reach_model_input():
+    async def scenario():
+        client = FakeSharedClient()
+        server = make_server(client)
+        session = server.initialize_client(FakeWebSocket())
+        frames = [{**frame, "timestamp": timestamp} for frame, timestamp in zip(make_frames(4), [0.0, 10.0, 50.0, 60.0])]
+        message = server_module.FrameMessage(frames, True, 0)
+        await server.process_frame_message(FakeWebSocket(), session, message)
+        await session.inflight
+        return client, frames
+
+    client, frames = asyncio.run(scenario())
+    landmarks, presence = frames_to_array(frames)
+    expected = preprocess_landmark_array(landmarks, presence, SEQ_LENGTH, [0.0, 10.0, 50.0, 60.0])
+    np.testing.assert_allclose(client.windows[0][0], expected, rtol=1e-5, atol=1e-5)
+
+
+def test_binary_message_id_is_echoed_in_result():
+    async def scenario():
+        server = make_server(FakeSharedClient())
+        websocket = FakeWebSocket()
+        session = server.initialize_client(websocket)
+        for i, frame in enumerate(make_frames(SEQ_LENGTH), start=1):
+            payload = encode_frames([frame], message_id=i)
+            # 서버는 스크립트 방식으로 import한 모듈의 PackedFrame을 사용
+            frames = server_module.decode_frames(payload)
+            message = server_module.FrameMessage(frames, False, None, server_module.binary_message_id(payload))
+            await server.process_frame_message(websocket, session, message)
+        await session.inflight
+        await asyncio.sleep(0)
+        return websocket
+
+    websocket = asyncio.run(scenario())
+    assert [message["message_id"] for message in websocket.sent] == [SEQ_LENGTH]
+
+
+def test_model_switch_stops_remaining_sequence_slices():
+    async def scenario():
+        client = FakeSharedClient(delay=0.05)
+        server = make_server(client, sequence_slice_frames=SEQ_LENGTH)
+        websocket = FakeWebSocket()
+        session = server.initialize_client(websocket)
+        message = server_module.FrameMessage(make_frames(3 * SEQ_LENGTH), True, 0)
+        processing = asyncio.create_task(server.process_frame_message(websocket, session, message))
+        while not client.batches:
+            await asyncio.sleep(0.005)
+        # 첫 조각 예측이 진행 중일 때 모델 변경 메시지가 처리됨
+        session.switch_model(await server.model_registry.acquire("other.json"))
+        await asyncio.wait_for(processing, 5)
+        await asyncio.sleep(0.1)
+        return client, session, websocket
+
+    client, session, websocket = asyncio.run(scenario())
+    assert client.batches == [1]
+    assert len(session.sequence) == 0
+    assert websocket.sent == []
+
+
+def test_results_predicted_before_model_switch_are_not_sent():
+    async def scenario():
+        server = make_server(FakeSharedClient())
+        websocket = FakeWebSocket()
+        session = server.initialize_client(websocket)
+        result = server.finalize_prediction(session, PROBS)
+        assert result["model"] is session.model
+        loop = asyncio.get_running_loop()
+        single, sequence = loop.create_future(), loop.create_future()
+        single.set_result(result)
+        sequence.set_result([result])
+        # 예측은 끝났지만 전송 태스크가 실행되기 전에 모델이 바뀜
+        session.switch_model(await server.model_registry.acquire("other.json"))
+        await server.send_prediction_result(websocket, session, single)
+        await server.send_sequence_results(websocket, session, [0], sequence, 0)
+        return websocket
+
+    assert asyncio.run(scenario()).sent == []
+
+
+def make_gated_session(server):
+    session = server.initialize_client(FakeWebSocket())
+    session.last_result = {"prediction": "a"}
+    session.last_inference_time = 100.0
+    return session
+
+
+def fill(session, frames):
+    for frame in frames:
+        session.sequence.append_frame(frame)
+
+
+def test_motion_gate_is_off_by_default():
+    server = make_server(FakeSharedClient())
+    assert server.motion_gate_defaults["threshold"] == 0.0
+    session = make_gated_session(server)
+    fill(session, [make_frames(1)[0]] * SEQ_LENGTH)
+    assert not server.should_gate_inference(session, True, 100.5)
+
+
+def test_motion_gate_reuses_result_only_while_still_and_within_heartbeat():
+    server = make_server(FakeSharedClient(motion_threshold=0.01))
+    session = make_gated_session(server)
+    fill(session, [make_frames(1)[0]] * SEQ_LENGTH)
+    assert server.should_gate_inference(session, True, 100.5)
+    # 재사용할 결과가 없거나 heartbeat 간격이 지나면 항상 추론
+    assert not server.should_gate_inference(session, False, 100.5)
+    assert not server.should_gate_inference(session, True, 102.0)
+    # 손이 움직이면 추론
+    fill(session, make_frames(SEQ_LENGTH, seed=1))
+    assert not server.should_gate_inference(session, True, 100.5)
+
+
+def test_motion_gate_treats_missing_hands_as_still():
+    server = make_server(FakeSharedClient(motion_threshold=0.01))
+    session = make_gated_session(server)
+    fill(session, [{**frame, "left_hand": None, "right_hand": None} for frame in make_frames(SEQ_LENGTH)])
+    assert server.should_gate_inference(session, True, 100.5)
+    assert not server.should_gate_inference(session, True, 102.5)
+
+
+def test_standby_assignment_is_read_from_stdin(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO('{"port": 9001, "env": "lesson_a.json"}\n'))
+    assert server_module.wait_for_assignment(5, probe_devices=False) == {"port": 9001, "env": "lesson_a.json"}
+
+
+def test_standby_worker_exits_when_manager_closes_stdin(monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(""))
+    with pytest.raises(SystemExit):
+        server_module.wait_for_assignment(5, probe_devices=False)
+
+
+@pytest.mark.parametrize("max_rate", [True, False, "5"])
+def test_subscription_rejects_non_numeric_max_rate(max_rate):
+    server = make_server(FakeSharedClient())
+    websocket = FakeWebSocket()
+    session = server.initialize_client(websocket)
+    response = server.handle_subscription(websocket, session, {"type": "subscribe", "max_rate": max_rate})
+    assert response["code"] == "invalid_max_rate"
+    assert session.log_subscription is None
@@ -0,0 +1,46 @@
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.services.client_session import ClientSession
+from src.services.inference_scheduler import InferenceScheduler
+
+SEQ_LENGTH = 4
+
+
+def make_session():
+    model = SimpleNamespace(MAX_SEQ_LENGTH=SEQ_LENGTH, ACTIONS=["None", "a", "b"])
+    return ClientSession(("127.0.0.1", 5000), model, result_buffer_size=3)
+
+
+def test_batch_time_is_charged_by_window_share():
+    def predict(inputs):
+        return np.zeros((len(inputs), 3), dtype=np.float32)
+
+    async def scenario():
+        scheduler = InferenceScheduler(predict, max_batch_size=8, max_wait_ms=20.0)
+        heavy, light = make_session(), make_session()
+        await asyncio.gather(
+            scheduler.submit_many(np.zeros((6, SEQ_LENGTH, 675), dtype=np.float32), account=heavy),
+            scheduler.submit_many(np.zeros((2, SEQ_LENGTH, 675), dtype=np.float32), account=light),
+        )
+        await scheduler.stop()
+        return heavy, light
+
+    heavy, light = asyncio.run(scenario())
+    assert heavy.service_time > 0
+    np.testing.assert_allclose(heavy.service_time, 3 * light.service_time, rtol=1e-6)
+
+
+def test_budget_delay_throttles_only_after_budget_is_spent():
+    session = make_session()
+    now = session.budget_updated
+    # 초당 0.25초 예산, 최대 0.5초 적립
+    assert session.budget_delay(0.25, 0.5, now + 4.0) == 0.0
+    session.charge(0.5)
+    assert session.budget_delay(0.25, 0.5, now + 4.0) == 0.0
+    session.charge(0.1)
+    np.testing.assert_allclose(session.budget_delay(0.25, 0.5, now + 4.0), 0.4)
+    assert session.budget_delay(0.25, 0.5, now + 4.5) == 0.0
+    assert session.budget_delay(0.0, 0.5, now + 4.5) == 0.0
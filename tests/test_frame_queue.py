@@ -0,0 +1,72 @@
+import asyncio
+from types import SimpleNamespace
+
+from src.services.client_session import ClientSession
+from src.services.frame_queue import FrameMessage, FrameQueue
+
+
+def single(i):
+    return FrameMessage([i], False, float(i))
+
+
+def test_drop_oldest_bounds_queued_frames():
+    async def scenario():
+        frame_queue = FrameQueue("drop_oldest", max_frames=4)
+        for i in range(10):
+            frame_queue.put(single(i))
+        frame_queue.put(FrameMessage([10, 11, 12], True, 10.0))
+        return [await frame_queue.get() for _ in range(2)], frame_queue.stats()
+
+    messages, stats = asyncio.run(scenario())
+    assert [m.frames for m in messages] == [[9], [10, 11, 12]]
+    assert stats["dropped_frames"] == 9
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 4
+
+
+def test_coalesce_skips_to_newest_frames_on_each_get():
+    async def scenario():
+        frame_queue = FrameQueue("coalesce", max_frames=60, coalesce_frames=2)
+        for i in range(10):
+            frame_queue.put(single(i))
+        first = await frame_queue.get()
+        frame_queue.put(single(10))
+        frame_queue.put(single(11))
+        rest = [await frame_queue.get() for _ in range(2)]
+        return [first] + rest, frame_queue
+
+    messages, frame_queue = asyncio.run(scenario())
+    assert [m.frames[0] for m in messages] == [8, 10, 11]
+    assert frame_queue.dropped_frames == 9
+    assert len(frame_queue) == 0
+
+
+def test_get_waits_for_next_frame():
+    async def scenario():
+        frame_queue = FrameQueue()
+        getter = asyncio.ensure_future(frame_queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        frame_queue.put(single(1))
+        return await asyncio.wait_for(getter, 1.0)
+
+    assert asyncio.run(scenario()).frames == [1]
+
+
+def test_clear_drops_queued_frames():
+    frame_queue = FrameQueue()
+    frame_queue.put(single(1))
+    frame_queue.put(FrameMessage([2, 3], True, 2.0))
+    assert frame_queue.clear() == 3
+    assert len(frame_queue) == 0
+    assert frame_queue.stats()["dropped_frames"] == 3
+
+
+def test_switch_model_drops_frames_queued_for_previous_model():
+    old_model = SimpleNamespace(MAX_SEQ_LENGTH=4, ACTIONS=["None", "a"])
+    new_model = SimpleNamespace(MAX_SEQ_LENGTH=6, ACTIONS=["None", "b", "c"])
+    session = ClientSession(("127.0.0.1", 5000), old_model, result_buffer_size=3)
+    session.frame_queue.put(single(1))
+    session.switch_model(new_model)
+    assert len(session.frame_queue) == 0
+    assert session.sequence.capacity == 6
@@ -0,0 +1,104 @@
+import sys
+from types import ModuleType
+
+import numpy as np
+
+from src.services.inference_backends import (
+    TFLiteBackend,
+    batch_buckets,
+    bucket_batches,
+    check_parity,
+    parity_inputs,
+    quantized_model_key,
+)
+
+
+def reference_model(inputs):
+    logits = inputs.mean(axis=1)[:, :5]
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def test_parity_check_accepts_matching_backend():
+    inputs = parity_inputs(30)
+    passed, max_error = check_parity(lambda x: reference_model(x) + 1e-6, reference_model, inputs)
+    assert passed
+    assert max_error < 1e-5
+
+
+def test_parity_check_rejects_drifting_backend():
+    inputs = parity_inputs(30)
+    passed, _ = check_parity(lambda x: reference_model(x) + 1e-2, reference_model, inputs)
+    assert not passed
+    passed, _ = check_parity(lambda x: reference_model(x)[:, ::-1], reference_model, inputs)
+    assert not passed
+
+
+def test_quantized_variant_is_published_next_to_the_model():
+    assert quantized_model_key("models/lesson_a.h5", "int8") == "models/lesson_a.int8.tflite"
+    assert quantized_model_key("models/lesson_a.keras", "float16") == "models/lesson_a.float16.tflite"
+
+
+def test_batch_buckets_cover_max_batch_size():
+    assert batch_buckets(16) == (1, 2, 4, 8, 16)
+    assert batch_buckets(12) == (1, 2, 4, 8, 16)
+    assert batch_buckets(1) == (1,)
+    assert batch_buckets(64) == (1, 2, 4, 8, 16, 32, 64)
+
+
+def test_bucket_batches_pad_and_split_to_warmed_shapes():
+    buckets = batch_buckets(8)
+    inputs = np.arange(11 * 2 * 3, dtype=np.float32).reshape(11, 2, 3)
+    batches = bucket_batches(inputs, buckets)
+    assert [(len(batch), size) for batch, size in batches] == [(8, 8), (4, 3)]
+    restored = np.concatenate([batch[:size] for batch, size in batches])
+    np.testing.assert_array_equal(restored, inputs)
+    assert not batches[1][0][3:].any()
+
+
+class FakeInterpreter:
+    """입력 크기 재설정/할당 횟수를 기록하는 TFLite 인터프리터 대역 (reference_model 실행)"""
+
+    allocations = []
+
+    def __init__(self, model_content):
+        self.shape = None
+        self.inputs = None
+
+    def get_input_details(self):
+        return [{"index": 0}]
+
+    def get_output_details(self):
+        return [{"index": 1}]
+
+    def resize_tensor_input(self, index, shape):
+        self.shape = tuple(shape)
+
+    def allocate_tensors(self):
+        FakeInterpreter.allocations.append(self.shape[0])
+
+    def set_tensor(self, index, value):
+        assert value.shape == self.shape
+        self.inputs = value
+
+    def invoke(self):
+        pass
+
+    def get_tensor(self, index):
+        return reference_model(self.inputs)
+
+
+def test_tflite_backend_runs_warmed_buckets_without_reallocating(monkeypatch):
+    module = ModuleType("tflite_runtime.interpreter")
+    module.Interpreter = FakeInterpreter
+    monkeypatch.setitem(sys.modules, "tflite_runtime", ModuleType("tflite_runtime"))
+    monkeypatch.setitem(sys.modules, "tflite_runtime.interpreter", module)
+    FakeInterpreter.allocations = []
+
+    backend = TFLiteBackend(b"model", buckets=batch_buckets(8))
+    rng = np.random.default_rng(0)
+    for batch_size in (3, 3, 1, 4, 3, 11):
+        inputs = rng.normal(size=(batch_size, 2, 6)).astype(np.float32)
+        np.testing.assert_allclose(backend(inputs), reference_model(inputs), rtol=1e-6)
+    # 버킷(4, 1, 8)마다 한 번만 할당
+    assert FakeInterpreter.allocations == [4, 1, 8]
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+
+from src.services.landmark_buffer import LandmarkRingBuffer
+from src.services.landmark_preprocessing import (
+    PARITY_TOLERANCE,
+    LandmarkValidationError,
+    decode_frame,
+    frames_to_array,
+    preprocess_landmark_array,
+    resample_sequence,
+)
+
+
+def legacy_preprocess(landmarks_list, target_length):
+    """기존 파이썬 루프 구현 (비교 기준)"""
+    processed_frames = []
+    for frame in landmarks_list:
+        if frame["pose"]:
+            left, right = frame["pose"][11], frame["pose"][12]
+            center = [(left[i] + right[i]) / 2 for i in range(3)]
+            width = abs(right[0] - left[0]) or 1.0
+        else:
+            center, width = [0.0, 0.0, 0.0], 1.0
+        combined = []
+        for key, num_points in (("pose", 33), ("left_hand", 21), ("right_hand", 21)):
+            if frame[key]:
+                combined.extend([[(lm[i] - center[i]) / width for i in range(3)] for lm in frame[key]])
+            else:
+                combined.extend([[0, 0, 0]] * num_points)
+        processed_frames.append(np.array(combined).flatten())
+    sequence = np.array(processed_frames)
+    if len(sequence) != target_length:
+        x_old = np.linspace(0, 1, len(sequence))
+        x_new = np.linspace(0, 1, target_length)
+        sequence = np.array([np.interp(x_new, x_old, sequence[:, i]) for i in range(sequence.shape[1])]).T
+    velocity = np.diff(sequence, axis=0, prepend=sequence[0:1])
+    acceleration = np.diff(velocity, axis=0, prepend=velocity[0:1])
+    return np.concatenate([sequence, velocity, acceleration], axis=1)
+
+
+def make_frames(num_frames, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = []
+    for t in range(num_frames):
+        pose = rng.random((33, 3))
+        # 실제 입력처럼 어깨 너비를 화면 폭의 20~30% 수준으로 설정
+        pose[11, 0] = 0.35 + 0.05 * rng.random()
+        pose[12, 0] = 0.60 + 0.05 * rng.random()
+        frames.append({
+            "pose": pose.tolist() if t % 7 != 3 else None,
+            "left_hand": rng.random((21, 3)).tolist() if t % 3 != 0 else None,
+            "right_hand": rng.random((21, 3)).tolist() if t % 5 != 1 else [],
+        })
+    return frames
+
+
+def test_vectorized_preprocess_matches_legacy():
+    frames = make_frames(30)
+    landmarks, presence = frames_to_array(frames)
+    result = preprocess_landmark_array(landmarks, presence, 30)
+    assert result.shape == (30, 675)
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result, legacy_preprocess(frames, 30), rtol=PARITY_TOLERANCE, atol=PARITY_TOLERANCE)
+
+
+def test_vectorized_preprocess_resamples_like_legacy():
+    for num_frames in (1, 17, 45):
+        frames = make_frames(num_frames, seed=num_frames)
+        landmarks, presence = frames_to_array(frames)
+        result = preprocess_landmark_array(landmarks, presence, 30)
+        np.testing.assert_allclose(result, legacy_preprocess(frames, 30), rtol=PARITY_TOLERANCE, atol=PARITY_TOLERANCE)
+
+
+def test_timestamp_resampling_matches_interp_on_irregular_timing():
+    rng = np.random.default_rng(3)
+    sequence = rng.normal(size=(24, 225)).astype(np.float32)
+    timestamps = np.cumsum(rng.uniform(10.0, 60.0, size=24))
+    result = resample_sequence(sequence, 30, timestamps)
+    targets = np.linspace(timestamps[0], timestamps[-1], 30)
+    expected = np.stack([np.interp(targets, timestamps, sequence[:, i]) for i in range(225)], axis=1)
+    np.testing.assert_allclose(result, expected, rtol=PARITY_TOLERANCE, atol=PARITY_TOLERANCE)
+
+    # 균일한 타임스탬프는 인덱스 기준 보간과 같음
+    uniform = resample_sequence(sequence, 30, np.arange(24) * 33.3)
+    np.testing.assert_allclose(uniform, resample_sequence(sequence, 30), rtol=PARITY_TOLERANCE, atol=PARITY_TOLERANCE)
+
+
+def test_ring_buffer_window_is_ordered_view():
+    frames = make_frames(50)
+    buffer = LandmarkRingBuffer(30)
+    for i, frame in enumerate(frames):
+        buffer.append_frame(frame)
+        landmarks, presence = buffer.window()
+        expected_landmarks, expected_presence = frames_to_array(frames[max(0, i - 29):i + 1])
+        assert np.shares_memory(landmarks, buffer._landmarks)
+        np.testing.assert_array_equal(landmarks, expected_landmarks)
+        np.testing.assert_array_equal(presence, expected_presence)
+
+
+def test_ring_buffer_cached_features_are_bit_identical():
+    frames = make_frames(50, seed=3)
+    buffer = LandmarkRingBuffer(30)
+    for i, frame in enumerate(frames):
+        buffer.append_frame(frame)
+        landmarks, presence = buffer.window()
+        expected = preprocess_landmark_array(landmarks, presence, len(buffer))
+        np.testing.assert_array_equal(buffer.model_input(), expected)
+
+
+def test_ring_buffer_resamples_irregular_frame_timestamps():
+    frames = make_frames(40, seed=6)
+    timestamps = np.cumsum(np.random.default_rng(6).uniform(10.0, 60.0, size=40))
+    irregular = LandmarkRingBuffer(30)
+    uniform = LandmarkRingBuffer(30)
+    untimed = LandmarkRingBuffer(30)
+    for i, (frame, timestamp) in enumerate(zip(frames, timestamps)):
+        irregular.append_frame({**frame, "timestamp": float(timestamp)})
+        uniform.append_frame({**frame, "timestamp": i * 33.3})
+        untimed.append_frame(frame)
+
+    landmarks, presence = irregular.window()
+    expected = preprocess_landmark_array(landmarks, presence, 30, timestamps[-30:])
+    np.testing.assert_allclose(irregular.model_input(), expected, rtol=PARITY_TOLERANCE, atol=PARITY_TOLERANCE)
+    assert not np.allclose(irregular.model_input(), untimed.model_input())
+    # 간격이 균일하면 캐시된 특성을 그대로 사용
+    np.testing.assert_array_equal(uniform.model_input(), untimed.model_input())
+
+
+def test_ring_buffer_motion_score_separates_idle_from_moving_hands():
+    still = make_frames(1, seed=4)[0]
+    buffer = LandmarkRingBuffer(30)
+    for _ in range(30):
+        buffer.append_frame(still)
+    assert buffer.hands_present(10)
+    assert buffer.motion_score(10) == 0.0
+
+    rng = np.random.default_rng(5)
+    for _ in range(10):
+        buffer.append_frame({**still, "left_hand": rng.random((21, 3)).tolist()})
+    assert buffer.motion_score(10) > 0.1
+
+    for _ in range(10):
+        buffer.append_frame({**still, "left_hand": None, "right_hand": None})
+    assert not buffer.hands_present(10)
+
+
+@pytest.mark.parametrize("override, code", [
+    ({"left_hand": np.zeros((20, 3)).tolist()}, "bad_shape"),
+    ({"right_hand": np.zeros((21, 2)).tolist()}, "bad_shape"),
+    ({"pose": [[0.0, "x", 0.0]] * 33}, "malformed_part"),
+    ({"left_hand": [[0.0, float("nan"), 0.0]] * 21}, "non_finite"),
+    ({"pose": [[float("inf"), 0.0, 0.0]] * 33}, "non_finite"),
+])
+def test_ring_buffer_rejects_malformed_frames_without_advancing(override, code):
+    frame = {**make_frames(1, seed=6)[0], **override}
+    buffer = LandmarkRingBuffer(30)
+    with pytest.raises(LandmarkValidationError) as excinfo:
+        buffer.append_frame(frame)
+    assert excinfo.value.code == code
+    assert len(buffer) == 0
+
+
+def test_frame_with_missing_part_key_is_rejected():
+    frame = make_frames(1)[0]
+    del frame["right_hand"]
+    with pytest.raises(LandmarkValidationError) as excinfo:
+        decode_frame(frame)
+    assert excinfo.value.code == "missing_part"
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from src.services.landmark_buffer import LandmarkRingBuffer
+from src.services.landmark_protocol import LandmarkProtocolError, decode_frames, encode_frames, message_id
+from tests.test_landmark_preprocessing import make_frames
+
+
+def test_binary_frames_decode_into_same_buffer_state_as_json():
+    frames = make_frames(40, seed=5)
+    json_buffer = LandmarkRingBuffer(30)
+    binary_buffer = LandmarkRingBuffer(30)
+    for frame in frames:
+        json_buffer.append_frame(frame)
+    for packed_frame in decode_frames(encode_frames(frames)):
+        binary_buffer.append_packed(packed_frame.presence, packed_frame.coords)
+    np.testing.assert_array_equal(binary_buffer.model_input(), json_buffer.model_input())
+
+
+@pytest.mark.parametrize("payload", [
+    b"WF",
+    b"XX\x01\x01\x01\x00\x00\x00",
+    b"WF\x09\x01\x01\x00\x00\x00",
+])
+def test_malformed_binary_frames_are_rejected(payload):
+    with pytest.raises(LandmarkProtocolError):
+        decode_frames(payload)
+
+
+def test_truncated_binary_frame_is_rejected():
+    payload = encode_frames(make_frames(2))
+    with pytest.raises(LandmarkProtocolError):
+        decode_frames(payload[:-4])
+
+
+def test_non_finite_binary_coordinates_are_rejected():
+    frames = make_frames(2)
+    frames[1]["pose"][3][1] = float("nan")
+    with pytest.raises(LandmarkProtocolError) as excinfo:
+        decode_frames(encode_frames(frames))
+    assert excinfo.value.code == "non_finite"
+
+
+def test_message_id_round_trips_in_binary_header():
+    frames = make_frames(3)
+    assert message_id(encode_frames(frames)) is None
+    payload = encode_frames(frames, message_id=513)
+    assert message_id(payload) == 513
+    assert len(decode_frames(payload)) == 3
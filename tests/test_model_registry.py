@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("tensorflow")
+pytest.importorskip("boto3")
+pytest.importorskip("dotenv")
+
+from src.services.model_registry import ModelRegistry
+
+DEFAULT = "s3://bucket/model-info/default.json"
+LESSON_A = "s3://bucket/model-info/a.json"
+LESSON_B = "s3://bucket/model-info/b.json"
+LESSON_C = "s3://bucket/model-info/c.json"
+MODEL_BYTES = 100
+
+
+class FakeModel:
+    def __init__(self, model_key):
+        self.model_info_url = model_key
+        self.memory_bytes = MODEL_BYTES
+        self.retrace_count = 0
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeFactory:
+    """TensorFlow 모델 대신 FakeModel을 만들고 로드 횟수를 기록"""
+
+    def __init__(self):
+        self.loaded = []
+
+    def __call__(self, model_key):
+        self.loaded.append(model_key)
+        return FakeModel(model_key)
+
+
+def test_acquire_loads_lazily_once_for_concurrent_clients():
+    factory = FakeFactory()
+    registry = ModelRegistry(factory, 10 * MODEL_BYTES)
+
+    async def scenario():
+        assert LESSON_A not in registry
+        return await asyncio.gather(registry.acquire(LESSON_A), registry.acquire(LESSON_A))
+
+    first, second = asyncio.run(scenario())
+    assert first is second
+    assert factory.loaded == [LESSON_A]
+    assert registry.stats()["ref_counts"][LESSON_A] == 2
+
+
+def test_unused_models_are_evicted_in_lru_order():
+    factory = FakeFactory()
+    registry = ModelRegistry(factory, 3 * MODEL_BYTES)
+    registry.load(DEFAULT, pinned=True)
+
+    async def scenario():
+        a = await registry.acquire(LESSON_A)
+        b = await registry.acquire(LESSON_B)
+        registry.release(a)
+        registry.release(b)
+        # a를 다시 사용하면 b가 가장 오래 사용하지 않은 모델이 됨
+        registry.release(await registry.acquire(LESSON_A))
+        await registry.acquire(LESSON_C)
+        return a, b
+
+    a, b = asyncio.run(scenario())
+    assert b.closed and not a.closed
+    assert registry.stats()["models"] == [DEFAULT, LESSON_A, LESSON_C]
+
+
+def test_pinned_and_in_use_models_are_never_evicted():
+    factory = FakeFactory()
+    registry = ModelRegistry(factory, 2 * MODEL_BYTES)
+    default = registry.load(DEFAULT, pinned=True)
+
+    async def scenario():
+        a = await registry.acquire(LESSON_A)
+        # 예산을 넘어도 기본 모델은 고정, a는 사용 중이라 내릴 수 없음
+        b = await registry.acquire(LESSON_B)
+        assert registry.total_memory_bytes() == 3 * MODEL_BYTES
+        registry.release(a)
+        await registry.acquire(LESSON_C)
+        return a, b
+
+    a, b = asyncio.run(scenario())
+    assert a.closed and not b.closed and not default.closed
+    assert DEFAULT in registry and LESSON_B in registry and LESSON_C in registry
+
+
+def test_retain_and_release_track_reference_counts():
+    registry = ModelRegistry(FakeFactory(), 10 * MODEL_BYTES)
+    default = registry.load(DEFAULT, pinned=True)
+    registry.retain(default)
+    registry.retain(default)
+    registry.release(default)
+    assert registry.stats()["ref_counts"][DEFAULT] == 1
+    registry.release(default)
+    registry.release(default)
+    assert registry.stats()["ref_counts"][DEFAULT] == 0
+    assert registry.get(DEFAULT) is default
+    assert registry.get(LESSON_A) is None
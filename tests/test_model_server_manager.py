@@ -0,0 +1,94 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("boto3")
+pytest.importorskip("dotenv")
+
+from src.services.model_server_manager import ModelServerManager, settings
+
+# 모델 서버 대역 - 대기 워커면 stdin 배정을 받아 출력한 뒤 준비 완료 줄을 출력하고 대기
+FAKE_WORKER = """
+import json, sys, time
+if "--standby" in sys.argv:
+    assignment = json.loads(sys.stdin.readline())
+    print("assigned", assignment["port"], assignment["env"])
+print("MODEL_SERVER_READY", flush=True)
+time.sleep(30)
+"""
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = ModelServerManager()
+    monkeypatch.setattr(manager, "_worker_command", lambda server_args: [sys.executable, "-c", FAKE_WORKER, *server_args])
+    monkeypatch.setattr(settings, "MODEL_SERVER_READY_TIMEOUT", 10.0)
+    monkeypatch.setattr(settings, "MODEL_SERVER_HOST", "localhost")
+    yield manager
+    processes = {worker.process for worker in manager.standby_workers} | set(manager.server_processes.values())
+    for process in processes:
+        process.kill()
+        process.wait()
+
+
+def test_standby_pool_is_disabled_by_default(manager):
+    assert settings.MODEL_SERVER_STANDBY_POOL_SIZE == 0
+    manager.fill_standby_pool()
+    assert manager.standby_workers == []
+
+
+def test_standby_worker_is_assigned_and_pool_refilled(manager, monkeypatch, capsys):
+    monkeypatch.setattr(settings, "MODEL_SERVER_STANDBY_POOL_SIZE", 1)
+    manager.fill_standby_pool()
+    standby = manager.standby_workers[0]
+
+    url = asyncio.run(manager.start_model_server("lesson-a", "lesson_a.json", port=9123))
+    assert url == "ws://localhost:9123"
+    assert manager.server_processes["lesson-a"] is standby.process
+    assert standby.ready.is_set() and standby.model_id == "lesson-a"
+    # 배정한 워커 대신 새 대기 워커를 채움
+    assert len(manager.standby_workers) == 1 and manager.standby_workers[0] is not standby
+
+    deadline = time.time() + 5
+    while "assigned 9123 lesson_a.json" not in capsys.readouterr().out:
+        assert time.time() < deadline
+        time.sleep(0.05)
+
+
+def test_standby_worker_near_idle_limit_is_not_assigned(manager, monkeypatch):
+    monkeypatch.setattr(settings, "MODEL_SERVER_STANDBY_POOL_SIZE", 1)
+    manager.fill_standby_pool()
+    standby = manager.standby_workers[0]
+    standby.idle_since = time.time() - settings.MODEL_SERVER_STANDBY_MAX_IDLE
+    assert manager._take_standby_worker() is None
+    assert standby.process.wait(timeout=5) is not None
+
+
+def test_without_standby_pool_a_dedicated_server_is_started(manager):
+    url = asyncio.run(manager.start_model_server("lesson-b", "lesson_b.json", port=9124))
+    assert url == "ws://localhost:9124"
+    assert manager.standby_workers == []
+    assert manager.server_processes["lesson-b"].poll() is None
+
+
+def test_dead_host_cleanup_forgets_attached_models(monkeypatch):
+    pytest.importorskip("motor")
+    from src.services import ml_service
+
+    class DeadProcess:
+        pid = None
+
+    registry = ModelServerManager()
+    monkeypatch.setattr(ml_service, "model_server_manager", registry)
+    registry.running_servers["host"] = "ws://localhost:9125"
+    registry.server_processes["host"] = DeadProcess()
+    registry.attach_model("lesson-c", "lesson_c.json", "host", "ws://localhost:9125")
+
+    ml_service.cleanup_dead_servers()
+    assert registry.running_servers == {}
+    assert registry.server_processes == {}
+    # 다시 배포되면 별도 프로세스로 시작해 다른 모델의 호스트가 될 수 있어야 함
+    assert registry.hosted_by == {}
@@ -0,0 +1,59 @@
+import json
+from argparse import Namespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("psutil")
+pytest.importorskip("websockets")
+
+from src.scripts import replay_benchmark
+from src.services.landmark_protocol import encode_frames
+
+
+def synthesize_sessions(output, frames=20):
+    replay_benchmark.synthesize(Namespace(output=str(output), sessions=2, frames=frames, fps=30.0, seed=0))
+    return sorted(output.glob("*.wfrec"))
+
+
+def test_synthesized_session_survives_record_round_trip(tmp_path):
+    source_path = synthesize_sessions(tmp_path / "synthetic")[0]
+    session = replay_benchmark.read_session(str(source_path))
+    assert len(session) == 20
+    np.testing.assert_allclose([elapsed for elapsed, _ in session], np.arange(20) / 30.0)
+
+    # 녹화 프록시와 같은 경로: JSON 메시지 -> 프레임 dict -> 바이너리 레코드
+    recorded_path = tmp_path / "recorded.wfrec"
+    writer = replay_benchmark.SessionWriter(str(recorded_path))
+    for _, frame in session:
+        message = json.loads(json.dumps({"type": "landmarks", "data": replay_benchmark.packed_frame_to_dict(frame)}))
+        frames = replay_benchmark.json_message_frames(message)
+        writer.write(encode_frames(frames), len(frames))
+    writer.close()
+
+    recorded = replay_benchmark.read_session(str(recorded_path))
+    assert writer.num_frames == len(recorded) == len(session)
+    for (_, original), (_, replayed) in zip(session, recorded):
+        assert replayed.presence == original.presence
+        np.testing.assert_array_equal(replayed.coords, original.coords)
+
+
+def test_report_aggregates_client_latency_percentiles():
+    stats = [replay_benchmark.ClientStats() for _ in range(2)]
+    stats[0].latencies_ms = [10.0, 20.0, 30.0]
+    stats[1].latencies_ms = [40.0]
+    stats[0].sent_frames, stats[0].dropped_frames, stats[0].predictions = 90, 10, 30
+    args = Namespace(clients=2, protocol="binary")
+
+    report = replay_benchmark.build_report(args, stats, [], 10.0, [(50.0, 100 * 1024 * 1024), (70.0, 200 * 1024 * 1024)])
+    assert report["latency_ms"]["p50"] == pytest.approx(25.0)
+    assert report["latency_ms"]["p95"] == pytest.approx(np.percentile([10, 20, 30, 40], 95))
+    assert report["latency_ms"]["max"] == 40.0
+    assert report["dropped_ratio"] == pytest.approx(0.1)
+    assert report["predictions_per_s"] == pytest.approx(3.0)
+    assert report["server"]["cpu_percent_max"] == 70.0
+    assert report["server"]["rss_mb_avg"] == pytest.approx(150.0)
+
+    empty = replay_benchmark.build_report(args, [replay_benchmark.ClientStats()], [], 1.0, [])
+    assert np.isnan(empty["latency_ms"]["p50"])
+    assert "server" not in empty
@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.services.result_format import ResultFormat
+from src.services.result_smoother import ResultSmoother
+
+LABELS = [f"라벨{i}" for i in range(40)]
+
+
+def make_result(scores):
+    scores = np.asarray(scores, dtype=np.float32)
+    index = int(np.argmax(scores))
+    return {
+        "prediction": LABELS[index],
+        "index": index,
+        "confidence": float(scores[index]),
+        "scores": scores,
+        "buffer_size": 6,
+    }
+
+
+def test_compact_formats_use_label_indices():
+    scores = np.random.default_rng(0).dirichlet(np.ones(len(LABELS)))
+    result = make_result(scores)
+
+    full = ResultFormat().format(result, LABELS)
+    assert full["prediction"] == LABELS[result["index"]]
+    assert list(full["probabilities"]) == LABELS
+
+    topk = ResultFormat("topk", top_k=3).format(result, LABELS)
+    expected = np.argsort(-scores)[:3].tolist()
+    assert topk["index"] == result["index"]
+    assert topk["indices"] == expected
+    np.testing.assert_allclose(topk["scores"], scores[expected], atol=1e-4)
+
+    array = ResultFormat("array").format(result, LABELS)
+    assert len(array["scores"]) == len(LABELS)
+    assert len(json.dumps(topk)) * 10 < len(json.dumps(full, ensure_ascii=False).encode())
+
+
+def legacy_full_result(predictions):
+    """기존 dict 결과 버퍼 평균 (비교 기준)"""
+    probabilities = [{label: float(prob) for label, prob in zip(LABELS, probs)} for probs in predictions]
+    average = {label: sum(p[label] for p in probabilities) / len(probabilities) for label in LABELS}
+    best_label = max(average, key=average.get)
+    return {
+        "prediction": best_label,
+        "confidence": average[best_label],
+        "probabilities": average,
+        "buffer_size": len(probabilities),
+    }
+
+
+def test_full_format_is_byte_compatible_with_legacy_averaging():
+    rng = np.random.default_rng(1)
+    smoother = ResultSmoother(len(LABELS), 4)
+    predictions = []
+    for _ in range(4):
+        probs = rng.dirichlet(np.ones(len(LABELS))).astype(np.float32)
+        predictions.append(probs)
+        scores = smoother.add(probs)
+        index = int(np.argmax(scores))
+        result = {
+            "prediction": LABELS[index],
+            "index": index,
+            "confidence": float(scores[index]),
+            "scores": scores,
+            "buffer_size": len(smoother),
+        }
+        full = ResultFormat().format(result, LABELS)
+        assert json.dumps(full) == json.dumps(legacy_full_result(predictions))
+
+
+def test_change_only_mode_emits_on_label_or_band_change():
+    result_format = ResultFormat("topk", change_band=0.1)
+    emitted = [
+        result_format.should_emit(make_result([0.1, confidence, 0.0]))
+        for confidence in (0.52, 0.55, 0.58, 0.61, 0.63)
+    ]
+    assert emitted == [True, False, False, True, False]
+    assert result_format.should_emit(make_result([0.7, 0.3, 0.0]))
+
+
+@pytest.mark.parametrize("kwargs", [{"name": "xml"}, {"top_k": 0}, {"change_band": 0.0}])
+def test_invalid_result_format_is_rejected(kwargs):
+    with pytest.raises(ValueError):
+        ResultFormat(**kwargs)
@@ -0,0 +1,38 @@
+from collections import deque
+
+import numpy as np
+
+from src.services.result_smoother import ResultSmoother
+
+LABELS = ["None", "a", "b", "c", "d"]
+
+
+def legacy_average(buffer):
+    total = {label: 0.0 for label in LABELS}
+    for result in buffer:
+        for label, prob in result["probabilities"].items():
+            total[label] += prob
+    return np.array([total[label] / len(buffer) for label in LABELS])
+
+
+def test_running_sum_matches_dict_buffer_average():
+    rng = np.random.default_rng(0)
+    smoother = ResultSmoother(len(LABELS), 6)
+    buffer = deque(maxlen=6)
+    for _ in range(100):
+        probs = rng.dirichlet(np.ones(len(LABELS))).astype(np.float32)
+        buffer.append({"probabilities": dict(zip(LABELS, probs.tolist()))})
+        smoothed = smoother.add(probs)
+        assert len(smoother) == len(buffer)
+        np.testing.assert_allclose(smoothed, legacy_average(buffer), atol=1e-6)
+
+
+def test_ema_mode_and_reset_for_new_label_count():
+    smoother = ResultSmoother(2, 3, mode="ema")
+    np.testing.assert_allclose(smoother.add(np.array([1.0, 0.0], dtype=np.float32)), [1.0, 0.0])
+    # alpha = 2 / (3 + 1)
+    np.testing.assert_allclose(smoother.add(np.array([0.0, 1.0], dtype=np.float32)), [0.5, 0.5])
+
+    smoother.reset(3)
+    assert len(smoother) == 0
+    np.testing.assert_allclose(smoother.add(np.array([0.2, 0.3, 0.5], dtype=np.float32)), [0.2, 0.3, 0.5])
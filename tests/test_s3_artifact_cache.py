@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+pytest.importorskip("boto3")
+pytest.importorskip("dotenv")
+
+from src.services.s3_utils import S3ArtifactCache
+
+
+class FakeS3Client:
+    def __init__(self):
+        self.etag = '"v1"'
+        self.downloads = 0
+
+    def head_object(self, Bucket, Key):
+        return {"ETag": self.etag}
+
+    def download_file(self, bucket_name, key, local_path):
+        self.downloads += 1
+        with open(local_path, "wb") as f:
+            f.write(b"x" * 100)
+
+
+def test_unchanged_etag_skips_download(tmp_path):
+    client = FakeS3Client()
+    cache = S3ArtifactCache(client, str(tmp_path), max_bytes=10_000)
+    first = cache.fetch("bucket", "models/model.h5")
+    second = cache.fetch("bucket", "models/model.h5")
+    assert first == second
+    assert first.endswith("model.h5")
+    assert client.downloads == 1
+
+
+def test_same_basename_does_not_collide_and_new_etag_replaces_old(tmp_path):
+    client = FakeS3Client()
+    cache = S3ArtifactCache(client, str(tmp_path), max_bytes=10_000)
+    a = cache.fetch("bucket", "a/model.h5")
+    b = cache.fetch("bucket", "b/model.h5")
+    assert a != b
+
+    client.etag = '"v2"'
+    updated = cache.fetch("bucket", "a/model.h5")
+    assert updated != a
+    assert not os.path.exists(a)
+    assert client.downloads == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    client = FakeS3Client()
+    cache = S3ArtifactCache(client, str(tmp_path), max_bytes=250)
+    oldest = cache.fetch("bucket", "a.json")
+    os.utime(oldest, (0, 0))
+    cache.fetch("bucket", "b.json")
+    newest = cache.fetch("bucket", "c.json")
+    assert not os.path.exists(oldest)
+    assert os.path.exists(newest)
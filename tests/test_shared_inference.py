@@ -0,0 +1,123 @@
+import asyncio
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from src.services.process_group import ServerProcessGroup
+from src.services.shared_inference import (
+    SharedInferenceChannel,
+    SharedInferenceClient,
+    SharedInferenceWorker,
+    SharedModelRegistry,
+)
+
+SEQ_LENGTH = 4
+
+
+class FakeScheduler:
+    async def submit_many(self, windows):
+        return windows.mean(axis=(1, 2))[:, None] * np.ones((1, 3), dtype=np.float32)
+
+    async def stop(self):
+        pass
+
+
+class FakeModel:
+    model_info_url = "lesson.json"
+    model_info = {"labels": ["a", "b", "None"]}
+    MAX_SEQ_LENGTH = SEQ_LENGTH
+    MODEL_SAVE_PATH = "lesson.h5"
+    ACTIONS = ["a", "b", "None"]
+    QUIZ_LABELS = ["a", "b"]
+    motion_gate = {"threshold": 0.0}
+    backend_name = "keras"
+    retrace_count = 0
+    inference_scheduler = FakeScheduler()
+
+
+class FakeRegistry:
+    def __init__(self):
+        self.model = FakeModel()
+        self.ref_count = 0
+
+    def get(self, key):
+        return self.model if key == self.model.model_info_url else None
+
+    def load(self, key, pinned=False):
+        return self.model
+
+    async def acquire(self, key):
+        self.ref_count += 1
+        return self.model
+
+    def retain(self, model):
+        self.ref_count += 1
+
+    def release(self, model):
+        self.ref_count -= 1
+
+    async def close_all(self):
+        pass
+
+
+def test_frontend_predictions_round_trip_through_shared_memory():
+    mp_context = multiprocessing.get_context()
+    channel = SharedInferenceChannel(mp_context, 1, 2, SEQ_LENGTH)
+    client = SharedInferenceClient(channel, 0)
+    registry = FakeRegistry()
+    process_group = ServerProcessGroup(mp_context)
+    worker = SharedInferenceWorker(channel, registry, process_group, poll_interval=0.01)
+
+    async def scenario():
+        worker_task = asyncio.create_task(worker.run())
+        frontend_registry = SharedModelRegistry(client, lambda key: key)
+        model = await frontend_registry.acquire("lesson.json")
+        assert model.ACTIONS == ["a", "b", "None"]
+
+        windows = np.stack([np.full((SEQ_LENGTH, 675), v, dtype=np.float32) for v in (1.0, 2.0)])
+        probs = await model.inference_scheduler.submit_many(windows)
+        np.testing.assert_allclose(probs, [[1.0] * 3, [2.0] * 3])
+
+        # 프론트엔드 슬롯(2개)보다 많은 윈도우는 대기열 초과로 거절
+        with pytest.raises(asyncio.QueueFull):
+            await model.inference_scheduler.submit_many(np.zeros((3, SEQ_LENGTH, 675), dtype=np.float32))
+
+        frontend_registry.release(model)
+        process_group.request_shutdown()
+        await asyncio.wait_for(worker_task, 5)
+        await frontend_registry.close_all()
+
+    asyncio.run(scenario())
+    assert registry.ref_count == 0
+
+
+def assert_model_is_rejected(channel, match):
+    mp_context = multiprocessing.get_context()
+    client = SharedInferenceClient(channel, 0)
+    registry = FakeRegistry()
+    process_group = ServerProcessGroup(mp_context)
+    worker = SharedInferenceWorker(channel, registry, process_group, poll_interval=0.01)
+
+    async def scenario():
+        worker_task = asyncio.create_task(worker.run())
+        frontend_registry = SharedModelRegistry(client, lambda key: key)
+        with pytest.raises(RuntimeError, match=match):
+            await frontend_registry.acquire("lesson.json")
+        process_group.request_shutdown()
+        await asyncio.wait_for(worker_task, 5)
+        await frontend_registry.close_all()
+
+    asyncio.run(scenario())
+    # 거부한 모델의 사용 카운트는 되돌림
+    assert registry.ref_count == 0
+
+
+def test_model_with_more_labels_than_output_slots_is_rejected():
+    channel = SharedInferenceChannel(multiprocessing.get_context(), 1, 2, SEQ_LENGTH, max_labels=2)
+    assert_model_is_rejected(channel, "라벨 수")
+
+
+def test_model_with_longer_windows_than_input_slots_is_rejected():
+    channel = SharedInferenceChannel(multiprocessing.get_context(), 1, 2, SEQ_LENGTH - 1)
+    assert_model_is_rejected(channel, "윈도우 길이")